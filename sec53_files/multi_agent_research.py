@@ -5,19 +5,28 @@ for each subsection, and a compiler agent to generate the final JSON output.
 """
 
 import os
+import io
 import json
 import re
 import datetime
 import asyncio
 import time
-from typing import List, Dict, Any, TypedDict, Annotated
+import difflib
+import random
+import traceback
+from functools import lru_cache
+from typing import List, Dict, Any, TypedDict, Annotated, Tuple, Union, Optional, Iterator
 from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from langchain.agents import create_agent
 from langchain_core.tools import tool
+from langchain_core.messages import BaseMessage, ToolMessage
 from langchain.chat_models import init_chat_model
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
-from research_paper_search import ResearchPaperSearcher, create_searcher, get_default_backend
+from langgraph.types import Send
+from research_paper_search import (ResearchPaperSearcher, AsyncPubMedSearcher, create_searcher, get_default_backend,
+                                   setup_logging, ASYNC_SEARCH_AVAILABLE)
 
 # Try to import OpenAI rate limit error
 try:
@@ -26,11 +35,216 @@ except ImportError:
     # Fallback if openai is not directly importable
     RateLimitError = None
 
+# Try to import orjson for faster JSON encoding
+try:
+    import orjson
+except ImportError:
+    # Fallback to stdlib json if orjson is not installed
+    orjson = None
+
+# Try to import uvloop for a faster event loop
+try:
+    import uvloop
+except ImportError:
+    # Fallback to the default asyncio event loop if uvloop is not installed
+    uvloop = None
+
+# Try to import tiktoken for estimating prompt token counts
+try:
+    import tiktoken
+except ImportError:
+    # Fallback to a ~4 characters/token estimate if tiktoken is not installed
+    tiktoken = None
+
+# Try to import pysimdjson for parsing large tool-result payloads
+try:
+    import simdjson
+    _simdjson_parser = simdjson.Parser()
+except ImportError:
+    # Fallback to loads_json if pysimdjson is not installed
+    simdjson = None
+    _simdjson_parser = None
+
+
+# Precompiled patterns for regulation parsing and name normalization
+_SECTION_HEADER_RE = re.compile(r'^(\d+\.\d+\.\d+(?:\.\d+)?)\s+(.+)$')
+_PHARMACOPEIA_RE = re.compile(r'\s+(USP|BP|EP|JP|NF)\s*', re.IGNORECASE)
+_DOSAGE_RE = re.compile(r'\s+\d+\s*(mg|g|mcg|µg|ml|mL)\s*', re.IGNORECASE)
+_TRAILING_NUMBER_RE = re.compile(r'\s+\d+\s*$')
+_WHITESPACE_RE = re.compile(r'\s+')
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r'[^\w\-_\.]')
+_REPEATED_UNDERSCORES_RE = re.compile(r'_+')
+
+# Precompiled patterns for extracting JSON from LLM responses
+_REMOVALS_OBJECT_RE = re.compile(r'\{[^{}]*"removals"[^{}]*\}', re.DOTALL)
+_REMOVALS_BROAD_RE = re.compile(r'(\{.*"removals".*\})', re.DOTALL)
+_WAIT_SECONDS_RE = re.compile(r'(\d+\.?\d*)\s*seconds?', re.IGNORECASE)
+_RATE_LIMIT_RE = re.compile(r'rate[_ ]?limit|ratelimit|429', re.IGNORECASE)
+
+# Precompiled patterns for paper identity / title comparison during deduplication
+_PUBMED_URL_PMID_RE = re.compile(r'pubmed\.ncbi\.nlm\.nih\.gov/(\d+)', re.IGNORECASE)
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+
+# Values the LLM uses as stand-ins for missing paper fields
+_PLACEHOLDERS = frozenset({"...", ".", "-", ""})
+
+# Minimum title similarity (0-1) for two papers to be sent to the LLM as possible duplicates
+FUZZY_TITLE_THRESHOLD = 0.85
+
+
+def dumps_json(obj: Any, indent: bool = True) -> str:
+    """Serialize obj to a JSON string, using orjson when available.
+
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with 2-space indentation; compact output otherwise
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode("utf-8")
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def loads_json(data):
+    """Parse a JSON str/bytes, using orjson when available.
+
+    Raises:
+        ValueError: If data is not valid JSON (both json and orjson decode errors subclass it)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_tool_papers(content: Any) -> List[Dict]:
+    """Return the "papers" list from a search tool result payload, or [] if it has none.
+
+    With pysimdjson only the papers array is materialized as Python objects; the
+    proxies are dropped before returning so the shared parser can be reused.
+    Anything simdjson can't handle falls back to loads_json.
+    """
+    if not isinstance(content, (str, bytes, bytearray)):
+        content = str(content)
+
+    if _simdjson_parser is not None:
+        try:
+            data = content.encode("utf-8") if isinstance(content, str) else content
+            doc = _simdjson_parser.parse(data)
+            papers = doc.get("papers") if isinstance(doc, simdjson.Object) else None
+            return papers.as_list() if isinstance(papers, simdjson.Array) else []
+        except (ValueError, RuntimeError):
+            pass
+
+    try:
+        parsed = loads_json(content)
+    except ValueError:
+        return []
+    papers = parsed.get("papers") if isinstance(parsed, dict) else None
+    return papers if isinstance(papers, list) else []
+
+
+def iter_json_spans(text: str) -> Iterator[str]:
+    """Yield each balanced top-level [...] or {...} span embedded in text, in order.
+
+    Brackets inside JSON strings (including escaped quotes) are ignored. The text
+    is scanned once with a stack of open brackets: a span is top-level when no
+    enclosing bracket closes around it, so valid spans that follow (or sit inside)
+    a stray opener that never balances are still found, in linear time.
+    """
+    openers = []  # Positions of the brackets that are still open
+    pending = []  # Closed spans inside still-open brackets, outermost ones only
+    in_string = False
+    escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '[' or ch == '{':
+            openers.append(i)
+        elif not openers:
+            # Outside any bracket: quotes and stray closers are plain text
+            continue
+        elif ch == '"':
+            in_string = True
+        elif ch == ']' or ch == '}':
+            start = openers.pop()
+            # This span encloses the pending spans that started after it
+            while pending and pending[-1][0] > start:
+                pending.pop()
+            if openers:
+                pending.append((start, i))
+            else:
+                yield text[start:i + 1]
+
+    # Openers left unbalanced at the end: their closed inner spans are top-level
+    for start, end in pending:
+        yield text[start:end + 1]
+
+
+def write_json_file(obj: Any, file_path, indent: bool = True) -> None:
+    """Write obj to file_path as UTF-8 JSON, using orjson when available.
+
+    With orjson the document is serialized to bytes and written in one call;
+    non-string dict keys (e.g. int paper indices) are stringified like stdlib json does.
+
+    Args:
+        obj: Object to serialize
+        file_path: Destination path
+        indent: Pretty-print with 2-space indentation; compact output otherwise
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        Path(file_path).write_bytes(orjson.dumps(obj, option=option))
+    else:
+        # Encode once and write bytes rather than going through a text-mode codec
+        Path(file_path).write_bytes(dumps_json(obj, indent=indent).encode('utf-8'))
+
+
+def append_json_line(obj: Any, file_path) -> None:
+    """Append obj to file_path as one compact NDJSON line."""
+    if orjson is not None:
+        line = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+    else:
+        line = (dumps_json(obj, indent=False) + "\n").encode("utf-8")
+    with open(file_path, 'ab') as f:
+        f.write(line)
+
 
 # Initialize the research paper searcher
 _searcher = None
 _searcher_backend = None
 
+# aiohttp-based searcher bound to the running event loop (when aiohttp is installed)
+_async_searcher = None
+_async_searcher_loop = None
+
+# PubMed E-utilities rate limit shared by all concurrent workers:
+# 3 requests/second without an API key, 10/second with NCBI_API_KEY set
+PUBMED_REQUESTS_PER_SECOND = 10 if os.getenv("NCBI_API_KEY") else 3
+_pubmed_sem = None
+_pubmed_pace_lock = None
+_pubmed_loop = None
+_pubmed_last_request = 0.0
+
+# Print full tracebacks for per-section worker failures (MAR_DEBUG=1)
+DEBUG = os.getenv("MAR_DEBUG") == "1"
+
+# LLM limits shared by all concurrent workers: a cap on in-flight agent runs and a
+# tokens-per-minute budget each run reserves its estimated prompt + output tokens from
+MAX_CONCURRENT_WORKERS = int(os.getenv("MAX_CONCURRENT_WORKERS", "8"))
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "30000"))
+EXPECTED_OUTPUT_TOKENS = 2000
+_llm_sem = None
+_llm_budget_lock = None
+_llm_loop = None
+_llm_budget_tokens = float(LLM_TOKENS_PER_MINUTE)
+_llm_budget_updated = 0.0
+
 
 def get_searcher(backend: str = None) -> ResearchPaperSearcher:
     """Get or create the ResearchPaperSearcher instance.
@@ -55,6 +269,118 @@ def get_searcher(backend: str = None) -> ResearchPaperSearcher:
     return _searcher
 
 
+def get_async_searcher() -> Optional[AsyncPubMedSearcher]:
+    """Get the AsyncPubMedSearcher for the running event loop, or None without aiohttp.
+
+    Its aiohttp session is bound to the loop it was created in, so a new searcher
+    is created whenever a new loop is started.
+    """
+    global _async_searcher, _async_searcher_loop
+
+    if not ASYNC_SEARCH_AVAILABLE:
+        return None
+
+    loop = asyncio.get_running_loop()
+    if _async_searcher_loop is not loop:
+        _async_searcher = AsyncPubMedSearcher()
+        _async_searcher_loop = loop
+
+    return _async_searcher
+
+
+async def close_async_searcher():
+    """Close the running loop's AsyncPubMedSearcher session, if one was created."""
+    global _async_searcher, _async_searcher_loop
+
+    if _async_searcher is not None:
+        await _async_searcher.aclose()
+    _async_searcher = None
+    _async_searcher_loop = None
+
+
+def _get_pubmed_limiter():
+    """Get the PubMed semaphore and pacing lock for the running event loop.
+
+    asyncio primitives are bound to a single event loop, so they are recreated
+    whenever a new loop is started (e.g. one asyncio.run() per worker phase).
+    """
+    global _pubmed_sem, _pubmed_pace_lock, _pubmed_loop
+
+    loop = asyncio.get_running_loop()
+    if _pubmed_loop is not loop:
+        _pubmed_sem = asyncio.Semaphore(PUBMED_REQUESTS_PER_SECOND)
+        _pubmed_pace_lock = asyncio.Lock()
+        _pubmed_loop = loop
+
+    return _pubmed_sem, _pubmed_pace_lock
+
+
+async def _pace_pubmed(pace_lock: asyncio.Lock):
+    """Token-bucket pacer: space PubMed searches to stay under the NCBI rate cap."""
+    global _pubmed_last_request
+
+    async with pace_lock:
+        min_interval = 1.0 / PUBMED_REQUESTS_PER_SECOND
+        elapsed = time.monotonic() - _pubmed_last_request
+        if elapsed < min_interval:
+            await asyncio.sleep(min_interval - elapsed)
+        _pubmed_last_request = time.monotonic()
+
+
+@lru_cache(maxsize=1)
+def _get_token_encoding():
+    """Get the tiktoken encoding used for prompt token estimates (None if unavailable)."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model("gpt-4o")
+    except Exception:
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in text (tiktoken if available, else ~4 chars/token)."""
+    encoding = _get_token_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return len(text) // 4 + 1
+
+
+def _get_llm_limiter():
+    """Get the worker concurrency semaphore and token budget lock for the running event loop."""
+    global _llm_sem, _llm_budget_lock, _llm_loop
+
+    loop = asyncio.get_running_loop()
+    if _llm_loop is not loop:
+        _llm_sem = asyncio.Semaphore(MAX_CONCURRENT_WORKERS)
+        _llm_budget_lock = asyncio.Lock()
+        _llm_loop = loop
+
+    return _llm_sem, _llm_budget_lock
+
+
+async def _reserve_llm_tokens(budget_lock: asyncio.Lock, tokens: int):
+    """Token bucket: wait until the per-minute LLM budget has room for tokens, then spend them."""
+    global _llm_budget_tokens, _llm_budget_updated
+
+    tokens = min(tokens, LLM_TOKENS_PER_MINUTE)
+    refill_per_second = LLM_TOKENS_PER_MINUTE / 60.0
+
+    async with budget_lock:
+        while True:
+            now = time.monotonic()
+            if _llm_budget_updated:
+                _llm_budget_tokens = min(
+                    float(LLM_TOKENS_PER_MINUTE),
+                    _llm_budget_tokens + (now - _llm_budget_updated) * refill_per_second
+                )
+            _llm_budget_updated = now
+            if _llm_budget_tokens >= tokens:
+                _llm_budget_tokens -= tokens
+                return
+            await asyncio.sleep((tokens - _llm_budget_tokens) / refill_per_second)
+
+
 def create_search_tool(backend: str = None):
     """Create a search_research_papers tool for PubMed.
 
@@ -65,7 +391,7 @@ def create_search_tool(backend: str = None):
         Tool function for searching research papers
     """
     @tool
-    def search_research_papers(query: str, match_limit: int = 5) -> str:
+    async def search_research_papers(query: str, match_limit: int = 5) -> str:
         """Search for research papers using PubMed/NCBI database.
 
         This tool uses PubMed/NCBI E-utilities API to search for peer-reviewed research papers.
@@ -87,8 +413,17 @@ def create_search_tool(backend: str = None):
             A JSON string containing a list of research papers with their titles, URLs, PMIDs, abstracts, authors, journals, and years.
         """
         try:
-            searcher = get_searcher(backend=backend)
-            papers = searcher.search_papers(query, match_limit=match_limit)
+            async_searcher = get_async_searcher()
+            if async_searcher is not None:
+                # Native asyncio client: paces each esearch/efetch request itself
+                papers = await async_searcher.search_papers(query, match_limit=match_limit)
+            else:
+                searcher = get_searcher(backend=backend)
+                pubmed_sem, pace_lock = _get_pubmed_limiter()
+                async with pubmed_sem:
+                    await _pace_pubmed(pace_lock)
+                    # The searcher is blocking, so run it off the event loop
+                    papers = await asyncio.to_thread(searcher.search_papers, query, match_limit=match_limit)
 
             # Format results as JSON string for the agent
             result = {
@@ -96,62 +431,122 @@ def create_search_tool(backend: str = None):
                 "count": len(papers),
                 "papers": papers
             }
-            return json.dumps(result, indent=2)
+            return dumps_json(result)
         except Exception as e:
             return f"Error searching for papers: {str(e)}"
 
     return search_research_papers
 
 
+def create_search_many_tool(backend: str = None):
+    """Create a search_many_research_papers tool that batches several PubMed queries.
+
+    Args:
+        backend: Ignored (always uses PubMed)
+
+    Returns:
+        Tool function for running several searches in one call
+    """
+    @tool
+    async def search_many_research_papers(queries: List[str], match_limit: int = 5) -> str:
+        """Run several PubMed searches at once and return the combined, deduplicated papers.
+
+        Prefer this over repeated search_research_papers calls: the details of every
+        matching paper are fetched in a single request.
+        Each query uses the same PubMed syntax as search_research_papers.
+
+        Args:
+            queries: List of PubMed search queries (e.g., ['"Levofloxacin"[Title/Abstract] AND "bioequivalence"[Title/Abstract]', ...])
+            match_limit: Maximum number of papers to return per query (default: 5).
+
+        Returns:
+            A JSON string with the queries run and the combined list of research papers.
+        """
+        try:
+            async_searcher = get_async_searcher()
+            if async_searcher is not None:
+                # Native asyncio client: runs the esearches concurrently, pacing each request itself
+                papers = await async_searcher.search_many(queries, match_limit=match_limit)
+            else:
+                searcher = get_searcher(backend=backend)
+                pubmed_sem, pace_lock = _get_pubmed_limiter()
+                async with pubmed_sem:
+                    await _pace_pubmed(pace_lock)
+                    # The searcher is blocking, so run it off the event loop
+                    papers = await asyncio.to_thread(searcher.search_many, queries, match_limit=match_limit)
+
+            result = {
+                "queries": queries,
+                "count": len(papers),
+                "papers": papers
+            }
+            return dumps_json(result)
+        except Exception as e:
+            return f"Error searching for papers: {str(e)}"
+
+    return search_many_research_papers
+
+
 def parse_regulation_file(file_path: str) -> Dict[str, Dict[str, str]]:
     """Parse a regulation file to extract section structure.
 
+    Results are cached per (path, mtime), so re-parsing an unchanged file
+    (planning node, planning agent tool, retries) does no file I/O.
+
     Returns a dictionary mapping subsection IDs to their descriptions.
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    path = os.path.abspath(file_path)
+    cached = _parse_regulation_cached(path, os.stat(path).st_mtime)
+    # Hand out copies so callers can't mutate the cached result
+    return {section_id: dict(info) for section_id, info in cached.items()}
 
+
+@lru_cache(maxsize=32)
+def _parse_regulation_cached(file_path: str, mtime: float) -> Dict[str, Dict[str, str]]:
+    """Parse a regulation file (cached on path and modification time)."""
     sections = {}
     current_section_id = None
     current_section_title = None
-    current_description = []
-
-    lines = content.split('\n')
-
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
+    current_description = io.StringIO()
 
-        # Check for section header (e.g., "5.3.1.1 Bioavailability (BA) Study Reports")
-        section_match = re.match(r'^(\d+\.\d+\.\d+(?:\.\d+)?)\s+(.+)$', line)
-        if section_match:
-            # Save previous section if exists
-            if current_section_id:
-                sections[current_section_id] = {
-                    "title": current_section_title,
-                    "description": "\n".join(current_description).strip()
-                }
-
-            # Start new section
-            current_section_id = section_match.group(1)
-            current_section_title = section_match.group(2)
-            current_description = []
-        else:
-            # Add to current section description
-            if current_section_id:
-                current_description.append(line)
+    # Stream the file line by line instead of reading and splitting it up front
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+
+            # Check for section header (e.g., "5.3.1.1 Bioavailability (BA) Study Reports")
+            section_match = _SECTION_HEADER_RE.match(line)
+            if section_match:
+                # Save previous section if exists
+                if current_section_id:
+                    sections[current_section_id] = {
+                        "title": current_section_title,
+                        "description": current_description.getvalue().strip()
+                    }
+
+                # Start new section
+                current_section_id = section_match.group(1)
+                current_section_title = section_match.group(2)
+                current_description = io.StringIO()
+            else:
+                # Add to current section description
+                if current_section_id:
+                    current_description.write(line)
+                    current_description.write("\n")
 
     # Save last section
     if current_section_id:
         sections[current_section_id] = {
             "title": current_section_title,
-            "description": "\n".join(current_description).strip()
+            "description": current_description.getvalue().strip()
         }
 
     return sections
 
 
+@lru_cache(maxsize=128)
 def extract_base_drug_name(drug_name: str) -> str:
     """Extract base drug name by removing dosage, USP, and other suffixes.
 
@@ -161,15 +556,14 @@ def extract_base_drug_name(drug_name: str) -> str:
     - "Levofloxacin" -> "Levofloxacin"
     """
     # Remove common patterns: USP, dosage (mg, g, etc.), strength
-    import re
     # Remove USP, BP, EP, JP, etc.
-    base = re.sub(r'\s+(USP|BP|EP|JP|NF)\s*', ' ', drug_name, flags=re.IGNORECASE)
+    base = _PHARMACOPEIA_RE.sub(' ', drug_name)
     # Remove dosage/strength (e.g., "250mg", "500 mg", "10g")
-    base = re.sub(r'\s+\d+\s*(mg|g|mcg|µg|ml|mL)\s*', ' ', base, flags=re.IGNORECASE)
+    base = _DOSAGE_RE.sub(' ', base)
     # Remove any remaining numbers at the end
-    base = re.sub(r'\s+\d+\s*$', '', base)
+    base = _TRAILING_NUMBER_RE.sub('', base)
     # Clean up multiple spaces
-    base = re.sub(r'\s+', ' ', base).strip()
+    base = _WHITESPACE_RE.sub(' ', base).strip()
     return base if base else drug_name
 
 
@@ -178,19 +572,20 @@ def sanitize_filename(name: str) -> str:
 
     Replaces spaces and special characters with underscores.
     """
-    import re
     # Replace spaces and special characters with underscores
-    sanitized = re.sub(r'[^\w\-_\.]', '_', name)
+    sanitized = _UNSAFE_FILENAME_CHARS_RE.sub('_', name)
     # Replace multiple underscores with single underscore
-    sanitized = re.sub(r'_+', '_', sanitized)
+    sanitized = _REPEATED_UNDERSCORES_RE.sub('_', sanitized)
     return sanitized.strip('_')
 
 
+@lru_cache(maxsize=32)
 def load_drug_context(drug_name: str, base_path: str = ".") -> str:
     """Load drug-specific context from TXT files.
 
     Uses base drug name (without dosage/USP) for file lookup, but accepts
-    full drug name with dosage information.
+    full drug name with dosage information. Results are cached per process
+    (call load_drug_context.cache_clear() after editing the context files).
     """
     base_path = Path(base_path)
     context_parts = []
@@ -208,9 +603,18 @@ def load_drug_context(drug_name: str, base_path: str = ".") -> str:
         f"{drug_name}Regulations.txt",
         f"{drug_name.lower()}_regulations.txt"
     ]
+    # List the directory once and match candidates case-insensitively
+    # instead of stat'ing every candidate filename
+    try:
+        with os.scandir(base_path) as entries:
+            existing_files = {entry.name.lower(): entry.name for entry in entries if entry.is_file()}
+    except OSError:
+        existing_files = {}
+
     for filename in possible_txt:
-        filepath = base_path / filename
-        if filepath.exists():
+        actual_name = existing_files.get(filename.lower())
+        if actual_name:
+            filepath = base_path / actual_name
             try:
                 with open(filepath, 'r', encoding='utf-8') as f:
                     context_parts.append(f"=== Drug Regulations (TXT) ===\n{f.read()}")
@@ -221,6 +625,102 @@ def load_drug_context(drug_name: str, base_path: str = ".") -> str:
     return "\n\n".join(context_parts) if context_parts else ""
 
 
+def classify_retryable_error(error: BaseException, max_depth: int = 3) -> Tuple[bool, Optional[float]]:
+    """Check an exception (and up to max_depth causes/contexts) for a transient rate limit error.
+
+    Returns:
+        Tuple of (is_retryable, wait_time) where wait_time is the server-requested
+        delay parsed from the error message (plus a 1s buffer), or None if absent
+    """
+    # Fast path: the top-level error is already an OpenAI RateLimitError
+    if RateLimitError and isinstance(error, RateLimitError):
+        return True, None
+
+    current_exception = error
+    for _ in range(max_depth + 1):
+        if current_exception is None:
+            break
+        # Check for OpenAI RateLimitError or a rate limit error type from another provider
+        if RateLimitError and isinstance(current_exception, RateLimitError):
+            return True, None
+        if _RATE_LIMIT_RE.search(type(current_exception).__name__):
+            return True, None
+        # Transient provider-side failures (HTTP 5xx) are retryable too
+        status_code = getattr(current_exception, "status_code", None)
+        if isinstance(status_code, int) and status_code >= 500:
+            return True, None
+        # Check error message and try to extract the wait time from it
+        message = str(current_exception)
+        if _RATE_LIMIT_RE.search(message):
+            wait_match = _WAIT_SECONDS_RE.search(message)
+            return True, float(wait_match.group(1)) + 1 if wait_match else None
+        # Check __cause__ and __context__ for nested exceptions
+        current_exception = current_exception.__cause__ or current_exception.__context__
+
+    return False, None
+
+
+def backoff_delay(attempt: int, base_delay: float = 2.0, max_delay: float = 30.0) -> float:
+    """Exponential backoff with jitter: min(base * 2^attempt, max) + uniform(0, base).
+
+    The jitter keeps concurrent workers that hit a rate limit together from all
+    retrying in the same instant.
+    """
+    return min(base_delay * (2 ** attempt), max_delay) + random.uniform(0, base_delay)
+
+
+async def ainvoke_with_retry(agent, inputs: Dict[str, Any], label: str = "agent",
+                             max_retries: int = 5, base_delay: float = 2.0):
+    """Run agent.ainvoke, retrying rate limit / transient errors with jittered backoff."""
+    for attempt in range(max_retries):
+        try:
+            return await agent.ainvoke(inputs)
+        except Exception as e:
+            is_retryable, wait_time = classify_retryable_error(e)
+            if not is_retryable or attempt == max_retries - 1:
+                # Not a rate limit error, or max retries reached
+                raise
+            delay = wait_time or backoff_delay(attempt, base_delay)
+            print(f"⏳ [{label}] Rate limit hit. Waiting {delay:.1f}s before retry {attempt + 2}/{max_retries}...")
+            await asyncio.sleep(delay)
+
+
+def invoke_with_retry(agent, inputs: Dict[str, Any], label: str = "agent",
+                      max_retries: int = 5, base_delay: float = 2.0):
+    """Synchronous variant of ainvoke_with_retry for agent.invoke."""
+    for attempt in range(max_retries):
+        try:
+            return agent.invoke(inputs)
+        except Exception as e:
+            is_retryable, wait_time = classify_retryable_error(e)
+            if not is_retryable or attempt == max_retries - 1:
+                raise
+            delay = wait_time or backoff_delay(attempt, base_delay)
+            print(f"⏳ [{label}] Rate limit hit. Waiting {delay:.1f}s before retry {attempt + 2}/{max_retries}...")
+            time.sleep(delay)
+
+
+@lru_cache(maxsize=8)
+def get_llm(model: str = "openai:gpt-4o", temperature: float = 0.3):
+    """Get a shared chat model client for (model, temperature).
+
+    All agents with the same settings reuse one client (and its HTTP
+    connection pool) instead of constructing a new one per agent.
+    """
+    return init_chat_model(model, temperature=round(temperature, 2))
+
+
+def merge_section_results(left: Dict[str, List[Dict]], right: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+    """Reducer for per-section state (section_results, dedup_inputs): merge updates instead of overwriting.
+
+    Concurrent workers each return only their own section, so updates are combined
+    key-by-key and no worker can clobber another worker's results.
+    """
+    merged = dict(left or {})
+    merged.update(right or {})
+    return merged
+
+
 # State schema for the multi-agent system
 class ResearchState(TypedDict):
     """State schema for the multi-agent research system."""
@@ -228,14 +728,30 @@ class ResearchState(TypedDict):
     regulation_file: str
     drug_name: str
     sections: Dict[str, Dict[str, str]]  # section_id -> {title, description}
-    section_results: Dict[str, List[Dict]]  # section_id -> list of papers
+    section_results: Annotated[Dict[str, List[Dict]], merge_section_results]  # section_id -> list of papers
+    dedup_inputs: Annotated[Dict[str, Dict[str, List]], merge_section_results]  # section_id -> prepare_dedup_inputs()
     final_json: Dict[str, Any]
     current_section: str
+    drug_context: str
+
+
+class WorkerState(TypedDict):
+    """Per-branch state sent to each worker node by the planning fan-out."""
+    section_id: str
+    section_idx: int
+    total_sections: int
+    sections: Dict[str, Dict[str, str]]
+    drug_name: str
+    regulation_file: str
+    drug_context: str
+    drug_slug: str  # sanitize_filename(drug_name), computed once per run
+    regulation_stem: str  # Path(regulation_file).stem, computed once per run
+    run_timestamp: str  # ISO timestamp of the worker phase start
 
 
 def create_planning_agent(model: str = "openai:gpt-4o", temperature: float = 0.3):
     """Create the planning agent that parses regulation files."""
-    llm = init_chat_model(model, temperature=temperature)
+    llm = get_llm(model, temperature)
 
     @tool
     def parse_regulation(regulation_file_path: str) -> str:
@@ -248,7 +764,7 @@ def create_planning_agent(model: str = "openai:gpt-4o", temperature: float = 0.3
             JSON string with section structure.
         """
         sections = parse_regulation_file(regulation_file_path)
-        return json.dumps(sections, indent=2)
+        return dumps_json(sections)
 
     agent = create_agent(
         model=llm,
@@ -283,12 +799,13 @@ def create_worker_agent(section_id: str, section_title: str, section_description
         temperature: Temperature for LLM
         search_backend: Ignored (always uses PubMed)
     """
-    llm = init_chat_model(model, temperature=temperature)
+    llm = get_llm(model, temperature)
 
     # Extract base drug name for search queries
     base_drug_name = extract_base_drug_name(drug_name)
 
-    # Create search tool
+    # Create search tools (batched search first, single query for follow-ups)
+    search_many_tool = create_search_many_tool(backend=search_backend)
     search_tool = create_search_tool(backend=search_backend)
 
     system_prompt = f"""You are a specialized research assistant for ICH Module 5, Section {section_id}: {section_title}
@@ -329,6 +846,9 @@ PUBMED SEARCH QUERY GUIDELINES:
 3. Example query format:
    "Levofloxacin"[Title/Abstract] AND "bioequivalence"[Title/Abstract] AND ("generic"[Title/Abstract] OR "ANDA"[Title/Abstract])
 
+4. Run all of your queries in ONE call: search_many_research_papers(["query 1", "query 2", ...])
+   - Only use search_research_papers for a follow-up query after reviewing those results
+
 VALIDATION CRITERIA (STRICT):
 For each paper found, verify:
 1. Direct relevance: Paper must be about {base_drug_name} specifically (not just mentioned in passing)
@@ -356,7 +876,7 @@ IMPORTANT:
 
     agent = create_agent(
         model=llm,
-        tools=[search_tool],
+        tools=[search_many_tool, search_tool],
         system_prompt=system_prompt,
     )
 
@@ -365,7 +885,7 @@ IMPORTANT:
 
 def create_deduplication_agent(model: str = "openai:gpt-4o", temperature: float = 0.3):
     """Create the deduplication agent that identifies duplicate papers by index."""
-    llm = init_chat_model(model, temperature=temperature)
+    llm = get_llm(model, temperature)
 
     agent = create_agent(
         model=llm,
@@ -424,12 +944,16 @@ def planning_node(state: ResearchState) -> ResearchState:
     for idx, (section_id, section_info) in enumerate(sections.items(), 1):
         print(f"  [{idx}/{len(sections)}] {section_id}: {section_info['title']}")
 
+    # Load drug context once here so every worker branch receives it with its payload
+    drug_context = load_drug_context(drug_name)
+
     print(f"\n{'='*80}")
     print(f"✅ Planning complete. Proceeding to worker phase...")
     print(f"{'='*80}\n")
 
     return {
         "sections": sections,
+        "drug_context": drug_context,
         "messages": state["messages"] + [{
             "role": "assistant",
             "content": f"Planning complete. Found {len(sections)} subsections to process."
@@ -437,8 +961,159 @@ def planning_node(state: ResearchState) -> ResearchState:
     }
 
 
+def normalize_url(url: str) -> str:
+    """Normalize a URL for exact-match deduplication.
+
+    http/https are treated as the same, the host is lowercased, and the fragment,
+    trailing slash and utm_* tracking parameters are dropped, so trivially
+    different links to the same page compare equal.
+    """
+    parts = urlsplit(url.strip())
+    query = urlencode([
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_")
+    ])
+    return urlunsplit(("", parts.netloc.lower(), parts.path.rstrip('/'), query, "")).lstrip('/')
+
+
+def paper_identity_key(paper: Dict) -> str:
+    """Get the exact-match identity of a paper: its PMID if known, else its normalized URL.
+
+    The PMID is also recovered from PubMed URLs so that a paper with only a URL
+    (e.g. from an assistant summary) matches the same paper with a PMID field.
+    """
+    pmid = str(paper.get("pmid", "") or "").strip()
+    url = str(paper.get("url", "") or "").strip()
+    if not pmid and url:
+        pmid_match = _PUBMED_URL_PMID_RE.search(url)
+        if pmid_match:
+            pmid = pmid_match.group(1)
+    if pmid:
+        return f"pmid:{pmid}"
+    if url:
+        return f"url:{normalize_url(url)}"
+    return ""
+
+
+def prepare_dedup_inputs(papers: List[Dict]) -> Dict[str, List]:
+    """Precompute a section's deduplication inputs as soon as its worker finishes.
+
+    Returns:
+        {"keys": [identity key per paper], "papers": [lightweight {index, title, url, pmid} per paper]}
+    """
+    keys = []
+    lightweight_papers = []
+    for idx, paper in enumerate(papers):
+        get = paper.get
+        keys.append(paper_identity_key(paper))
+        lightweight_papers.append({
+            "index": idx,
+            "title": get("title", ""),
+            "url": get("url", ""),
+            "pmid": get("pmid", "")
+        })
+    return {"keys": keys, "papers": lightweight_papers}
+
+
+def has_fuzzy_title_candidates(lightweight_sections: Dict[str, Dict[str, Any]],
+                               threshold: float = FUZZY_TITLE_THRESHOLD) -> bool:
+    """Check whether any two papers in different sections have near-identical titles.
+
+    Used as a cheap prefilter so the deduplication LLM is only invoked when
+    there is something left that exact PMID/URL matching could not resolve.
+    """
+    titled = []
+    for section_id, section_data in lightweight_sections.items():
+        for paper in section_data["papers"]:
+            normalized = _NON_ALNUM_RE.sub(' ', paper.get("title", "").lower()).strip()
+            if normalized:
+                titled.append((section_id, normalized))
+
+    for i, (section_a, title_a) in enumerate(titled):
+        for section_b, title_b in titled[i + 1:]:
+            if section_a == section_b:
+                continue
+            if title_a == title_b:
+                return True
+            matcher = difflib.SequenceMatcher(None, title_a, title_b)
+            if matcher.real_quick_ratio() >= threshold and matcher.quick_ratio() >= threshold \
+                    and matcher.ratio() >= threshold:
+                return True
+
+    return False
+
+
+def run_llm_deduplication(lightweight_data: Dict[str, Any], model: str = "openai:gpt-4o",
+                          temperature: float = 0.3) -> Tuple[Dict[str, List[int]], Dict[str, Dict[str, List[str]]]]:
+    """Ask the deduplication agent to find near-duplicate papers by title.
+
+    Args:
+        lightweight_data: {"sections": {section_id: {"title", "papers": [{index, title, url, pmid}]}}}
+        model: LLM model to use
+        temperature: Temperature for LLM
+
+    Returns:
+        Tuple of (removals, also_relevant) as returned by the agent
+    """
+    # Create deduplication agent
+    dedup_agent = create_deduplication_agent(model=model, temperature=temperature)
+
+    # Prepare prompt for deduplication (only titles and URLs, compact to save prompt tokens)
+    lightweight_json = dumps_json(lightweight_data, indent=False)
+    prompt = f"""Analyze the following research papers and identify duplicates across sections.
+
+PAPERS BY SECTION (with indices):
+{lightweight_json}
+
+NOTE: Exact PMID/URL duplicates have already been removed. Use each paper's "index" field when reporting indices.
+
+TASK:
+1. Identify duplicate papers by comparing URLs (exact match) and titles (very similar)
+2. For each duplicate group, determine the PRIMARY section (most relevant)
+3. Return a JSON object with:
+   - "removals": {{"section_id": [index1, index2, ...]}} - indices to remove from each section
+   - "also_relevant": {{"section_id": {{"index": [other_section_ids]}}}} - papers that are also relevant to other sections
+
+Return ONLY the JSON object with removals and also_relevant mappings. Indices are 0-based."""
+
+    # Run the deduplication agent
+    inputs = {"messages": [{"role": "user", "content": prompt}]}
+
+    print("🤖 Running deduplication agent...")
+    print("   Analyzing paper titles and URLs for duplicates (lightweight mode)...\n")
+    result = invoke_with_retry(dedup_agent, inputs, label="dedup")
+
+    # Extract the removals JSON from the agent's response
+    removals_data = None
+    if result and "messages" in result:
+        for message in reversed(result["messages"]):
+            if isinstance(message, BaseMessage) and message.content:
+                content = message_text(message)
+                # Cheap substring gate before running any regex over the message
+                if '"removals"' not in content:
+                    continue
+                # Look for JSON in the response
+                try:
+                    # Try to find JSON object with removals
+                    json_match = _REMOVALS_OBJECT_RE.search(content)
+                    if json_match:
+                        removals_data = loads_json(json_match.group(0))
+                        break
+                    # Try broader match
+                    json_match = _REMOVALS_BROAD_RE.search(content)
+                    if json_match:
+                        removals_data = loads_json(json_match.group(1))
+                        break
+                except ValueError:
+                    pass
+
+    if not removals_data:
+        return {}, {}
+    return removals_data.get("removals", {}), removals_data.get("also_relevant", {})
+
+
 def deduplication_node(state: ResearchState, model: str = "openai:gpt-4o", temperature: float = 0.3) -> ResearchState:
-    """Deduplication node: Use LLM to identify duplicates by index, then apply removals to original JSON."""
+    """Deduplication node: Remove exact PMID/URL duplicates, use LLM only for near-duplicate titles."""
     dedup_start = datetime.datetime.now()
 
     print(f"\n{'='*80}")
@@ -448,9 +1123,15 @@ def deduplication_node(state: ResearchState, model: str = "openai:gpt-4o", tempe
 
     sections = state["sections"]
     section_results = state.get("section_results", {})
+    dedup_inputs = state.get("dedup_inputs", {})
     drug_name = state["drug_name"]
     regulation_file = state["regulation_file"]
 
+    # Final JSON goes in the module5Results folder (same path with or without dedup)
+    output_dir = Path("module5Results")
+    output_dir.mkdir(exist_ok=True)
+    output_file = output_dir / f"{sanitize_filename(drug_name)}_{Path(regulation_file).stem}_papers.json"
+
     # Prepare lightweight data with only titles and URLs for deduplication
     lightweight_data = {
         "sections": {}
@@ -458,110 +1139,112 @@ def deduplication_node(state: ResearchState, model: str = "openai:gpt-4o", tempe
 
     # Store original full data for later use
     original_sections_data = {}
+    # Per-section counts kept as parallel lists aligned with section_ids
+    section_ids = []
+    mention_counts = []
     total_mentions = 0
-    papers_by_section = {}
 
+    # Exact-match duplicates (same PMID/URL) are resolved deterministically: the first
+    # occurrence in section order is the PRIMARY copy, later ones are removed and their
+    # sections recorded as also-relevant on the primary (same shape the agent returns)
+    seen = {}  # identity key -> (primary section_id, primary index)
+    removals = {}
+    also_relevant = {}
+    exact_duplicates = 0
+
+    # Single pass: original data, counts, exact duplicates and the lightweight
+    # version of the remaining papers (only index, title, URL and PMID)
     for section_id, section_info in sections.items():
         papers = section_results.get(section_id, [])
-        papers_by_section[section_id] = len(papers)
-        total_mentions += len(papers)
+        count = len(papers)
+        section_ids.append(section_id)
+        mention_counts.append(count)
+        total_mentions += count
 
-        # Store original full data
         original_sections_data[section_id] = {
             "title": section_info["title"],
             "description": section_info["description"],
             "papers": papers
         }
 
-        # Create lightweight version with only index, title, and URL
+        # Use the keys/entries the worker precomputed, unless they are missing or stale
+        prepared = dedup_inputs.get(section_id)
+        if not prepared or len(prepared["keys"]) != len(papers):
+            prepared = prepare_dedup_inputs(papers)
+        prepared_papers = prepared["papers"]
+
+        lightweight_papers = []
+        append_lightweight = lightweight_papers.append
+        for idx, key in enumerate(prepared["keys"]):
+            if key:
+                primary = seen.setdefault(key, (section_id, idx))
+                if primary[1] != idx or primary[0] != section_id:
+                    removals.setdefault(section_id, []).append(idx)
+                    exact_duplicates += 1
+                    primary_section, primary_idx = primary
+                    if primary_section != section_id:
+                        other_sections = also_relevant.setdefault(primary_section, {}).setdefault(str(primary_idx), [])
+                        if section_id not in other_sections:
+                            other_sections.append(section_id)
+                    continue
+
+            append_lightweight(prepared_papers[idx])
+
         lightweight_data["sections"][section_id] = {
             "title": section_info["title"],
-            "papers": [
-                {
-                    "index": idx,
-                    "title": paper.get("title", ""),
-                    "url": paper.get("url", ""),
-                    "pmid": paper.get("pmid", "")
-                }
-                for idx, paper in enumerate(papers)
-            ]
+            "papers": lightweight_papers
         }
 
-    # Create deduplication agent
-    dedup_agent = create_deduplication_agent(model=model, temperature=temperature)
-
-    # Prepare prompt for deduplication (only titles and URLs)
-    lightweight_json = json.dumps(lightweight_data, indent=2)
-    prompt = f"""Analyze the following research papers and identify duplicates across sections.
-
-PAPERS BY SECTION (with indices):
-{lightweight_json}
-
-TASK:
-1. Identify duplicate papers by comparing URLs (exact match) and titles (very similar)
-2. For each duplicate group, determine the PRIMARY section (most relevant)
-3. Return a JSON object with:
-   - "removals": {{"section_id": [index1, index2, ...]}} - indices to remove from each section
-   - "also_relevant": {{"section_id": {{"index": [other_section_ids]}}}} - papers that are also relevant to other sections
-
-Return ONLY the JSON object with removals and also_relevant mappings. Indices are 0-based."""
-
-    # Run the deduplication agent
-    inputs = {"messages": [{"role": "user", "content": prompt}]}
-
     try:
-        print("🤖 Running deduplication agent...")
-        print("   Analyzing paper titles and URLs for duplicates (lightweight mode)...\n")
-        result = dedup_agent.invoke(inputs)
-
-        # Extract the removals JSON from the agent's response
-        removals_data = None
-        if result and "messages" in result:
-            for message in reversed(result["messages"]):
-                if hasattr(message, 'content') and message.content:
-                    content = str(message.content)
-                    # Look for JSON in the response
-                    try:
-                        # Try to find JSON object with removals
-                        json_match = re.search(r'\{[^{}]*"removals"[^{}]*\}', content, re.DOTALL)
-                        if json_match:
-                            removals_data = json.loads(json_match.group(0))
-                            break
-                        # Try broader match
-                        json_match = re.search(r'(\{.*"removals".*\})', content, re.DOTALL)
-                        if json_match:
-                            removals_data = json.loads(json_match.group(1))
-                            break
-                    except (json.JSONDecodeError, ValueError):
-                        pass
+        print(f"🔑 Exact PMID/URL matching: {exact_duplicates} duplicates found")
+
+        if has_fuzzy_title_candidates(lightweight_data["sections"]):
+            llm_removals, llm_also_relevant = run_llm_deduplication(
+                lightweight_data, model=model, temperature=temperature
+            )
+            for section_id, indices in llm_removals.items():
+                section_removals = removals.setdefault(section_id, [])
+                section_removals.extend(int(idx) for idx in indices if int(idx) not in section_removals)
+            for section_id, index_map in llm_also_relevant.items():
+                for paper_idx, other_sections in index_map.items():
+                    existing = also_relevant.setdefault(section_id, {}).setdefault(str(paper_idx), [])
+                    existing.extend(sid for sid in other_sections if sid not in existing)
+        else:
+            print("✅ No near-duplicate titles remain - skipping deduplication agent\n")
 
         # Apply removals to original data
         final_sections = {}
-        removals = removals_data.get("removals", {}) if removals_data else {}
-        also_relevant = removals_data.get("also_relevant", {}) if removals_data else {}
 
         papers_removed = 0
         duplicates_found = 0
+        unique_counts = []
+        total_unique_papers = 0
 
         for section_id, section_data in original_sections_data.items():
-            papers = section_data["papers"].copy()
-            indices_to_remove = set(removals.get(section_id, []))
+            original_papers = section_data["papers"]
 
-            # Remove papers at specified indices (in reverse order to maintain indices)
-            for idx in sorted(indices_to_remove, reverse=True):
-                if 0 <= idx < len(papers):
-                    papers.pop(idx)
-                    papers_removed += 1
-                    duplicates_found += 1
+            # Removal mask over the original list (1 = remove); duplicate indices collapse
+            remove_mask = bytearray(len(original_papers))
+            for idx in removals.get(section_id, []):
+                if 0 <= idx < len(remove_mask):
+                    remove_mask[idx] = 1
+            removed_count = remove_mask.count(1)
 
-            # Add also_relevant_to fields
+            # Add also_relevant_to fields (indices refer to the original, unfiltered list)
             section_also_relevant = also_relevant.get(section_id, {})
             for paper_idx, other_sections in section_also_relevant.items():
                 paper_idx_int = int(paper_idx)
-                if 0 <= paper_idx_int < len(papers):
-                    if "also_relevant_to" not in papers[paper_idx_int]:
-                        papers[paper_idx_int]["also_relevant_to"] = []
-                    papers[paper_idx_int]["also_relevant_to"].extend(other_sections)
+                if 0 <= paper_idx_int < len(original_papers) and not remove_mask[paper_idx_int]:
+                    if "also_relevant_to" not in original_papers[paper_idx_int]:
+                        original_papers[paper_idx_int]["also_relevant_to"] = []
+                    original_papers[paper_idx_int]["also_relevant_to"].extend(other_sections)
+
+            # Remove papers at specified indices in a single pass
+            papers = [paper for paper, removed in zip(original_papers, remove_mask) if not removed]
+            papers_removed += removed_count
+            duplicates_found += removed_count
+            unique_counts.append(len(papers))
+            total_unique_papers += unique_counts[-1]
 
             final_sections[section_id] = {
                 "title": section_data["title"],
@@ -570,8 +1253,6 @@ Return ONLY the JSON object with removals and also_relevant mappings. Indices ar
             }
 
         # Build final JSON structure
-        total_unique_papers = sum(len(s["papers"]) for s in final_sections.values())
-
         final_json = {
             "drug_name": drug_name,
             "regulation_section": Path(regulation_file).stem,
@@ -579,7 +1260,7 @@ Return ONLY the JSON object with removals and also_relevant mappings. Indices ar
             "summary": {
                 "total_unique_papers": total_unique_papers,
                 "total_mentions": total_mentions,
-                "papers_by_section": {sid: len(s["papers"]) for sid, s in final_sections.items()},
+                "papers_by_section": dict(zip(section_ids, unique_counts)),
                 "deduplication_stats": {
                     "duplicates_found": duplicates_found,
                     "papers_removed": papers_removed
@@ -587,12 +1268,9 @@ Return ONLY the JSON object with removals and also_relevant mappings. Indices ar
             }
         }
 
+
         # Save final JSON in module5Results folder
-        output_dir = Path("module5Results")
-        output_dir.mkdir(exist_ok=True)
-        output_file = output_dir / f"{sanitize_filename(drug_name)}_{Path(regulation_file).stem}_papers.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(final_json, f, indent=2, ensure_ascii=False)
+        write_json_file(final_json, output_file)
 
         dedup_end = datetime.datetime.now()
         duration = (dedup_end - dedup_start).total_seconds()
@@ -617,7 +1295,6 @@ Return ONLY the JSON object with removals and also_relevant mappings. Indices ar
         }
     except Exception as e:
         print(f"Error in deduplication: {e}")
-        import traceback
         traceback.print_exc()
 
         # Fallback: create JSON without deduplication
@@ -628,7 +1305,7 @@ Return ONLY the JSON object with removals and also_relevant mappings. Indices ar
             "summary": {
                 "total_unique_papers": total_mentions,
                 "total_mentions": total_mentions,
-                "papers_by_section": papers_by_section,
+                "papers_by_section": dict(zip(section_ids, mention_counts)),
                 "deduplication_stats": {
                     "duplicates_found": 0,
                     "papers_removed": 0
@@ -636,12 +1313,8 @@ Return ONLY the JSON object with removals and also_relevant mappings. Indices ar
             }
         }
 
-        # Save final JSON in module5Results folder
-        output_dir = Path("module5Results")
-        output_dir.mkdir(exist_ok=True)
-        output_file = output_dir / f"{sanitize_filename(drug_name)}_{Path(regulation_file).stem}_papers.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(final_json, f, indent=2, ensure_ascii=False)
+        write_json_file(final_json, output_file)
+
 
         return {
             "final_json": final_json,
@@ -654,6 +1327,60 @@ Return ONLY the JSON object with removals and also_relevant mappings. Indices ar
 
 
 
+def is_valid_paper(paper: Any) -> bool:
+    """Check if a paper has real data: a non-placeholder title and an http(s) URL."""
+    if not isinstance(paper, dict):
+        return False
+    title = paper.get('title')
+    url = paper.get('url')
+    if not isinstance(title, str) or not isinstance(url, str):
+        return False
+    title = title.strip()
+    url = url.strip()
+    return title not in _PLACEHOLDERS and url not in _PLACEHOLDERS and url.startswith('http')
+
+
+def classify_papers(papers_list: List[Any]) -> Tuple[bool, bool]:
+    """Scan papers once for placeholder values (e.g. "...") and real data.
+
+    Returns:
+        Tuple of (has_placeholder_values, has_real_data); stops as soon as both are found
+    """
+    has_placeholder = False
+    has_real = False
+    for paper in papers_list or []:
+        if not isinstance(paper, dict):
+            continue
+        for value in paper.values():
+            if not isinstance(value, str):
+                continue
+            value = value.strip()
+            if value in _PLACEHOLDERS:
+                has_placeholder = True
+            elif len(value) > 3:
+                has_real = True
+            if has_placeholder and has_real:
+                return True, True
+    return has_placeholder, has_real
+
+
+def message_text(message: BaseMessage) -> str:
+    """Get a message's content as a string, only converting when it isn't one already."""
+    content = message.content
+    return content if isinstance(content, str) else str(content)
+
+
+def papers_from_json(parsed: Any) -> List[Dict]:
+    """Return the paper list from a parsed JSON value, or [] if it doesn't look like papers."""
+    if isinstance(parsed, dict):
+        papers = parsed.get("papers")
+        return papers if isinstance(papers, list) else []
+    if isinstance(parsed, list) and parsed and isinstance(parsed[0], dict):
+        if any(key in parsed[0] for key in ['title', 'url', 'description']):
+            return parsed
+    return []
+
+
 def extract_papers_from_result(result: Any) -> List[Dict]:
     """Extract papers from agent result."""
     papers = []
@@ -662,16 +1389,8 @@ def extract_papers_from_result(result: Any) -> List[Dict]:
         tool_papers = []
         for message in result["messages"]:
             # Check for tool results
-            if hasattr(message, 'type') and message.type == 'tool' and hasattr(message, 'content'):
-                try:
-                    tool_result = json.loads(str(message.content))
-                    if isinstance(tool_result, dict):
-                        if "papers" in tool_result:
-                            tool_papers.extend(tool_result["papers"])
-                        elif "query" in tool_result and "papers" in tool_result:
-                            tool_papers.extend(tool_result["papers"])
-                except (json.JSONDecodeError, AttributeError):
-                    pass
+            if isinstance(message, ToolMessage):
+                tool_papers.extend(load_tool_papers(message.content))
 
         # Use tool papers as primary source (most reliable)
         papers = tool_papers
@@ -680,189 +1399,115 @@ def extract_papers_from_result(result: Any) -> List[Dict]:
         # We'll merge both sources, preferring assistant's final summary if it exists
         assistant_papers = []
         for message in result["messages"]:
-                if hasattr(message, 'content') and message.content:
-                    content = str(message.content)
-
-                    # Try to parse as JSON directly
-                    try:
-                        parsed = json.loads(content)
-                        if isinstance(parsed, dict):
-                            if "papers" in parsed:
-                                assistant_papers = parsed["papers"]
-                            elif "query" in parsed and "papers" in parsed:
-                                assistant_papers = parsed["papers"]
-                        elif isinstance(parsed, list):
-                            # Check if it's a list of paper objects
-                            if parsed and isinstance(parsed[0], dict) and any(key in parsed[0] for key in ['title', 'url', 'description']):
-                                assistant_papers = parsed
-                    except json.JSONDecodeError:
-                        # Try to extract JSON from text using multiple strategies
-                        # Strategy 0: Extract from code blocks (```json ... ```)
+            if isinstance(message, BaseMessage) and message.content:
+                content = message_text(message)
+
+                # Fast path: the whole message is JSON (the common case)
+                try:
+                    assistant_papers = papers_from_json(loads_json(content))
+                except ValueError:
+                    # Scan for balanced JSON spans embedded in surrounding text/code blocks (O(n), no regex)
+                    for span in iter_json_spans(content):
                         try:
-                            code_block_match = re.search(r'```(?:json)?\s*(\[.*?\]|\{.*?"papers".*?\})\s*```', content, re.DOTALL)
-                            if code_block_match:
-                                parsed = json.loads(code_block_match.group(1))
-                                if isinstance(parsed, list):
-                                    assistant_papers = parsed
-                                elif isinstance(parsed, dict):
-                                    if "papers" in parsed:
-                                        assistant_papers = parsed["papers"]
-                        except (json.JSONDecodeError, ValueError):
-                            pass
-
-                        # Strategy 1: Look for JSON arrays (more flexible pattern)
-                        if not assistant_papers:
-                            try:
-                                # Match JSON array with objects containing "title" field
-                                json_match = re.search(r'\[\s*(\{[^}]*"title"[^}]*\}(?:\s*,\s*\{[^}]*"title"[^}]*\})*)\s*\]', content, re.DOTALL)
-                                if json_match:
-                                    # Reconstruct full array
-                                    array_str = "[" + json_match.group(1) + "]"
-                                    parsed = json.loads(array_str)
-                                    if isinstance(parsed, list):
-                                        assistant_papers = parsed
-                            except (json.JSONDecodeError, ValueError):
-                                pass
-
-                        # Strategy 2: Look for JSON objects with papers array
-                        if not assistant_papers:
-                            try:
-                                json_match = re.search(r'\{\s*"papers"\s*:\s*\[.*?\]\s*\}', content, re.DOTALL)
-                                if json_match:
-                                    parsed = json.loads(json_match.group(0))
-                                    if isinstance(parsed, dict) and "papers" in parsed:
-                                        assistant_papers = parsed["papers"]
-                            except (json.JSONDecodeError, ValueError):
-                                pass
-
-                        # Strategy 3: Look for any JSON array structure (most permissive)
-                        if not assistant_papers:
-                            try:
-                                # Find JSON array that might span multiple lines
-                                json_match = re.search(r'\[\s*(?:\{[^}]*\}(?:\s*,\s*\{[^}]*\})*)\s*\]', content, re.DOTALL)
-                                if json_match:
-                                    parsed = json.loads(json_match.group(0))
-                                    if isinstance(parsed, list) and len(parsed) > 0:
-                                        # Verify it looks like papers (has title, url, or description)
-                                        if all(isinstance(p, dict) and any(k in p for k in ['title', 'url', 'description']) for p in parsed):
-                                            assistant_papers = parsed
-                            except (json.JSONDecodeError, ValueError):
-                                pass
-
-                    if assistant_papers:
-                        break
+                            assistant_papers = papers_from_json(loads_json(span))
+                        except ValueError:
+                            continue
+                        if assistant_papers:
+                            break
+
+                if assistant_papers:
+                    break
 
         # Merge tool papers and assistant papers, preferring assistant's aggregated version
         # BUT: Check if assistant_papers contains placeholder values - if so, use tool_papers instead
-        def has_placeholder_values(papers_list):
-            """Check if papers list contains placeholder values like '...'."""
-            if not papers_list:
-                return False
-            for paper in papers_list:
-                if isinstance(paper, dict):
-                    # Check if any field is just "..." or similar placeholder
-                    for key, value in paper.items():
-                        if isinstance(value, str) and value.strip() in ["...", ".", "-", ""]:
-                            return True
-            return False
-
-        def has_real_data(papers_list):
-            """Check if papers list has real data (not just placeholders)."""
-            if not papers_list:
-                return False
-            for paper in papers_list:
-                if isinstance(paper, dict):
-                    # Check if we have at least one real field
-                    for key, value in paper.items():
-                        if isinstance(value, str) and value.strip() not in ["...", ".", "-", ""] and len(value.strip()) > 3:
-                            return True
-            return False
-
-        def is_valid_paper(paper: dict) -> bool:
-            """Check if a paper has real data (not just placeholders)."""
-            if not isinstance(paper, dict):
-                return False
-
-            # Check if title is valid (required field)
-            title = paper.get('title', '').strip()
-            if not title or title in ["...", ".", "-", ""]:
-                return False
-
-            # Check if URL is valid (required field)
-            url = paper.get('url', '').strip()
-            if not url or url in ["...", ".", "-", ""] or not url.startswith('http'):
-                return False
-
-            # Paper is valid if it has a real title and URL
-            return True
-
-        def filter_valid_papers(papers_list: List[Dict]) -> List[Dict]:
-            """Filter out papers with placeholder values."""
-            if not papers_list:
-                return []
-            return [p for p in papers_list if is_valid_paper(p)]
-
-        if assistant_papers and not has_placeholder_values(assistant_papers):
+        assistant_has_placeholders, _ = classify_papers(assistant_papers)
+        _, tool_has_real_data = classify_papers(tool_papers)
+
+        if assistant_papers and not assistant_has_placeholders:
             # If assistant provided an aggregated list without placeholders, prefer it
             papers = assistant_papers
-        elif tool_papers and has_real_data(tool_papers):
+        elif tool_papers and tool_has_real_data:
             # Use raw tool results (these are the actual papers from the search)
             papers = tool_papers
             # Debug: Log that we're using tool papers (likely because assistant had placeholders)
-            if assistant_papers and has_placeholder_values(assistant_papers):
+            if assistant_papers and assistant_has_placeholders:
                 print(f"   🔧 Using tool_papers ({len(tool_papers)} papers) - assistant_papers contained placeholders")
         elif assistant_papers:
-            # Try to filter out placeholders from assistant papers
-            filtered_assistant = filter_valid_papers(assistant_papers)
-            if filtered_assistant:
-                papers = filtered_assistant
-                print(f"   🔧 Filtered assistant_papers: {len(assistant_papers)} -> {len(filtered_assistant)} valid papers")
-            else:
-                # No valid papers found, use empty list
-                papers = []
-                print(f"   ⚠️  No valid papers found - assistant_papers contained only placeholders")
+            # Placeholders are filtered out of the assistant papers in the pass below
+            papers = assistant_papers
         else:
             # Last resort: use tool_papers even if they might have issues
             papers = tool_papers
 
-        # Filter out any remaining placeholder papers
-        papers = filter_valid_papers(papers)
-
-        # Deduplicate papers by URL
-        if papers:
-            seen_urls = set()
-            unique_papers = []
-            for paper in papers:
-                url = paper.get('url', '')
-                if url and url not in seen_urls:
-                    seen_urls.add(url)
-                    unique_papers.append(paper)
-                elif not url:  # Only include papers without URLs if they have valid titles
-                    title = paper.get('title', '').strip()
-                    if title and title not in ["...", ".", "-", ""]:
-                        unique_papers.append(paper)
-            papers = unique_papers
+        # Single pass: drop placeholder papers and deduplicate by normalized URL
+        seen_urls = set()
+        unique_papers = []
+        for paper in papers:
+            if not is_valid_paper(paper):
+                continue
+            url_key = normalize_url(paper['url'])
+            if url_key in seen_urls:
+                continue
+            seen_urls.add(url_key)
+            unique_papers.append(paper)
+
+        if papers is assistant_papers and assistant_has_placeholders:
+            if unique_papers:
+                print(f"   🔧 Filtered assistant_papers: {len(assistant_papers)} -> {len(unique_papers)} valid papers")
+            else:
+                print(f"   ⚠️  No valid papers found - assistant_papers contained only placeholders")
+        papers = unique_papers
 
     return papers if papers else []
 
 
+def fallback_extract_papers(messages: List[Any]) -> List[Dict]:
+    """Last-resort extraction: return the first paper list found in any message, newest first.
+
+    Only messages that mention papers/research are scanned; every balanced JSON span
+    is tried as an array of paper objects or a {"papers": [...]} object.
+    """
+    for message in reversed(messages):
+        if not (isinstance(message, BaseMessage) and message.content):
+            continue
+        content = message_text(message)
+        if '[' not in content:
+            continue
+        content_lower = content.lower()
+        if 'paper' not in content_lower and 'research' not in content_lower:
+            continue
+        for span in iter_json_spans(content):
+            try:
+                parsed = loads_json(span)
+            except ValueError:
+                continue
+            if isinstance(parsed, list) and parsed and isinstance(parsed[0], dict):
+                return parsed
+            if isinstance(parsed, dict) and isinstance(parsed.get("papers"), list) and parsed["papers"]:
+                return parsed["papers"]
+    return []
+
+
+def sections_ndjson_path(drug_slug: str, regulation_stem: str, base_path: str = ".") -> Path:
+    """Path of the NDJSON file that collects a run's saved sections."""
+    return Path(base_path) / "module5Results" / f"{drug_slug}_{regulation_stem}_sections.ndjson"
+
+
 def save_section_results(drug_name: str, regulation_file: str, section_id: str,
-                        section_title: str, papers: List[Dict], base_path: str = "."):
-    """Save individual section results to a JSON file."""
+                        section_title: str, papers: List[Dict], base_path: str = ".",
+                        drug_slug: str = None, regulation_stem: str = None, saved_at: str = None):
+    """Save individual section results to a compact JSON file.
+
+    Each section is also appended as one line to the run's NDJSON file
+    (module5Results/{drug}_{regulation}_sections.ndjson, emptied by fan_out_workers
+    when the run starts) so consumers can stream sections without re-parsing
+    every per-section file.
+
+    drug_slug, regulation_stem and saved_at are invariant for a run; callers that
+    save many sections pass them in precomputed, otherwise they are derived here.
+    """
     try:
         # Final validation: filter out any placeholder papers before saving
-        def is_valid_paper(paper: dict) -> bool:
-            """Check if a paper has real data (not just placeholders)."""
-            if not isinstance(paper, dict):
-                return False
-            title = paper.get('title', '').strip()
-            url = paper.get('url', '').strip()
-            if not title or title in ["...", ".", "-", ""]:
-                return False
-            if not url or url in ["...", ".", "-", ""] or not url.startswith('http'):
-                return False
-            return True
-
         valid_papers = [p for p in papers if is_valid_paper(p)]
 
         if len(valid_papers) < len(papers):
@@ -871,21 +1516,26 @@ def save_section_results(drug_name: str, regulation_file: str, section_id: str,
         output_dir = Path(base_path) / "module5Results" / "section_results"
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        filename = f"{sanitize_filename(drug_name)}_{Path(regulation_file).stem}_{section_id.replace('.', '_')}_papers.json"
+        if drug_slug is None:
+            drug_slug = sanitize_filename(drug_name)
+        if regulation_stem is None:
+            regulation_stem = Path(regulation_file).stem
+
+        filename = f"{drug_slug}_{regulation_stem}_{section_id.replace('.', '_')}_papers.json"
         filepath = output_dir / filename
 
         section_data = {
             "drug_name": drug_name,
-            "regulation_section": Path(regulation_file).stem,
+            "regulation_section": regulation_stem,
             "section_id": section_id,
             "section_title": section_title,
             "papers": valid_papers,
             "paper_count": len(valid_papers),
-            "saved_at": datetime.datetime.now().isoformat()
+            "saved_at": saved_at or datetime.datetime.now().isoformat()
         }
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(section_data, f, indent=2, ensure_ascii=False)
+        write_json_file(section_data, filepath, indent=False)
+        append_json_line(section_data, sections_ndjson_path(drug_slug, regulation_stem, base_path))
 
         print(f"   💾 Results saved to: {filepath}")
         return str(filepath)
@@ -894,9 +1544,203 @@ def save_section_results(drug_name: str, regulation_file: str, section_id: str,
         return None
 
 
+async def worker_node_async(state: ResearchState, section_id: str, section_idx: int = 1,
+                            total_sections: int = 1, drug_context: str = "",
+                            model: str = "openai:gpt-4o", temperature: float = 0.3,
+                            search_backend: str = None) -> Dict[str, List[Dict]]:
+    """Run the worker agent for a single section.
+
+    Args:
+        state: Current research state (must contain sections, drug_name, regulation_file)
+        section_id: Section identifier to process
+        section_idx: 1-based position of the section (for progress output)
+        total_sections: Total number of sections being processed
+        drug_context: Drug-specific context loaded once for all workers
+        model: LLM model to use
+        temperature: Temperature for LLM
+        search_backend: Ignored (always uses PubMed)
+
+    Returns:
+        Dictionary mapping section_id to its list of papers
+    """
+    section_info = state["sections"][section_id]
+    drug_name = state["drug_name"]
+    regulation_file = state["regulation_file"]
+
+    try:
+        section_start = datetime.datetime.now()
+
+        print(f"\n{'─'*80}")
+        print(f"📄 [{section_idx}/{total_sections}] Processing Section {section_id} (PARALLEL)")
+        print(f"   Title: {section_info['title']}")
+        print(f"   Started: {section_start.strftime('%H:%M:%S')}")
+        print(f"{'─'*80}\n")
+
+        worker = create_worker_agent(
+            section_id,
+            section_info["title"],
+            section_info["description"],
+            drug_name,
+            drug_context,
+            model=model,
+            temperature=temperature,
+            search_backend=search_backend
+        )
+
+        # Extract base drug name for the query
+        base_drug_name = extract_base_drug_name(drug_name)
+
+        query = f"""Search PubMed for research papers HIGHLY RELEVANT to Section {section_id}: {section_info['title']} for {drug_name} ANDA submission.
+
+CRITICAL REQUIREMENTS:
+1. Use PubMed search syntax with field tags: "{base_drug_name}"[Title/Abstract] AND "specific_term"[Title/Abstract]
+2. Generate 4-8 focused queries targeting {base_drug_name} + section-specific terms
+3. Be STRICT on relevance: Only include papers that are:
+   - Directly about {base_drug_name} (not just mentioned in passing)
+   - Specifically address {section_info['title']} requirements
+   - Relevant to ANDA submission/generic drug development context
+4. EXCLUDE papers about other drugs, general methodology, or clinical use not related to biopharmaceutics
+5. Quality over quantity: Return only highly relevant papers
+
+Return your final answer as a JSON array of validated papers: [{{\"title\": \"...\", \"url\": \"...\", \"description\": \"...\", \"relevance_reason\": \"...\"}}]"""
+        inputs = {"messages": [{"role": "user", "content": query}]}
+
+        # Reserve this run's estimated tokens from the shared budget before taking a
+        # concurrency slot, so waiting on the budget never holds a slot idle
+        llm_sem, budget_lock = _get_llm_limiter()
+        estimated_tokens = estimate_tokens(query + drug_context + section_info["description"]) + EXPECTED_OUTPUT_TOKENS
+        await _reserve_llm_tokens(budget_lock, estimated_tokens)
+        async with llm_sem:
+            print(f"🤖 [{section_id}] Agent generating search queries and searching for papers...\n")
+            result = await ainvoke_with_retry(worker, inputs, label=section_id)
+
+        # Debug: Print what the agent returned
+        if result and "messages" in result:
+            print(f"🔍 [{section_id}] DEBUG: Agent returned {len(result['messages'])} messages")
+            tool_result_count = 0
+            for msg in result["messages"]:
+                # Count tool messages that might contain papers
+                if isinstance(msg, ToolMessage):
+                    tool_result_count += 1
+                    paper_count = len(load_tool_papers(msg.content))
+                    if paper_count > 0:
+                        print(f"   🔍 Tool result contains {paper_count} papers")
+
+            # Show last 3 messages preview
+            for idx, msg in enumerate(result["messages"][-3:], 1):
+                if isinstance(msg, BaseMessage) and msg.content:
+                    content = message_text(msg)
+                    content_preview = content[:200] + "..." if len(content) > 200 else content
+                    print(f"   Message {idx} ({msg.type}) preview: {content_preview}")
+
+            if tool_result_count > 0:
+                print(f"   📊 Found {tool_result_count} tool result messages")
+
+        papers = extract_papers_from_result(result)
+
+        # Debug: Log what was extracted
+        if papers:
+            print(f"   📄 Extracted {len(papers)} papers from agent result")
+            if papers and isinstance(papers[0], dict):
+                sample_title = papers[0].get('title', 'N/A')[:50]
+                print(f"   📝 Sample paper title: {sample_title}...")
+        else:
+            print(f"   ⚠️  No valid papers extracted from agent result")
+
+        # Additional extraction: scan messages more aggressively if nothing was found
+        if not papers and result and "messages" in result:
+            papers = fallback_extract_papers(result["messages"])
+            if papers:
+                print(f"🔍 [{section_id}] Found {len(papers)} papers via JSON scan")
+
+        # Save individual section results off the event loop so other workers keep running
+        await asyncio.to_thread(
+            save_section_results,
+            drug_name,
+            regulation_file,
+            section_id,
+            section_info["title"],
+            papers,
+            drug_slug=state.get("drug_slug"),
+            regulation_stem=state.get("regulation_stem"),
+            saved_at=state.get("run_timestamp")
+        )
+
+        section_end = datetime.datetime.now()
+        duration = (section_end - section_start).total_seconds()
+
+        print(f"\n{'─'*80}")
+        print(f"✅ Section {section_id} COMPLETE")
+        print(f"   Papers found: {len(papers)}")
+        print(f"   Duration: {duration:.1f}s")
+        if len(papers) == 0:
+            print(f"   ⚠️  No papers found - check search queries or API responses")
+        print(f"{'─'*80}\n")
+
+        return {section_id: papers}
+
+    except Exception as e:
+        print(f"\n{'─'*80}")
+        print(f"❌ ERROR in Section {section_id}: {type(e).__name__}: {e}")
+        if DEBUG:
+            print(f"   Traceback: {traceback.format_exc()}")
+        print(f"{'─'*80}\n")
+        return {section_id: []}
+
+
+def fan_out_workers(state: ResearchState) -> Union[List[Send], str]:
+    """Conditional edge after planning: dispatch one worker branch per section.
+
+    LangGraph runs every Send in the same superstep concurrently and merges the
+    branch updates through the section_results reducer, so each section is an
+    independently scheduled (and checkpointed) node execution.
+
+    Returns:
+        A Send to "worker" for every section, or "deduplication" if there are none
+    """
+    sections = state.get("sections", {})
+    total_sections = len(sections)
+
+    if not sections:
+        return "deduplication"
+
+    print(f"\n{'='*80}")
+    print(f"🔍 WORKER PHASE: Processing {total_sections} sections in PARALLEL...")
+    print(f"🔎 Search Backend: PubMed/NCBI")
+    print(f"{'='*80}\n")
+
+    # Run-invariant values every worker needs for its output file, computed once
+    drug_slug = sanitize_filename(state["drug_name"])
+    regulation_stem = Path(state["regulation_file"]).stem
+    run_timestamp = datetime.datetime.now().isoformat()
+
+    # Start this run's NDJSON file empty; each worker appends its section to it
+    ndjson_path = sections_ndjson_path(drug_slug, regulation_stem)
+    ndjson_path.parent.mkdir(parents=True, exist_ok=True)
+    ndjson_path.write_bytes(b"")
+
+    return [
+        Send("worker", {
+            "section_id": section_id,
+            "section_idx": idx,
+            "total_sections": total_sections,
+            "sections": sections,
+            "drug_name": state["drug_name"],
+            "regulation_file": state["regulation_file"],
+            "drug_context": state.get("drug_context", ""),
+            "drug_slug": drug_slug,
+            "regulation_stem": regulation_stem,
+            "run_timestamp": run_timestamp,
+        })
+        for idx, section_id in enumerate(sections, 1)
+    ]
+
+
 def create_simple_research_graph(model: str = "openai:gpt-4o", temperature: float = 0.3,
                                  search_backend: str = None):
-    """Create a graph with parallel worker execution.
+    """Create a graph that fans out one worker per section with LangGraph's Send API.
+
+    The graph contains an async worker node, so it must be run with ainvoke.
 
     Args:
         model: LLM model to use
@@ -917,286 +1761,82 @@ def create_simple_research_graph(model: str = "openai:gpt-4o", temperature: floa
     # Set entry point
     graph.set_entry_point("planning")
 
-    # Process workers in parallel, then deduplicate
-    def process_workers_parallel(state: ResearchState) -> ResearchState:
-        """Process all workers in parallel using asyncio."""
-        sections = state.get("sections", {})
-        section_results = state.get("section_results", {})
-        drug_name = state["drug_name"]
-        regulation_file = state["regulation_file"]
-        drug_context = load_drug_context(drug_name)
-
-        total_sections = len(sections)
-        section_list = list(sections.items())
-
-        print(f"\n{'='*80}")
-        print(f"🔍 WORKER PHASE: Processing {total_sections} sections in PARALLEL...")
-        print(f"🔎 Search Backend: PubMed/NCBI")
-        print(f"{'='*80}\n")
-
-        async def process_section(section_id: str, section_info: dict, section_idx: int) -> tuple[str, List[Dict]]:
-            """Process a single section asynchronously with retry logic for rate limits."""
-            try:
-                section_start = datetime.datetime.now()
-
-                print(f"\n{'─'*80}")
-                print(f"📄 [{section_idx}/{total_sections}] Processing Section {section_id} (PARALLEL)")
-                print(f"   Title: {section_info['title']}")
-                print(f"   Started: {section_start.strftime('%H:%M:%S')}")
-                print(f"{'─'*80}\n")
-
-                worker = create_worker_agent(
-                    section_id,
-                    section_info["title"],
-                    section_info["description"],
-                    drug_name,
-                    drug_context,
-                    model=model,
-                    temperature=temperature,
-                    search_backend=search_backend
-                )
-
-                # Extract base drug name for the query
-                base_drug_name = extract_base_drug_name(drug_name)
+    # Worker node: processes the single section carried in its Send payload
+    async def worker_node(state: WorkerState) -> ResearchState:
+        section_id = state["section_id"]
+        try:
+            result = await worker_node_async(
+                state, section_id, state["section_idx"], state["total_sections"],
+                state.get("drug_context", ""),
+                model=model, temperature=temperature, search_backend=search_backend
+            )
+        except Exception as e:
+            print(f"⚠️  [{section_id}] Failed after all retries: {e}")
+            result = {section_id: []}
+        # Prepare this section's dedup inputs now, while slower workers are still running
+        return {
+            "section_results": result,
+            "dedup_inputs": {sid: prepare_dedup_inputs(papers) for sid, papers in result.items()}
+        }
 
-                query = f"""Search PubMed for research papers HIGHLY RELEVANT to Section {section_id}: {section_info['title']} for {drug_name} ANDA submission.
+    graph.add_node("worker", worker_node)
 
-CRITICAL REQUIREMENTS:
-1. Use PubMed search syntax with field tags: "{base_drug_name}"[Title/Abstract] AND "specific_term"[Title/Abstract]
-2. Generate 4-8 focused queries targeting {base_drug_name} + section-specific terms
-3. Be STRICT on relevance: Only include papers that are:
-   - Directly about {base_drug_name} (not just mentioned in passing)
-   - Specifically address {section_info['title']} requirements
-   - Relevant to ANDA submission/generic drug development context
-4. EXCLUDE papers about other drugs, general methodology, or clinical use not related to biopharmaceutics
-5. Quality over quantity: Return only highly relevant papers
-
-Return your final answer as a JSON array of validated papers: [{{\"title\": \"...\", \"url\": \"...\", \"description\": \"...\", \"relevance_reason\": \"...\"}}]"""
-                inputs = {"messages": [{"role": "user", "content": query}]}
-
-                # Retry logic with exponential backoff for rate limits
-                max_retries = 5
-                base_delay = 2.0  # Start with 2 seconds
-                result = None
-
-                for attempt in range(max_retries):
-                    try:
-                        if attempt > 0:
-                            print(f"🤖 [{section_id}] Retrying... (Attempt {attempt + 1}/{max_retries})\n")
-                        else:
-                            print(f"🤖 [{section_id}] Agent generating search queries and searching for papers...\n")
-                        result = await worker.ainvoke(inputs)
-                        break  # Success, exit retry loop
-
-                    except Exception as e:
-                        # Check if it's a rate limit error
-                        is_rate_limit = False
-                        wait_time = None
-
-                        # Check exception and its chain for rate limit errors
-                        current_exception = e
-                        while current_exception:
-                            # Check for OpenAI RateLimitError
-                            if RateLimitError and isinstance(current_exception, RateLimitError):
-                                is_rate_limit = True
-                                break
-                            # Check exception type name
-                            exception_type = type(current_exception).__name__
-                            if "RateLimit" in exception_type or "rate_limit" in exception_type.lower():
-                                is_rate_limit = True
-                                break
-                            # Check error message
-                            error_str = str(current_exception).lower()
-                            if "rate limit" in error_str or "429" in error_str or "rate_limit" in error_str:
-                                is_rate_limit = True
-                                # Try to extract wait time from error message
-                                wait_match = re.search(r'(\d+\.?\d*)\s*seconds?', str(current_exception), re.IGNORECASE)
-                                if wait_match:
-                                    wait_time = float(wait_match.group(1)) + 1  # Add 1 second buffer
-                                break
-                            # Check __cause__ and __context__ for nested exceptions
-                            current_exception = getattr(current_exception, '__cause__', None) or getattr(current_exception, '__context__', None)
-                            if not current_exception:
-                                break
-
-                        if is_rate_limit and attempt < max_retries - 1:
-                            # Calculate exponential backoff delay
-                            if wait_time:
-                                delay = wait_time
-                            else:
-                                delay = base_delay * (2 ** attempt)  # Exponential backoff: 2s, 4s, 8s, 16s, 32s
-
-                            print(f"⏳ [{section_id}] Rate limit hit. Waiting {delay:.1f}s before retry {attempt + 2}/{max_retries}...")
-                            await asyncio.sleep(delay)
-                            continue
-                        else:
-                            # Not a rate limit error, or max retries reached
-                            raise
-
-                # Check if we got a result
-                if result is None:
-                    raise Exception(f"Failed to get result after {max_retries} attempts")
-
-                # Debug: Print what the agent returned
-                if result and "messages" in result:
-                    print(f"🔍 [{section_id}] DEBUG: Agent returned {len(result['messages'])} messages")
-                    tool_result_count = 0
-                    for msg in result["messages"]:
-                        # Count tool messages that might contain papers
-                        if hasattr(msg, 'type') and msg.type == 'tool':
-                            tool_result_count += 1
-                            if hasattr(msg, 'content'):
-                                try:
-                                    tool_content = json.loads(str(msg.content))
-                                    if isinstance(tool_content, dict) and "papers" in tool_content:
-                                        paper_count = len(tool_content["papers"])
-                                        if paper_count > 0:
-                                            print(f"   🔍 Tool result contains {paper_count} papers")
-                                except:
-                                    pass
-
-                    # Show last 3 messages preview
-                    for idx, msg in enumerate(result["messages"][-3:], 1):
-                        if hasattr(msg, 'content') and msg.content:
-                            content_preview = str(msg.content)[:200] + "..." if len(str(msg.content)) > 200 else str(msg.content)
-                            msg_type = getattr(msg, 'type', 'unknown')
-                            print(f"   Message {idx} ({msg_type}) preview: {content_preview}")
-
-                    if tool_result_count > 0:
-                        print(f"   📊 Found {tool_result_count} tool result messages")
-
-                papers = extract_papers_from_result(result)
-
-                # Debug: Log what was extracted
-                if papers:
-                    print(f"   📄 Extracted {len(papers)} papers from agent result")
-                    if papers and isinstance(papers[0], dict):
-                        sample_title = papers[0].get('title', 'N/A')[:50]
-                        print(f"   📝 Sample paper title: {sample_title}...")
-                else:
-                    print(f"   ⚠️  No valid papers extracted from agent result")
-
-                # Additional extraction: Look for papers in tool calls/results
-                if len(papers) == 0 and result and "messages" in result:
-                    # Check if search tool was called and returned papers
-                    for message in reversed(result["messages"]):
-                        if hasattr(message, 'tool_calls') and message.tool_calls:
-                            for tool_call in message.tool_calls:
-                                if tool_call.get('name') == 'search_research_papers':
-                                    # Try to find tool result in subsequent messages
-                                    pass
-                        # Also check if content mentions papers but wasn't parsed
-                        if hasattr(message, 'content') and message.content:
-                            content = str(message.content)
-                            # Look for JSON arrays or objects more aggressively
-                            if 'paper' in content.lower() or 'research' in content.lower():
-                                # Try multiple JSON extraction patterns
-                                patterns = [
-                                    r'\[\s*\{[^}]+\}\s*(?:,\s*\{[^}]+\}\s*)*\]',  # Array of objects
-                                    r'\{\s*"papers"\s*:\s*\[.*?\]\s*\}',  # Object with papers array
-                                ]
-                                for pattern in patterns:
-                                    matches = re.findall(pattern, content, re.DOTALL)
-                                    for match in matches:
-                                        try:
-                                            parsed = json.loads(match)
-                                            if isinstance(parsed, list) and len(parsed) > 0:
-                                                papers = parsed
-                                                print(f"🔍 [{section_id}] Found {len(papers)} papers via pattern matching")
-                                                break
-                                            elif isinstance(parsed, dict) and "papers" in parsed:
-                                                papers = parsed["papers"]
-                                                print(f"🔍 [{section_id}] Found {len(papers)} papers via pattern matching")
-                                                break
-                                        except json.JSONDecodeError:
-                                            continue
-                                    if papers:
-                                        break
-                        if papers:
-                            break
+    # Connect: planning -> (Send per section) worker -> deduplication -> END
+    graph.add_conditional_edges("planning", fan_out_workers, ["worker", "deduplication"])
+    graph.add_edge("worker", "deduplication")
+    graph.add_edge("deduplication", END)
 
-                # Save individual section results
-                save_section_results(
-                    drug_name,
-                    regulation_file,
-                    section_id,
-                    section_info["title"],
-                    papers
-                )
+    return graph.compile()
 
-                section_end = datetime.datetime.now()
-                duration = (section_end - section_start).total_seconds()
 
-                print(f"\n{'─'*80}")
-                print(f"✅ Section {section_id} COMPLETE")
-                print(f"   Papers found: {len(papers)}")
-                print(f"   Duration: {duration:.1f}s")
-                if len(papers) == 0:
-                    print(f"   ⚠️  No papers found - check search queries or API responses")
-                print(f"{'─'*80}\n")
+def run_research(regulation_file: str, drug_name: str, model: str = "openai:gpt-4o") -> Dict[str, Any]:
+    """Run the multi-agent research graph for one regulation file.
 
-                return (section_id, papers)
+    Callers that process several sections in one process (run_all_sections.py)
+    use this directly, so the PubMed session, rate-limit state and LLM clients
+    are reused across sections.
 
-            except Exception as e:
-                import traceback
-                print(f"\n{'─'*80}")
-                print(f"❌ ERROR in Section {section_id}: {e}")
-                print(f"   Traceback: {traceback.format_exc()}")
-                print(f"{'─'*80}\n")
-                return (section_id, [])
-
-        # Run all sections with controlled concurrency to avoid rate limits
-        async def run_all_sections():
-            # Limit concurrent requests to avoid hitting rate limits
-            # For OpenAI GPT-4o: TPM limit is 30,000, so we limit to 2-3 concurrent requests
-            max_concurrent = 2  # Process 2 sections at a time to avoid rate limits
-            semaphore = asyncio.Semaphore(max_concurrent)
-
-            async def process_with_semaphore(section_id: str, section_info: dict, section_idx: int):
-                async with semaphore:
-                    # Add a small delay between starting concurrent requests to spread out token usage
-                    await asyncio.sleep(0.5 * (section_idx - 1) % max_concurrent)
-                    return await process_section(section_id, section_info, section_idx)
-
-            tasks = [
-                process_with_semaphore(section_id, section_info, idx + 1)
-                for idx, (section_id, section_info) in enumerate(section_list)
-            ]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Handle any exceptions that weren't caught
-            processed_results = []
-            for idx, result in enumerate(results):
-                if isinstance(result, Exception):
-                    section_id = section_list[idx][0]
-                    print(f"⚠️  [{section_id}] Failed after all retries: {result}")
-                    processed_results.append((section_id, []))
-                else:
-                    processed_results.append(result)
-
-            return processed_results
-
-        # Execute async function - asyncio.run() is safe here since LangGraph nodes are sync
-        results = asyncio.run(run_all_sections())
-
-        # Update section_results with all results
-        for section_id, papers in results:
-            section_results[section_id] = papers
+    Returns:
+        The final graph state; its "final_json" is also saved under module5Results/
+    """
+    # Create the graph
+    graph = create_simple_research_graph(model=model)
 
-        print(f"\n{'='*80}")
-        print(f"✅ WORKER PHASE COMPLETE: Processed {total_sections} sections in parallel")
-        print(f"{'='*80}\n")
+    # Initial state - no query needed, agents will generate their own
+    initial_state = {
+        "messages": [{"role": "user", "content": f"Find all relevant research papers for {drug_name} ANDA submission based on the regulation file structure."}],
+        "regulation_file": regulation_file,
+        "drug_name": drug_name,
+        "sections": {},
+        "section_results": {},
+        "dedup_inputs": {},
+        "final_json": {},
+        "current_section": "",
+        "drug_context": ""
+    }
 
-        return {"section_results": section_results}
+    # Run the graph
+    print("="*80)
+    print("🚀 STARTING MULTI-AGENT RESEARCH SYSTEM")
+    print("="*80)
+    print(f"📁 Regulation File: {regulation_file}")
+    print(f"💊 Drug: {drug_name}")
+    print(f"🤖 Model: {model}")
+    print(f"🔎 Search Backend: PubMed/NCBI")
+    print(f"📋 Task: Finding research papers for all subsections")
+    print("="*80)
+    print("\n")
 
-    graph.add_node("workers", process_workers_parallel)
+    # Async invoke so the parallel worker branches share one event loop (uvloop-backed if installed)
+    run_async = uvloop.run if uvloop is not None and hasattr(uvloop, "run") else asyncio.run
 
-    # Connect: planning -> workers -> deduplication -> END
-    graph.add_edge("planning", "workers")
-    graph.add_edge("workers", "deduplication")
-    graph.add_edge("deduplication", END)
+    async def run_graph():
+        try:
+            return await graph.ainvoke(initial_state)
+        finally:
+            await close_async_searcher()
 
-    return graph.compile()
+    return run_async(run_graph())
 
 
 def main():
@@ -1214,8 +1854,16 @@ def main():
         print("  python multi_agent_research.py Module5Regulation/5.3.1.txt Levofloxacin 'openai:gpt-4o'")
         print("\nEnvironment Variables:")
         print("  PUBMED_EMAIL: Optional email for PubMed (recommended for rate limiting)")
+        print("  NCBI_API_KEY: Optional NCBI API key (raises PubMed limit from 3 to 10 requests/second)")
+        print("  PUBMED_CACHE_DIR: Optional PubMed response cache directory (default: ~/.cache/cline-pubmed)")
+        print("  PUBMED_CACHE_TTL: Optional cache lifetime in seconds, 0 disables it (default: 3600)")
+        print("  MAR_DEBUG: Set to 1 to print full tracebacks when a section fails")
+        print("  MAX_CONCURRENT_WORKERS: Optional cap on sections researched at once (default: 8)")
+        print("  LLM_TOKENS_PER_MINUTE: Optional token budget shared by all workers (default: 30000)")
         sys.exit(1)
 
+    setup_logging()
+
     regulation_file = sys.argv[1]
     drug_name = sys.argv[2]
 
@@ -1236,33 +1884,7 @@ def main():
     print(f"Search Backend: PubMed/NCBI")
     print(f"\nTask: Finding research papers for all subsections in {Path(regulation_file).stem} for {drug_name} ANDA submission\n")
 
-    # Create the graph
-    graph = create_simple_research_graph(model=model)
-
-    # Initial state - no query needed, agents will generate their own
-    initial_state = {
-        "messages": [{"role": "user", "content": f"Find all relevant research papers for {drug_name} ANDA submission based on the regulation file structure."}],
-        "regulation_file": regulation_file,
-        "drug_name": drug_name,
-        "sections": {},
-        "section_results": {},
-        "final_json": {},
-        "current_section": ""
-    }
-
-    # Run the graph
-    print("="*80)
-    print("🚀 STARTING MULTI-AGENT RESEARCH SYSTEM")
-    print("="*80)
-    print(f"📁 Regulation File: {regulation_file}")
-    print(f"💊 Drug: {drug_name}")
-    print(f"🤖 Model: {model}")
-    print(f"🔎 Search Backend: PubMed/NCBI")
-    print(f"📋 Task: Finding research papers for all subsections")
-    print("="*80)
-    print("\n")
-
-    result = graph.invoke(initial_state)
+    result = run_research(regulation_file, drug_name, model)
 
     print("\n" + "="*80)
     print("FINAL RESULTS")
@@ -4,13 +4,274 @@ Supports PubMed/NCBI E-utilities API for searching research papers.
 """
 
 import os
+import io
+import argparse
+import atexit
+import logging
+import queue
+import json
 import time
+import hashlib
+import asyncio
+import random
 import sys
 import requests
-from typing import List, Dict, Optional
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Optional, BinaryIO, Tuple
+from functools import lru_cache
+from pathlib import Path
 from abc import ABC, abstractmethod
 import xml.etree.ElementTree as ET
 import threading
+from collections import OrderedDict
+from itertools import islice
+from logging.handlers import QueueHandler, QueueListener
+
+# Try to import lxml for faster efetch parsing
+try:
+    from lxml import etree
+except ImportError:
+    # Fall back to xml.etree.ElementTree if lxml is not available
+    etree = None
+
+# Exceptions raised for malformed efetch XML by whichever parser is in use
+XML_PARSE_ERRORS = (ET.ParseError, etree.XMLSyntaxError) if etree is not None else (ET.ParseError,)
+
+# Try to import aiohttp for the asyncio searcher
+try:
+    import aiohttp
+except ImportError:
+    # AsyncPubMedSearcher is unavailable without aiohttp; PubMedSearcher still works
+    aiohttp = None
+
+# Whether AsyncPubMedSearcher can be used in this environment
+ASYNC_SEARCH_AVAILABLE = aiohttp is not None
+
+
+logger = logging.getLogger("pubmed")
+
+# Loggers configured by setup_logging
+APP_LOGGERS = ("pubmed", "run_all_sections")
+
+# Background thread that writes queued log records (started by setup_logging)
+_log_listener = None
+
+
+def setup_logging(level: int = logging.INFO) -> None:
+    """Route this package's log records through a queue to a background thread that writes them to stderr.
+
+    Search threads and coroutines only enqueue records, so logging never blocks
+    them on the stream. Only the APP_LOGGERS are configured; the root logger (and
+    with it third-party loggers such as httpx) keeps its default level. Safe to
+    call more than once.
+    """
+    global _log_listener
+
+    if _log_listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    _log_listener = QueueListener(log_queue, handler)
+    _log_listener.start()
+    # Flush whatever is still queued when the process exits
+    atexit.register(_log_listener.stop)
+    queue_handler = QueueHandler(log_queue)
+    for name in APP_LOGGERS:
+        app_logger = logging.getLogger(name)
+        app_logger.setLevel(level)
+        app_logger.addHandler(queue_handler)
+        app_logger.propagate = False
+
+
+# NCBI recommends batching efetch requests to at most 200 IDs per call
+MAX_EFETCH_IDS = 200
+
+
+# XPath expressions for efetch parsing, compiled once when lxml is available
+if etree is not None:
+    _XP_TITLE = etree.XPath("string(.//ArticleTitle)")
+    _XP_ABSTRACT_TEXTS = etree.XPath(".//AbstractText")
+    _XP_PMID = etree.XPath("string(.//PMID)")
+    _XP_AUTHORS = etree.XPath("(.//Author)[position() <= 3]")
+    _XP_LAST_NAME = etree.XPath("string(LastName)")
+    _XP_FORE_NAME = etree.XPath("string(ForeName)")
+    _XP_JOURNAL = etree.XPath("string(.//Journal/Title)")
+    _XP_YEAR = etree.XPath("string(.//PubDate/Year)")
+
+
+def _join_abstract(abstract_texts) -> str:
+    """Join AbstractText elements, prefixing structured sections with their Label."""
+    abstract_parts = []
+    append_part = abstract_parts.append
+    for abstract_text in abstract_texts:
+        text = abstract_text.text
+        if text:
+            # Handle structured abstracts (Label attribute)
+            label = abstract_text.get("Label")
+            append_part(f"{label}: {text}" if label else text)
+    # Most articles have a single unlabeled part or none at all
+    if not abstract_parts:
+        return ""
+    return abstract_parts[0] if len(abstract_parts) == 1 else " ".join(abstract_parts)
+
+
+def _extract_article_lxml(article) -> Dict:
+    """Extract paper fields from an lxml PubmedArticle element via the precompiled XPath expressions."""
+    pmid = _XP_PMID(article)
+
+    authors = []
+    for author in _XP_AUTHORS(article):
+        last_name = _XP_LAST_NAME(author)
+        first_name = _XP_FORE_NAME(author)
+        if last_name and first_name:
+            authors.append(f"{first_name} {last_name}")
+        elif last_name:
+            authors.append(last_name)
+
+    return {
+        "title": _XP_TITLE(article) or "Untitled",
+        "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}" if pmid else "",
+        "pmid": pmid,
+        "abstract": _join_abstract(_XP_ABSTRACT_TEXTS(article)),
+        "authors": authors,
+        "journal": _XP_JOURNAL(article),
+        "year": _XP_YEAR(article)
+    }
+
+
+def _extract_article(article) -> Dict:
+    """Extract paper fields from an xml.etree PubmedArticle element.
+
+    findtext() looks up each field in one call and returns a default when the
+    element is missing, mirroring the string() XPath lookups of the lxml path.
+    """
+    pmid = article.findtext(".//PMID", "")
+
+    # Extract authors (first few); stop after three instead of listing every Author
+    authors = []
+    for author in islice(article.iterfind(".//Author"), 3):
+        last_name = author.findtext("LastName")
+        first_name = author.findtext("ForeName")
+        if last_name and first_name:
+            authors.append(f"{first_name} {last_name}")
+        elif last_name:
+            authors.append(last_name)
+
+    return {
+        "title": article.findtext(".//ArticleTitle") or "Untitled",
+        "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}" if pmid else "",
+        "pmid": pmid,
+        "abstract": _join_abstract(article.iterfind(".//AbstractText")),
+        "authors": authors,
+        "journal": article.findtext(".//Journal/Title", ""),
+        "year": article.findtext(".//PubDate/Year", "")
+    }
+
+
+def parse_efetch_stream(source: BinaryIO) -> List[Dict]:
+    """Stream-parse a PubMed efetch XML response into paper dictionaries.
+
+    Each PubmedArticle is extracted as soon as it is complete and then cleared,
+    so only one article subtree is held in memory at a time. Uses lxml when
+    installed, otherwise xml.etree.ElementTree. (A pure-Python expat/SAX handler
+    that builds the dicts without Elements measured slower than both.)
+
+    Args:
+        source: Binary file-like object with the XML (e.g. a streamed response.raw)
+
+    Returns:
+        List of paper dictionaries with keys: title, url, pmid, abstract, authors, journal, year
+    """
+    papers = []
+    append_paper = papers.append
+    if etree is not None:
+        for _, elem in etree.iterparse(source, events=("end",), tag="PubmedArticle"):
+            append_paper(_extract_article_lxml(elem))
+            # Free this article and the already-processed siblings before it
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+    else:
+        for _, elem in ET.iterparse(source, events=("end",)):
+            if elem.tag == "PubmedArticle":
+                append_paper(_extract_article(elem))
+                elem.clear()
+    return papers
+
+
+def parse_efetch_xml(content: bytes) -> List[Dict]:
+    """Parse an in-memory PubMed efetch XML response into paper dictionaries."""
+    return parse_efetch_stream(io.BytesIO(content))
+
+
+# On-disk cache for esearch results and parsed efetch records (PUBMED_CACHE_TTL=0 disables it)
+PUBMED_CACHE_DIR = Path(os.getenv("PUBMED_CACHE_DIR", Path.home() / ".cache" / "cline-pubmed"))
+PUBMED_CACHE_TTL = float(os.getenv("PUBMED_CACHE_TTL", "3600"))
+
+
+class PubMedCache:
+    """Disk cache so reruns for the same drug skip repeated esearch/efetch requests.
+
+    esearch results are keyed by a blake2b hash of (query, retmax) and expire after
+    ttl seconds. efetch records are stored per PMID, so a fetch only requests the
+    PMIDs that are not cached yet. Unreadable entries are treated as misses.
+    """
+
+    def __init__(self, cache_dir: Path = PUBMED_CACHE_DIR, ttl: float = PUBMED_CACHE_TTL):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.enabled = ttl > 0
+
+    def _read(self, path: Path):
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                return None
+            return json.loads(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, path: Path, value) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so concurrent writers (processes and threads) never read a partial entry
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"[PubMed] Could not write cache entry {path}: {e}")
+
+    def _search_path(self, query: str, retmax: int) -> Path:
+        digest = hashlib.blake2b(f"{query}\0{retmax}".encode("utf-8"), digest_size=16).hexdigest()
+        return self.cache_dir / "esearch" / f"{digest}.json"
+
+    def get_search(self, query: str, retmax: int) -> Optional[List[str]]:
+        """Cached PMIDs for an esearch, or None on a miss."""
+        if not self.enabled:
+            return None
+        return self._read(self._search_path(query, retmax))
+
+    def set_search(self, query: str, retmax: int, pmids: List[str]) -> None:
+        if self.enabled:
+            self._write(self._search_path(query, retmax), pmids)
+
+    def get_papers(self, pmids: List[str]) -> Dict[str, Dict]:
+        """Cached paper records for the given PMIDs (misses are omitted)."""
+        if not self.enabled:
+            return {}
+        papers = {}
+        for pmid in pmids:
+            paper = self._read(self.cache_dir / "efetch" / f"{pmid}.json")
+            if paper is not None:
+                papers[pmid] = paper
+        return papers
+
+    def set_papers(self, papers: List[Dict]) -> None:
+        if self.enabled:
+            for paper in papers:
+                if paper.get("pmid"):
+                    self._write(self.cache_dir / "efetch" / f"{paper['pmid']}.json", paper)
 
 
 class BaseSearcher(ABC):
@@ -37,29 +298,96 @@ class PubMedSearcher(BaseSearcher):
     # Class-level shared rate limiting (thread-safe)
     _rate_limit_lock = threading.Lock()
     _last_request_time = 0
-    _min_request_interval = 0.35  # ~3 requests per second (conservative)
+    # NCBI allows 3 requests/second without an API key and 10/second with one
+    _min_request_interval = 0.1 if os.getenv("NCBI_API_KEY") else 0.35
     _max_concurrent_requests = 2  # Limit concurrent requests to avoid overwhelming API
     _request_semaphore = threading.Semaphore(_max_concurrent_requests)
+    # Report the efetch transfer encoding once per process to confirm gzip is in effect
+    _encoding_logged = False
+    # Most search_papers results kept in memory
+    _max_memoized_searches = 512
 
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, cache: Optional[PubMedCache] = None):
         # PubMed API doesn't require a key, but email is recommended for rate limiting
         self.email = os.getenv("PUBMED_EMAIL", "research@example.com")
+        # Optional NCBI API key raises the rate limit from 3 to 10 requests/second
+        self.api_key = api_key or os.getenv("NCBI_API_KEY")
         self.base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
 
+        # Persistent keep-alive session: esearch + efetch (and every later query)
+        # reuse pooled connections instead of a new TCP/TLS handshake per request
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "User-Agent": f"cline-research/1.0 ({self.email})",
+            # PubMed XML compresses ~6-10x; urllib3 decompresses transparently
+            "Accept-Encoding": "gzip, deflate"
+        })
+        self.cache = cache if cache is not None else PubMedCache()
+        # In-memory memo in front of the disk cache, (query, match_limit) -> (monotonic time, papers);
+        # failed searches raise and are not memoized
+        self._search_memo = OrderedDict()
+        self._search_memo_lock = threading.Lock()
+
+    def clear_cache(self):
+        """Forget memoized search_papers results (the disk cache is kept)."""
+        with self._search_memo_lock:
+            self._search_memo.clear()
+
+    def _search_papers_cached(self, query: str, match_limit: int) -> Tuple[Dict, ...]:
+        """_search_papers_uncached, memoized for the disk cache's ttl (not at all when it is disabled)."""
+        if not self.cache.enabled:
+            return self._search_papers_uncached(query, match_limit)
+
+        key = (query, match_limit)
+        with self._search_memo_lock:
+            entry = self._search_memo.get(key)
+            if entry is not None and time.monotonic() - entry[0] <= self.cache.ttl:
+                self._search_memo.move_to_end(key)
+                return entry[1]
+
+        papers = self._search_papers_uncached(query, match_limit)
+        with self._search_memo_lock:
+            self._search_memo[key] = (time.monotonic(), papers)
+            self._search_memo.move_to_end(key)
+            if len(self._search_memo) > self._max_memoized_searches:
+                self._search_memo.popitem(last=False)
+        return papers
+
+    def close(self):
+        """Close the pooled HTTP connections."""
+        self.session.close()
+
+    def __del__(self):
+        session = getattr(self, "session", None)
+        if session is not None:
+            session.close()
+
     @classmethod
     def _rate_limit(cls):
-        """Enforce rate limiting for PubMed API (thread-safe, shared across all instances)."""
+        """Enforce rate limiting for PubMed API (thread-safe, shared across all instances).
+
+        Each caller reserves the next free request slot under the lock and then
+        sleeps until it outside the lock, so waiting threads don't serialize on it.
+        Uses the monotonic clock, which is unaffected by system clock adjustments.
+        """
         with cls._rate_limit_lock:
-            current_time = time.time()
-            time_since_last = current_time - cls._last_request_time
-            if time_since_last < cls._min_request_interval:
-                sleep_time = cls._min_request_interval - time_since_last
-                time.sleep(sleep_time)
-            cls._last_request_time = time.time()
+            now = time.monotonic()
+            wait = max(0.0, cls._last_request_time + cls._min_request_interval - now)
+            cls._last_request_time = now + wait
+        if wait:
+            time.sleep(wait)
 
     def _make_request_with_retry(self, url: str, params: dict, max_retries: int = 3,
-                                 initial_delay: float = 1.0) -> requests.Response:
-        """Make a request with retry logic for rate limiting errors."""
+                                 initial_delay: float = 1.0, stream: bool = False) -> requests.Response:
+        """Make a request with retry logic for rate limiting errors.
+
+        With stream=True the body is left unread so the caller can parse response.raw
+        incrementally; the caller is responsible for closing the response.
+        """
+        if self.api_key:
+            params = {**params, "api_key": self.api_key}
         for attempt in range(max_retries):
             try:
                 # Acquire semaphore to limit concurrent requests (class-level, shared across instances)
@@ -67,14 +395,15 @@ class PubMedSearcher(BaseSearcher):
                     # Apply rate limiting
                     self._rate_limit()
 
-                    response = requests.get(url, params=params, timeout=30)
+                    response = self.session.get(url, params=params, timeout=30, stream=stream)
 
                     # If we get a 429, wait and retry
                     if response.status_code == 429:
                         if attempt < max_retries - 1:
-                            # Exponential backoff: 1s, 2s, 4s
-                            delay = initial_delay * (2 ** attempt)
-                            print(f"[PubMed] Rate limited (429), waiting {delay:.1f}s before retry {attempt + 1}/{max_retries}...")
+                            response.close()
+                            # Exponential backoff with jitter: 1s, 2s, 4s (+ up to 1s)
+                            delay = initial_delay * (2 ** attempt) + random.uniform(0, initial_delay)
+                            logger.warning(f"[PubMed] Rate limited (429), waiting {delay:.1f}s before retry {attempt + 1}/{max_retries}...")
                             time.sleep(delay)
                             continue
                         else:
@@ -85,16 +414,15 @@ class PubMedSearcher(BaseSearcher):
 
             except requests.exceptions.RequestException as e:
                 if attempt < max_retries - 1:
-                    delay = initial_delay * (2 ** attempt)
-                    print(f"[PubMed] Request error, retrying in {delay:.1f}s... ({attempt + 1}/{max_retries})")
+                    delay = initial_delay * (2 ** attempt) + random.uniform(0, initial_delay)
+                    logger.warning(f"[PubMed] Request error, retrying in {delay:.1f}s... ({attempt + 1}/{max_retries})")
                     time.sleep(delay)
                 else:
                     raise
         raise requests.exceptions.RequestException("Max retries exceeded")
 
-    def search_papers(self, query: str, match_limit: int = 10, **kwargs) -> List[Dict]:
-        """Search for research papers using PubMed API."""
-        # Step 1: Search PubMed and get PMIDs
+    def search_pmids(self, query: str, match_limit: int = 10) -> List[str]:
+        """Run a PubMed esearch and return the matching PMIDs (most relevant first)."""
         search_url = f"{self.base_url}/esearch.fcgi"
         search_params = {
             "db": "pubmed",
@@ -105,95 +433,296 @@ class PubMedSearcher(BaseSearcher):
             "sort": "relevance"  # Sort by relevance
         }
 
+        cached = self.cache.get_search(query, search_params["retmax"])
+        if cached is not None:
+            logger.info(f"[PubMed] Searching for: {query} (cached)")
+            return cached
+
+        logger.info(f"[PubMed] Searching for: {query}")
+        response = self._make_request_with_retry(search_url, search_params)
+        search_data = response.json()
+        pmids = search_data.get("esearchresult", {}).get("idlist", [])
+        self.cache.set_search(query, search_params["retmax"], pmids)
+        return pmids
+
+    def fetch_papers(self, pmids: List[str]) -> List[Dict]:
+        """Fetch and parse paper details for up to MAX_EFETCH_IDS PMIDs in one efetch call.
+
+        PMIDs already in the disk cache are not requested again.
+        """
+        pmids = pmids[:MAX_EFETCH_IDS]
+        if not pmids:
+            return []
+
+        papers_by_pmid = self.cache.get_papers(pmids)
+        missing = [pmid for pmid in pmids if pmid not in papers_by_pmid]
+        if missing:
+            fetched = self._efetch(missing)
+            self.cache.set_papers(fetched)
+            papers_by_pmid.update((paper["pmid"], paper) for paper in fetched)
+
+        return [papers_by_pmid[pmid] for pmid in pmids if pmid in papers_by_pmid]
+
+    def _efetch(self, pmids: List[str]) -> List[Dict]:
+        """Issue one efetch request and stream-parse the response."""
+        fetch_url = f"{self.base_url}/efetch.fcgi"
+        fetch_params = {
+            "db": "pubmed",
+            "id": ",".join(pmids),
+            "retmode": "xml",
+            "email": self.email
+        }
+
+        response = self._make_request_with_retry(fetch_url, fetch_params, stream=True)
+        with response:
+            if not PubMedSearcher._encoding_logged:
+                PubMedSearcher._encoding_logged = True
+                logger.info(f"[PubMed] efetch Content-Encoding: {response.headers.get('Content-Encoding', 'identity')}, "
+                            f"Content-Length: {response.headers.get('Content-Length', 'unknown')}")
+            # Parse the bytes while downloading (never response.text); urllib3 undoes the gzip layer
+            response.raw.decode_content = True
+            return parse_efetch_stream(response.raw)
+
+    def _search_papers_uncached(self, query: str, match_limit: int) -> Tuple[Dict, ...]:
+        """Run esearch + efetch for a query; memoized per instance by _search_papers_cached."""
+        # Step 1: Search PubMed and get PMIDs
+        pmids = self.search_pmids(query, match_limit=match_limit)
+
+        if not pmids:
+            logger.info("[PubMed] No papers found")
+            return ()
+
+        logger.info(f"[PubMed] Found {len(pmids)} papers, fetching details...")
+
+        # Step 2: Fetch detailed information for each paper
+        papers = self.fetch_papers(pmids)
+
+        logger.info(f"[PubMed] Successfully retrieved {len(papers)} papers")
+        return tuple(papers)
+
+    def search_papers(self, query: str, match_limit: int = 10, **kwargs) -> List[Dict]:
+        """Search for research papers using PubMed API.
+
+        Repeated queries (compared with whitespace collapsed) are answered from memory
+        until they are older than the cache ttl (PUBMED_CACHE_TTL).
+        """
         try:
-            print(f"[PubMed] Searching for: {query}")
-            response = self._make_request_with_retry(search_url, search_params)
-            search_data = response.json()
-            pmids = search_data.get("esearchresult", {}).get("idlist", [])
+            papers = self._search_papers_cached(" ".join(query.split()), match_limit)
+            # Copy so callers can modify the results without changing the memo
+            return [{**paper, "authors": list(paper.get("authors", []))} for paper in papers]
 
-            if not pmids:
-                print("[PubMed] No papers found")
-                return []
+        except requests.exceptions.RequestException as e:
+            logger.error(f"[PubMed] Error connecting to API: {e}")
+            return []
+        except XML_PARSE_ERRORS as e:
+            logger.error(f"[PubMed] Error parsing XML response: {e}")
+            return []
+        except Exception as e:
+            logger.exception(f"[PubMed] Error searching: {e}")
+            return []
+
+    def search_many(self, queries: List[str], match_limit: int = 10) -> List[Dict]:
+        """Run several queries, then fetch the union of their PMIDs with a single efetch.
+
+        Cuts the round trips for N queries from 2N to N + 1.
+        """
+        pmids = []
+        for query in queries:
+            try:
+                pmids.extend(self.search_pmids(query, match_limit=match_limit))
+            except requests.exceptions.RequestException as e:
+                logger.error(f"[PubMed] Error connecting to API: {e}")
+
+        # Deduplicate while keeping relevance order
+        pmids = list(dict.fromkeys(pmids))
+        if not pmids:
+            logger.info("[PubMed] No papers found")
+            return []
+
+        try:
+            logger.info(f"[PubMed] Found {len(pmids)} unique papers across {len(queries)} queries, fetching details...")
+            papers = self.fetch_papers(pmids)
+            logger.info(f"[PubMed] Successfully retrieved {len(papers)} papers")
+            return papers
+        except requests.exceptions.RequestException as e:
+            logger.error(f"[PubMed] Error connecting to API: {e}")
+            return []
+        except XML_PARSE_ERRORS as e:
+            logger.error(f"[PubMed] Error parsing XML response: {e}")
+            return []
+
+
+class AsyncPubMedSearcher:
+    """asyncio/aiohttp variant of PubMedSearcher for many concurrent searches in one event loop.
+
+    Requests share one keep-alive aiohttp session; concurrency is capped by an
+    asyncio.Semaphore and spacing by an async token bucket at the same NCBI rate as
+    PubMedSearcher. Disk cache reads and writes run in worker threads so they never
+    block the loop. Create it inside a running event loop and call aclose() when done.
+    """
+
+    _max_concurrent_requests = 3  # NCBI's documented limit without an API key
+
+    def __init__(self, api_key: str = None, cache: Optional[PubMedCache] = None):
+        if aiohttp is None:
+            raise ImportError("AsyncPubMedSearcher requires aiohttp (pip install aiohttp)")
+        self.email = os.getenv("PUBMED_EMAIL", "research@example.com")
+        self.api_key = api_key or os.getenv("NCBI_API_KEY")
+        self.base_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=4, limit_per_host=3, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=30),
+            headers={"User-Agent": f"cline-research/1.0 ({self.email})", "Accept-Encoding": "gzip, deflate"}
+        )
+        self._request_semaphore = asyncio.Semaphore(self._max_concurrent_requests)
+        self._rate_limit_lock = asyncio.Lock()
+        self._last_request_time = 0.0
+        self.cache = cache if cache is not None else PubMedCache()
+
+    async def aclose(self):
+        """Close the aiohttp session."""
+        await self.session.close()
+
+    async def _rate_limit(self):
+        """Token bucket: space requests at least _min_request_interval apart (loop clock).
+
+        The slot is reserved under the lock and awaited outside it.
+        """
+        loop = asyncio.get_running_loop()
+        async with self._rate_limit_lock:
+            now = loop.time()
+            wait = max(0.0, self._last_request_time + PubMedSearcher._min_request_interval - now)
+            self._last_request_time = now + wait
+        if wait:
+            await asyncio.sleep(wait)
+
+    async def _make_request_with_retry(self, url: str, params: dict, max_retries: int = 3,
+                                       initial_delay: float = 1.0) -> bytes:
+        """Make a request with retry logic for rate limiting errors; returns the raw body."""
+        if self.api_key:
+            params = {**params, "api_key": self.api_key}
+        for attempt in range(max_retries):
+            rate_limited = False
+            try:
+                async with self._request_semaphore:
+                    await self._rate_limit()
+                    async with self.session.get(url, params=params) as response:
+                        if response.status == 429 and attempt < max_retries - 1:
+                            rate_limited = True
+                        else:
+                            response.raise_for_status()
+                            return await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt < max_retries - 1:
+                    delay = initial_delay * (2 ** attempt) + random.uniform(0, initial_delay)
+                    logger.warning(f"[PubMed] Request error, retrying in {delay:.1f}s... ({attempt + 1}/{max_retries})")
+                    await asyncio.sleep(delay)
+                    continue
+                raise
+
+            if rate_limited:
+                # Back off outside the semaphore so other requests can proceed
+                delay = initial_delay * (2 ** attempt) + random.uniform(0, initial_delay)
+                logger.warning(f"[PubMed] Rate limited (429), waiting {delay:.1f}s before retry {attempt + 1}/{max_retries}...")
+                await asyncio.sleep(delay)
+        raise aiohttp.ClientError("Max retries exceeded")
+
+    async def search_pmids(self, query: str, match_limit: int = 10) -> List[str]:
+        """Run a PubMed esearch and return the matching PMIDs (most relevant first)."""
+        search_params = {
+            "db": "pubmed",
+            "term": query,
+            "retmax": min(match_limit, 100),  # PubMed allows up to 100
+            "retmode": "json",
+            "email": self.email,
+            "sort": "relevance"  # Sort by relevance
+        }
+
+        cached = await asyncio.to_thread(self.cache.get_search, query, search_params["retmax"])
+        if cached is not None:
+            logger.info(f"[PubMed] Searching for: {query} (cached)")
+            return cached
+
+        logger.info(f"[PubMed] Searching for: {query}")
+        content = await self._make_request_with_retry(f"{self.base_url}/esearch.fcgi", search_params)
+        pmids = json.loads(content).get("esearchresult", {}).get("idlist", [])
+        await asyncio.to_thread(self.cache.set_search, query, search_params["retmax"], pmids)
+        return pmids
+
+    async def fetch_papers(self, pmids: List[str]) -> List[Dict]:
+        """Fetch and parse paper details for up to MAX_EFETCH_IDS PMIDs in one efetch call.
 
-            print(f"[PubMed] Found {len(pmids)} papers, fetching details...")
+        PMIDs already in the disk cache are not requested again.
+        """
+        pmids = pmids[:MAX_EFETCH_IDS]
+        if not pmids:
+            return []
 
-            # Step 2: Fetch detailed information for each paper
-            fetch_url = f"{self.base_url}/efetch.fcgi"
+        papers_by_pmid = await asyncio.to_thread(self.cache.get_papers, pmids)
+        missing = [pmid for pmid in pmids if pmid not in papers_by_pmid]
+        if missing:
             fetch_params = {
                 "db": "pubmed",
-                "id": ",".join(pmids),
+                "id": ",".join(missing),
                 "retmode": "xml",
                 "email": self.email
             }
+            content = await self._make_request_with_retry(f"{self.base_url}/efetch.fcgi", fetch_params)
+            fetched = parse_efetch_xml(content)
+            await asyncio.to_thread(self.cache.set_papers, fetched)
+            papers_by_pmid.update((paper["pmid"], paper) for paper in fetched)
 
-            response = self._make_request_with_retry(fetch_url, fetch_params)
-
-            # Parse XML response
-            root = ET.fromstring(response.content)
-
-            papers = []
-            for article in root.findall(".//PubmedArticle"):
-                # Extract title
-                title_elem = article.find(".//ArticleTitle")
-                title = title_elem.text if title_elem is not None else "Untitled"
-
-                # Extract abstract
-                abstract_parts = []
-                for abstract_text in article.findall(".//AbstractText"):
-                    if abstract_text.text:
-                        # Handle structured abstracts (Label attribute)
-                        label = abstract_text.get("Label", "")
-                        if label:
-                            abstract_parts.append(f"{label}: {abstract_text.text}")
-                        else:
-                            abstract_parts.append(abstract_text.text)
-                abstract = " ".join(abstract_parts)
-
-                # Extract PMID for URL
-                pmid_elem = article.find(".//PMID")
-                pmid = pmid_elem.text if pmid_elem is not None else ""
-                url = f"https://pubmed.ncbi.nlm.nih.gov/{pmid}" if pmid else ""
-
-                # Extract authors (first few)
-                authors = []
-                for author in article.findall(".//Author")[:3]:
-                    last_name = author.find("LastName")
-                    first_name = author.find("ForeName")
-                    if last_name is not None and first_name is not None:
-                        authors.append(f"{first_name.text} {last_name.text}")
-                    elif last_name is not None:
-                        authors.append(last_name.text)
-
-                # Extract journal and year
-                journal_elem = article.find(".//Journal/Title")
-                journal = journal_elem.text if journal_elem is not None else ""
-
-                year_elem = article.find(".//PubDate/Year")
-                year = year_elem.text if year_elem is not None else ""
-
-                papers.append({
-                    "title": title,
-                    "url": url,
-                    "pmid": pmid,
-                    "abstract": abstract,
-                    "authors": authors,
-                    "journal": journal,
-                    "year": year
-                })
-
-            print(f"[PubMed] Successfully retrieved {len(papers)} papers")
+        return [papers_by_pmid[pmid] for pmid in pmids if pmid in papers_by_pmid]
+
+    async def search_papers(self, query: str, match_limit: int = 10, **kwargs) -> List[Dict]:
+        """Search for research papers using PubMed API."""
+        try:
+            pmids = await self.search_pmids(query, match_limit=match_limit)
+            if not pmids:
+                logger.info("[PubMed] No papers found")
+                return []
+
+            logger.info(f"[PubMed] Found {len(pmids)} papers, fetching details...")
+            papers = await self.fetch_papers(pmids)
+            logger.info(f"[PubMed] Successfully retrieved {len(papers)} papers")
             return papers
 
-        except requests.exceptions.RequestException as e:
-            print(f"[PubMed] Error connecting to API: {e}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"[PubMed] Error connecting to API: {e}")
             return []
-        except ET.ParseError as e:
-            print(f"[PubMed] Error parsing XML response: {e}")
+        except XML_PARSE_ERRORS as e:
+            logger.error(f"[PubMed] Error parsing XML response: {e}")
             return []
-        except Exception as e:
-            print(f"[PubMed] Error searching: {e}")
-            import traceback
-            traceback.print_exc()
+
+    async def search_many(self, queries: List[str], match_limit: int = 10) -> List[Dict]:
+        """Run all queries concurrently, then fetch the union of their PMIDs with one efetch."""
+        results = await asyncio.gather(
+            *(self.search_pmids(query, match_limit=match_limit) for query in queries),
+            return_exceptions=True
+        )
+        pmids = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"[PubMed] Error connecting to API: {result}")
+            else:
+                pmids.extend(result)
+
+        # Deduplicate while keeping relevance order
+        pmids = list(dict.fromkeys(pmids))
+        if not pmids:
+            logger.info("[PubMed] No papers found")
+            return []
+
+        try:
+            logger.info(f"[PubMed] Found {len(pmids)} unique papers across {len(queries)} queries, fetching details...")
+            papers = await self.fetch_papers(pmids)
+            logger.info(f"[PubMed] Successfully retrieved {len(papers)} papers")
+            return papers
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"[PubMed] Error connecting to API: {e}")
+            return []
+        except XML_PARSE_ERRORS as e:
+            logger.error(f"[PubMed] Error parsing XML response: {e}")
             return []
 
 
@@ -209,6 +738,9 @@ def get_default_backend() -> str:
 def create_searcher(backend: Optional[str] = None, **kwargs) -> BaseSearcher:
     """Factory function to create a PubMed search backend instance.
 
+    Every caller with the same constructor arguments gets one shared searcher and
+    with it the pooled HTTP session and the search memo.
+
     Args:
         backend: Backend type (ignored, always uses PubMed)
         **kwargs: Additional arguments passed to the searcher constructor
@@ -216,6 +748,11 @@ def create_searcher(backend: Optional[str] = None, **kwargs) -> BaseSearcher:
     Returns:
         PubMedSearcher instance
     """
+    return _shared_pubmed_searcher(**kwargs)
+
+
+@lru_cache(maxsize=1)
+def _shared_pubmed_searcher(**kwargs) -> PubMedSearcher:
     return PubMedSearcher(**kwargs)
 
 
@@ -237,23 +774,40 @@ class ResearchPaperSearcher:
         """Search for papers using PubMed."""
         return self._searcher.search_papers(query, match_limit=match_limit, **kwargs)
 
+    def search_pmids(self, query: str, match_limit: int = 10) -> List[str]:
+        """Run a PubMed esearch and return matching PMIDs."""
+        return self._searcher.search_pmids(query, match_limit=match_limit)
 
-def main():
-    """Test function for command-line usage."""
-    if len(sys.argv) < 2:
-        print("Usage: python research_paper_search.py '<query>' [limit]")
-        print("\nUses PubMed/NCBI API (free, no key required)")
-        print("\nExamples:")
-        print("  python research_paper_search.py 'Levofloxacin bioavailability'")
-        print("  python research_paper_search.py 'Levofloxacin bioavailability' 10")
-        sys.exit(1)
+    def fetch_papers(self, pmids: List[str]) -> List[Dict]:
+        """Fetch paper details for a batch of PMIDs."""
+        return self._searcher.fetch_papers(pmids)
+
+    def search_many(self, queries: List[str], match_limit: int = 10) -> List[Dict]:
+        """Search several queries with a single batched detail fetch."""
+        return self._searcher.search_many(queries, match_limit=match_limit)
 
-    query = sys.argv[1]
-    limit = 10
+    def clear_cache(self):
+        """Forget memoized search results."""
+        self._searcher.clear_cache()
 
-    # Parse arguments
-    if len(sys.argv) > 2 and sys.argv[2].isdigit():
-        limit = int(sys.argv[2])
+
+def main():
+    """Test function for command-line usage."""
+    parser = argparse.ArgumentParser(
+        description="Search PubMed/NCBI (free, no key required) for research papers.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="Examples:\n"
+               "  python research_paper_search.py 'Levofloxacin bioavailability'\n"
+               "  python research_paper_search.py 'Levofloxacin bioavailability' 10"
+    )
+    parser.add_argument("query", help="Search query")
+    parser.add_argument("limit", type=int, nargs="?", default=10, help="Maximum number of papers (default: 10)")
+    args = parser.parse_args()
+
+    setup_logging()
+
+    query = args.query
+    limit = args.limit
 
     try:
         searcher = create_searcher()
@@ -2,41 +2,74 @@
 """Script to sequentially process all Module 5.3 sections and combine results.
 
 Usage:
-    python run_all_sections.py <drug_name> [model]
+    python run_all_sections.py <drug_name> [model] [--isolated]
 
 Examples:
     python run_all_sections.py "Levofloxacin USP 250mg"
     python run_all_sections.py "Levofloxacin USP 250mg" "openai:gpt-4o"
+    python run_all_sections.py "Levofloxacin USP 250mg" --isolated
 """
 
 import os
 import sys
+import argparse
 import json
 import subprocess
 import re
+import logging
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
+from multi_agent_research import run_research
+from research_paper_search import setup_logging
 
+# Try to import orjson for faster JSON reads/writes
+try:
+    import orjson
+except ImportError:
+    # Fall back to the stdlib json module if orjson is not available
+    orjson = None
+
+logger = logging.getLogger("run_all_sections")
+
+
+# Precompiled patterns for filename sanitization (same rules as multi_agent_research.py)
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r'[^\w\-_\.]')
+_REPEATED_UNDERSCORES_RE = re.compile(r'_+')
+
+# Bumped when the combined summary changes, so older manifests are not reused
+COMBINE_MANIFEST_VERSION = 2
+
+
+@lru_cache(maxsize=256)
 def sanitize_filename(name: str) -> str:
     """Sanitize a string for use in filenames.
 
-    Replaces spaces and special characters with underscores.
+    Replaces spaces and special characters with underscores. Cached, since the
+    same drug name is sanitized for every section.
     """
     # Replace spaces and special characters with underscores
-    sanitized = re.sub(r'[^\w\-_\.]', '_', name)
+    sanitized = _UNSAFE_FILENAME_CHARS_RE.sub('_', name)
     # Replace multiple underscores with single underscore
-    sanitized = re.sub(r'_+', '_', sanitized)
+    sanitized = _REPEATED_UNDERSCORES_RE.sub('_', sanitized)
     return sanitized.strip('_')
 
 
-def run_section(regulation_file: str, drug_name: str, model: str = "openai:gpt-4o") -> bool:
-    """Run multi_agent_research.py for a single section.
+def run_section(regulation_file: str, drug_name: str, model: str = "openai:gpt-4o",
+                isolated: bool = False) -> bool:
+    """Run the multi-agent research for a single section.
+
+    Runs in this process by default, so the PubMed session, rate-limit state and
+    LLM clients are shared by all sections. With isolated=True each section runs
+    multi_agent_research.py in its own subprocess instead.
 
     Args:
         regulation_file: Path to regulation file
         drug_name: Name of the drug
         model: LLM model to use
+        isolated: Run the section in a separate Python process
 
     Returns:
         True if successful, False otherwise
@@ -45,6 +78,17 @@ def run_section(regulation_file: str, drug_name: str, model: str = "openai:gpt-4
     print(f"Processing: {regulation_file}")
     print(f"{'='*80}\n")
 
+    if not isolated:
+        try:
+            result = run_research(regulation_file, drug_name, model)
+            return bool(result.get("final_json"))
+        except KeyboardInterrupt:
+            print(f"\n⚠️  Interrupted while processing {regulation_file}")
+            return False
+        except Exception as e:
+            print(f"\n❌ Error processing {regulation_file}: {e}")
+            return False
+
     cmd = [
         sys.executable,
         "multi_agent_research.py",
@@ -64,109 +108,204 @@ def run_section(regulation_file: str, drug_name: str, model: str = "openai:gpt-4
         return False
 
 
-def combine_results(drug_name: str, sections: list) -> dict:
-    """Combine all section results into a single JSON structure.
+def load_json_file(file_path: Path):
+    """Read and decode a JSON file, using orjson when available."""
+    data = file_path.read_bytes()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def dumps_nested_json(obj, level: int) -> bytes:
+    """Encode obj as indent-2 JSON bytes for a value nested `level` levels deep in a document."""
+    if orjson is not None:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    # Encoded JSON never contains raw newlines inside strings, so this only re-indents lines
+    return data.replace(b"\n", b"\n" + b"  " * level)
+
+
+def section_file_stats(section_files: list) -> dict:
+    """(mtime_ns, size) of each section file, or None for missing files, keyed by path."""
+    stats = {}
+    for section_file in section_files:
+        try:
+            stat = section_file.stat()
+            stats[str(section_file)] = [stat.st_mtime_ns, stat.st_size]
+        except FileNotFoundError:
+            stats[str(section_file)] = None
+    return stats
+
+
+def combine_results(drug_name: str, sections: list, combined_file: Path) -> dict:
+    """Combine all section results into a single JSON file.
+
+    Sections are written to combined_file as each section file is read, so the
+    papers of all sections are never held in one dict at once. A manifest of the
+    section files' mtime and size is saved next to it; when none of them changed
+    since the last combine, the existing combined file is kept as is.
 
     Args:
         drug_name: Name of the drug
         sections: List of section IDs (e.g., ['5.3.1', '5.3.2', ...])
+        combined_file: Path of the combined JSON file to write
 
     Returns:
-        Combined JSON structure
+        Combined JSON structure without the per-section papers (drug_name, regulation_section, summary, combined_at)
     """
     results_dir = Path("module5Results")
     combined = {
         "drug_name": drug_name,
         "regulation_section": "5.3",
-        "sections": {},
         "summary": {
             "total_unique_papers": 0,
             "total_mentions": 0,
             "papers_by_section": {},
             "deduplication_stats": {
                 "duplicates_found": 0,
-                "papers_removed": 0
+                "papers_removed": 0,
+                # Papers kept in more than one section (by PMID); not removed from the output
+                "cross_section_repeats": 0
             },
             "sections_processed": []
         },
         "combined_at": datetime.now().isoformat()
     }
 
+    total_papers = 0
     total_unique = 0
     total_mentions = 0
     all_papers_by_section = {}
-
-    for section_id in sections:
-        section_file = results_dir / f"{sanitize_filename(drug_name)}_{section_id}_papers.json"
-
-        if not section_file.exists():
-            print(f"⚠️  Warning: {section_file} not found, skipping...")
-            continue
-
+    # PMIDs already counted, so a paper cited by several sections is one unique paper
+    seen_pmids = set()
+
+    def count_unique_papers(papers: list) -> int:
+        """Count papers whose PMID has not been seen in an earlier section (papers without a PMID count as unique)."""
+        unique = 0
+        for paper in papers:
+            pmid = paper.get("pmid") if isinstance(paper, dict) else None
+            if not pmid:
+                unique += 1
+            elif pmid not in seen_pmids:
+                seen_pmids.add(pmid)
+                unique += 1
+        return unique
+
+    section_files = [results_dir / f"{sanitize_filename(drug_name)}_{section_id}_papers.json" for section_id in sections]
+
+    # Skip the whole combine when the section files are exactly those of the last run
+    manifest_file = combined_file.with_name(f"{sanitize_filename(drug_name)}_5.3_combined_manifest.json")
+    file_stats = section_file_stats(section_files)
+    if combined_file.exists() and manifest_file.exists():
         try:
-            with open(section_file, 'r', encoding='utf-8') as f:
-                section_data = json.load(f)
-
-            # Extract section information
-            if "sections" in section_data:
-                # New format with nested sections
-                for sub_section_id, sub_section_info in section_data["sections"].items():
-                    combined["sections"][sub_section_id] = sub_section_info
-                    paper_count = len(sub_section_info.get("papers", []))
-                    all_papers_by_section[sub_section_id] = paper_count
-                    total_unique += paper_count
-            else:
-                # Old format - single section
-                section_info = {
-                    "title": section_data.get("regulation_section", section_id),
-                    "description": "",
-                    "papers": section_data.get("papers", [])
-                }
-                combined["sections"][section_id] = section_info
-                paper_count = len(section_info["papers"])
-                all_papers_by_section[section_id] = paper_count
-                total_unique += paper_count
-
-            # Add to summary
-            if "summary" in section_data:
-                section_summary = section_data["summary"]
-                total_mentions += section_summary.get("total_mentions", 0)
-                if "deduplication_stats" in section_summary:
-                    combined["summary"]["deduplication_stats"]["duplicates_found"] += \
-                        section_summary["deduplication_stats"].get("duplicates_found", 0)
-                    combined["summary"]["deduplication_stats"]["papers_removed"] += \
-                        section_summary["deduplication_stats"].get("papers_removed", 0)
-
-            combined["summary"]["sections_processed"].append(section_id)
-            print(f"✓ Loaded {section_id}: {paper_count} papers")
-
-        except json.JSONDecodeError as e:
-            print(f"⚠️  Error reading {section_file}: Invalid JSON - {e}")
-        except Exception as e:
-            print(f"⚠️  Error reading {section_file}: {e}")
-
-    # Update combined summary
-    combined["summary"]["total_unique_papers"] = total_unique
-    combined["summary"]["total_mentions"] = total_mentions
-    combined["summary"]["papers_by_section"] = all_papers_by_section
-
+            manifest = load_json_file(manifest_file)
+            if (manifest.get("version") == COMBINE_MANIFEST_VERSION and manifest.get("sections") == list(sections)
+                    and manifest.get("files") == file_stats):
+                logger.info(f"✓ Section files unchanged since the last combine, keeping {combined_file}")
+                return manifest["combined"]
+        except (ValueError, KeyError, AttributeError) as e:
+            logger.warning(f"⚠️  Ignoring unreadable manifest {manifest_file}: {e}")
+
+    # Write to a temporary file and swap it in, so an interrupted run never leaves a truncated combined file
+    tmp_file = combined_file.with_name(combined_file.name + ".tmp")
+    with open(tmp_file, 'wb') as out, ThreadPoolExecutor(max_workers=4) as executor:
+        out.write(b'{\n  "drug_name": ' + dumps_nested_json(drug_name, 1) +
+                  b',\n  "regulation_section": "5.3",\n  "sections": {')
+        first_section = True
+
+        def write_section(sub_section_id, sub_section_info):
+            nonlocal first_section
+            out.write((b"\n    " if first_section else b",\n    ") + dumps_nested_json(str(sub_section_id), 2) +
+                      b": " + dumps_nested_json(sub_section_info, 2))
+            first_section = False
+
+        # Read and decode the section files concurrently; results are consumed in section order below
+        futures = [executor.submit(load_json_file, section_file) for section_file in section_files]
+
+        for section_id, section_file, future in zip(sections, section_files, futures):
+            if not section_file.exists():
+                logger.warning(f"⚠️  Warning: {section_file} not found, skipping...")
+                continue
+
+            try:
+                section_data = future.result()
+
+                # Extract section information
+                if "sections" in section_data:
+                    # New format with nested sections
+                    for sub_section_id, sub_section_info in section_data["sections"].items():
+                        write_section(sub_section_id, sub_section_info)
+                        papers = sub_section_info.get("papers", [])
+                        paper_count = len(papers)
+                        all_papers_by_section[sub_section_id] = paper_count
+                        total_papers += paper_count
+                        total_unique += count_unique_papers(papers)
+                else:
+                    # Old format - single section
+                    section_info = {
+                        "title": section_data.get("regulation_section", section_id),
+                        "description": "",
+                        "papers": section_data.get("papers", [])
+                    }
+                    write_section(section_id, section_info)
+                    paper_count = len(section_info["papers"])
+                    all_papers_by_section[section_id] = paper_count
+                    total_papers += paper_count
+                    total_unique += count_unique_papers(section_info["papers"])
+
+                # Add to summary
+                if "summary" in section_data:
+                    section_summary = section_data["summary"]
+                    total_mentions += section_summary.get("total_mentions", 0)
+                    if "deduplication_stats" in section_summary:
+                        combined["summary"]["deduplication_stats"]["duplicates_found"] += \
+                            section_summary["deduplication_stats"].get("duplicates_found", 0)
+                        combined["summary"]["deduplication_stats"]["papers_removed"] += \
+                            section_summary["deduplication_stats"].get("papers_removed", 0)
+
+                combined["summary"]["sections_processed"].append(section_id)
+                logger.info(f"✓ Loaded {section_id}: {paper_count} papers")
+
+            except json.JSONDecodeError as e:
+                logger.error(f"⚠️  Error reading {section_file}: Invalid JSON - {e}")
+            except Exception as e:
+                logger.error(f"⚠️  Error reading {section_file}: {e}")
+
+        # Update combined summary; papers repeated across sections stay in each section
+        combined["summary"]["total_unique_papers"] = total_unique
+        combined["summary"]["deduplication_stats"]["cross_section_repeats"] = total_papers - total_unique
+        combined["summary"]["total_mentions"] = total_mentions
+        combined["summary"]["papers_by_section"] = all_papers_by_section
+
+        out.write((b"}," if first_section else b"\n  },") +
+                  b'\n  "summary": ' + dumps_nested_json(combined["summary"], 1) +
+                  b',\n  "combined_at": ' + dumps_nested_json(combined["combined_at"], 1) + b"\n}")
+
+    os.replace(tmp_file, combined_file)
+    manifest_file.write_bytes(dumps_nested_json({"version": COMBINE_MANIFEST_VERSION, "sections": list(sections),
+                                                 "files": file_stats, "combined": combined}, 0))
     return combined
 
 
 def main():
     """Main function to run all sections sequentially and combine results."""
-    if len(sys.argv) < 2:
-        print("Usage: python run_all_sections.py <drug_name> [model]")
-        print("\nArguments:")
-        print("  drug_name: Name of the drug (e.g., 'Levofloxacin USP 250mg')")
-        print("  model: (optional) LLM model (default: 'openai:gpt-4o')")
-        print("\nExamples:")
-        print("  python run_all_sections.py 'Levofloxacin USP 250mg'")
-        print("  python run_all_sections.py 'Levofloxacin USP 250mg' 'openai:gpt-4o'")
-        sys.exit(1)
-
-    drug_name = sys.argv[1]
-    model = sys.argv[2] if len(sys.argv) > 2 else "openai:gpt-4o"
+    parser = argparse.ArgumentParser(
+        description="Process all Module 5.3 sections and combine the results.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="Examples:\n"
+               "  python run_all_sections.py 'Levofloxacin USP 250mg'\n"
+               "  python run_all_sections.py 'Levofloxacin USP 250mg' 'openai:gpt-4o'\n"
+               "  python run_all_sections.py 'Levofloxacin USP 250mg' --isolated"
+    )
+    parser.add_argument("drug_name", help="Name of the drug (e.g., 'Levofloxacin USP 250mg')")
+    parser.add_argument("model", nargs="?", default="openai:gpt-4o", help="LLM model (default: 'openai:gpt-4o')")
+    parser.add_argument("--isolated", action="store_true", help="Run each section in its own subprocess")
+    args = parser.parse_args()
+
+    setup_logging()
+
+    drug_name = args.drug_name
+    model = args.model
+    isolated = args.isolated
 
     # All sections to process
     sections = ["5.3.1", "5.3.2", "5.3.3", "5.3.4", "5.3.5", "5.3.6", "5.3.7"]
@@ -194,7 +333,7 @@ def main():
             continue
 
         section_start = datetime.now()
-        success = run_section(str(regulation_file), drug_name, model)
+        success = run_section(str(regulation_file), drug_name, model, isolated=isolated)
         section_end = datetime.now()
         duration = (section_end - section_start).total_seconds()
 
@@ -223,8 +362,6 @@ def main():
         print("COMBINING RESULTS")
         print("="*80)
 
-        combined = combine_results(drug_name, successful_sections)
-
         # Save combined results
         results_dir = Path("module5Results")
         results_dir.mkdir(exist_ok=True)
@@ -232,8 +369,7 @@ def main():
         # Sanitize drug name for filename
         combined_file = results_dir / f"{sanitize_filename(drug_name)}_5.3_combined_papers.json"
 
-        with open(combined_file, 'w', encoding='utf-8') as f:
-            json.dump(combined, f, indent=2, ensure_ascii=False)
+        combined = combine_results(drug_name, successful_sections, combined_file)
 
         print(f"\n✅ Combined results saved to: {combined_file}")
         print(f"\nSummary:")
@@ -242,6 +378,7 @@ def main():
         print(f"  Sections processed: {len(combined['summary']['sections_processed'])}")
         print(f"  Duplicates found: {combined['summary']['deduplication_stats']['duplicates_found']}")
         print(f"  Papers removed: {combined['summary']['deduplication_stats']['papers_removed']}")
+        print(f"  Repeated across sections: {combined['summary']['deduplication_stats'].get('cross_section_repeats', 0)}")
         print("="*80)
     else:
         print("⚠️  No successful sections to combine.")
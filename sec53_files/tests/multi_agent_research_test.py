@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Tests for multi_agent_research JSON helpers.
+"""
+
+import os
+import sys
+import time
+import unittest
+
+# Add parent directory to path so we can import the research modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from multi_agent_research import iter_json_spans
+
+
+class TestIterJsonSpans(unittest.TestCase):
+    def test_spans_in_order(self):
+        text = 'Found: {"papers": [1, 2]} and also [3] done'
+        self.assertEqual(list(iter_json_spans(text)), ['{"papers": [1, 2]}', '[3]'])
+
+    def test_brackets_inside_strings(self):
+        text = 'x {"title": "a ] b } \\" ["} y'
+        self.assertEqual(list(iter_json_spans(text)), ['{"title": "a ] b } \\" ["}'])
+
+    def test_spans_after_stray_opener(self):
+        text = 'note [ see below {"a": 1} then [2]'
+        self.assertEqual(list(iter_json_spans(text)), ['{"a": 1}', '[2]'])
+
+    def test_stray_closers_ignored(self):
+        self.assertEqual(list(iter_json_spans('] } {"a": [1]} ]')), ['{"a": [1]}'])
+
+    def test_many_stray_openers_linear(self):
+        n = 200000
+        text = '[' * n + '{"papers": [1]}'
+        start = time.perf_counter()
+        spans = list(iter_json_spans(text))
+        elapsed = time.perf_counter() - start
+        self.assertEqual(spans, ['{"papers": [1]}'])
+        # A rescan per stray opener would take minutes at this size
+        self.assertLess(elapsed, 5.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
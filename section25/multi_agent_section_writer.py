@@ -8,22 +8,29 @@ Features:
 - Quality validation with LaTeX syntax checking
 - Self-review and critique loop for continuous improvement
 - Enhanced regulatory writing standards with ICH guidelines
-- Rate limit handling with exponential backoff retries
+- Proactive rate limiting (requests/tokens per minute) with Retry-After aware retries
 - Context length management (truncates/summarizes long content)
-- Sequential processing by dependencies
+- Exact-match cache of LLM outputs, so unchanged sections skip the model call
+- Parallel processing of independent sections, level by level in dependency order
 - Cross-referencing between sections and papers
 - Semantic chunking for better paper context management
 """
 
 import os
 import json
+import hashlib
 import re
 import datetime
 import asyncio
+import heapq
+import threading
+import sys
 import time
-from typing import List, Dict, Any, TypedDict, Annotated, Optional, Tuple
+from typing import List, Dict, Any, TypedDict, Annotated, Optional, Tuple, Mapping
 from pathlib import Path
 from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
 from langchain.agents import create_agent
 from langchain_core.tools import tool
 from langchain.chat_models import init_chat_model
@@ -37,6 +44,258 @@ try:
 except ImportError:
     RateLimitError = None
 
+# Try to import orjson for faster JSON parsing
+try:
+    import orjson
+except ImportError:
+    # Fall back to the stdlib json module if orjson is not available
+    orjson = None
+
+# tiktoken is optional; token counts fall back to ~4 characters per token
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# xxhash is optional; cache keys fall back to a 64-bit BLAKE2b digest
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# LLM limits shared by every section agent: each call reserves one request and its
+# estimated prompt + output tokens before it is sent
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "60"))
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "30000"))
+EXPECTED_OUTPUT_TOKENS = 4000
+# Streamed refinements are cancelled if no sectioning command appears within this many tokens
+LATEX_PROBE_TOKENS = 500
+
+# Exact-match cache of LLM outputs under <output_dir>/.llm_cache (LLM_CACHE=0 disables)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE", "1") != "0"
+LLM_CACHE_MAX_TEMPERATURE = 0.3
+# Entries kept on disk per output directory; the least recently used are pruned on startup
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "500"))
+
+# Token budget for the Module 5 study listing in each writer prompt
+PAPERS_CONTEXT_TOKEN_BUDGET = int(os.getenv("PAPERS_CONTEXT_TOKEN_BUDGET", "1500"))
+
+# Token budget for the head + tail preview of each related section in a writer prompt
+SECTION_PREVIEW_TOKENS = int(os.getenv("SECTION_PREVIEW_TOKENS", "500"))
+
+# Maximum number of independent sections written at the same time
+MAX_CONCURRENT_SECTIONS = int(os.getenv("MAX_CONCURRENT_SECTIONS", "4"))
+
+_RATE_LIMIT_RE = re.compile(r'rate.?limit|429', re.IGNORECASE)
+_WAIT_SECONDS_RE = re.compile(r'(\d+\.?\d*)\s*seconds?', re.IGNORECASE)
+_SECTION_NUMBER_RE = re.compile(r'^\d+\.\d+')
+_SECTION_ID_RE = re.compile(r'^2\.5(\.\d+)*$')
+
+# Blank lines, bare "%" lines and generated metadata comments, dropped by load_written_section
+_META_COMMENT_RE = re.compile(
+    r'^[^\S\n]*(?:%(?=[^\n]*(?:Generated:|Preamble|Section[^\n]*Generated|Generated[^\n]*Section))[^\n]*'
+    r'|%[^\S\n]*)?$\n?',
+    re.MULTILINE
+)
+
+# Patterns used to extract LaTeX from LLM responses
+_CODEBLOCK_RE = re.compile(r'```(?:latex)?\s*(.*?)\s*```', re.DOTALL)
+_MD_FENCE_OPEN_RE = re.compile(r'^```(?:latex)?\s*', re.MULTILINE)
+_MD_FENCE_CLOSE_RE = re.compile(r'\s*```$', re.MULTILINE)
+
+
+class LLMRateLimiter:
+    """Token-bucket limiter for LLM requests and tokens per minute.
+
+    Both buckets refill continuously. acquire() blocks until the call fits, so a
+    batch of sections is paced under the provider limits up front instead of
+    finding them through 429 responses and backoff sleeps. Thread-safe, so the
+    limiter also covers graph nodes running in worker threads.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.max_requests = float(requests_per_minute)
+        self.max_tokens = float(tokens_per_minute)
+        self.available_requests = self.max_requests
+        self.available_tokens = self.max_tokens
+        self.last_update = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self.last_update
+        self.available_requests = min(self.max_requests,
+                                      self.available_requests + elapsed * self.max_requests / 60.0)
+        self.available_tokens = min(self.max_tokens,
+                                    self.available_tokens + elapsed * self.max_tokens / 60.0)
+        self.last_update = now
+
+    def acquire(self, tokens: int) -> float:
+        """Wait until one request and `tokens` tokens are available, then spend them.
+
+        Returns:
+            Seconds spent waiting
+        """
+        tokens = min(float(tokens), self.max_tokens)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self.available_requests >= 1 and self.available_tokens >= tokens:
+                    self.available_requests -= 1
+                    self.available_tokens -= tokens
+                    return waited
+                delay = max((1 - self.available_requests) * 60.0 / self.max_requests,
+                            (tokens - self.available_tokens) * 60.0 / self.max_tokens)
+            # Sleep outside the lock so other callers can still refill and check
+            time.sleep(delay)
+            waited += delay
+
+
+_llm_limiter = LLMRateLimiter(LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE)
+
+
+@lru_cache(maxsize=1)
+def _get_token_encoding():
+    """Get the tiktoken encoding used for prompt token estimates (None if unavailable)."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in text (tiktoken if available, else ~4 chars/token)."""
+    encoding = _get_token_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+
+def _retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Get the server-requested retry delay from a Retry-After header or the error message."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if headers:
+        for header, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+            value = headers.get(header)
+            if value:
+                try:
+                    return float(value) * scale
+                except (TypeError, ValueError):
+                    pass
+    wait_match = _WAIT_SECONDS_RE.search(str(error))
+    if wait_match:
+        return float(wait_match.group(1)) + 1  # Add 1 second buffer
+    return None
+
+
+def classify_rate_limit_error(error: BaseException, max_depth: int = 5) -> Tuple[bool, Optional[float]]:
+    """Check an exception and its causes/contexts for a rate limit error.
+
+    Returns:
+        Tuple of (is_rate_limit, wait_time) where wait_time is the server-requested
+        delay, or None if the server did not specify one
+    """
+    current_exception = error
+    for _ in range(max_depth + 1):
+        if current_exception is None:
+            break
+        if ((RateLimitError and isinstance(current_exception, RateLimitError))
+                or _RATE_LIMIT_RE.search(type(current_exception).__name__)
+                or _RATE_LIMIT_RE.search(str(current_exception))):
+            return True, _retry_after_seconds(current_exception)
+        current_exception = current_exception.__cause__ or current_exception.__context__
+    return False, None
+
+
+def invoke_with_rate_limit(runnable, inputs: Any, label: str, estimated_tokens: int,
+                           max_retries: int = 5, base_delay: float = 2.0):
+    """Invoke an agent or chat model behind the shared LLM rate limiter.
+
+    Every attempt first reserves capacity from the token bucket. If the provider
+    still answers with a rate limit error, the retry waits exactly as long as its
+    Retry-After asks, falling back to exponential backoff when it gives no delay.
+    """
+    return _call_with_rate_limit(lambda: runnable.invoke(inputs), label, estimated_tokens,
+                                 max_retries=max_retries, base_delay=base_delay)
+
+
+def content_text(content: Any) -> str:
+    """Text of a message or chunk content, given as a string or a list of content blocks."""
+    if isinstance(content, str):
+        return content
+    parts = []
+    for block in content or ():
+        if isinstance(block, str):
+            parts.append(block)
+        elif isinstance(block, dict) and block.get("type") == "text":
+            parts.append(block.get("text", ""))
+    return "".join(parts)
+
+
+def stream_latex_with_rate_limit(llm, inputs: Any, label: str, estimated_tokens: int,
+                                 probe_tokens: int = LATEX_PROBE_TOKENS,
+                                 max_retries: int = 5, base_delay: float = 2.0) -> Optional[str]:
+    """Stream a chat model's LaTeX reply behind the shared LLM rate limiter.
+
+    Chunks are collected as they arrive. If no \\section or \\subsection command
+    has appeared after about probe_tokens tokens (~4 characters each), the reply
+    is not LaTeX and the stream is cancelled instead of waiting for the rest.
+
+    Returns:
+        The full reply text, or None if the stream was cancelled
+    """
+    markers = ('\\section', '\\subsection')
+    tail_length = max(len(marker) for marker in markers) - 1
+    probe_chars = probe_tokens * 4
+
+    def stream() -> Optional[str]:
+        parts = []
+        received = 0
+        tail = ""
+        found_latex = False
+        for chunk in llm.stream(inputs):
+            text = content_text(chunk.content)
+            parts.append(text)
+            if not found_latex:
+                window = tail + text
+                found_latex = any(marker in window for marker in markers)
+                tail = window[-tail_length:]
+                received += len(text)
+                if not found_latex and received > probe_chars:
+                    return None
+        return "".join(parts)
+
+    return _call_with_rate_limit(stream, label, estimated_tokens,
+                                 max_retries=max_retries, base_delay=base_delay)
+
+
+def _call_with_rate_limit(call, label: str, estimated_tokens: int,
+                          max_retries: int = 5, base_delay: float = 2.0):
+    """Run an LLM call behind the shared limiter, retrying on rate limit errors."""
+    for attempt in range(max_retries):
+        waited = _llm_limiter.acquire(estimated_tokens)
+        if waited >= 1:
+            print(f"⏳ [{label}] Throttled {waited:.1f}s to stay under the LLM rate limit")
+        try:
+            return call()
+        except Exception as e:
+            is_rate_limit, wait_time = classify_rate_limit_error(e)
+            if not is_rate_limit:
+                error_str = str(e).lower()
+                if "context_length" in error_str or "token" in error_str and ("limit" in error_str or "exceeded" in error_str):
+                    print(f"❌ [{label}] Context length exceeded.")
+                raise
+            if attempt == max_retries - 1:
+                raise
+            delay = wait_time if wait_time is not None else base_delay * (2 ** attempt)
+            print(f"⏳ [{label}] Rate limit hit. Waiting {delay:.1f}s before retry {attempt + 2}/{max_retries}...")
+            time.sleep(delay)
+
+
+# Maximum refinement rounds per section
+MAX_REVISIONS = 2
 
 # Quality metrics thresholds
 QUALITY_THRESHOLDS = {
@@ -149,7 +408,117 @@ class SectionWritingState(TypedDict):
     draft_tex: str  # Initial draft before refinement
     quality_report: Dict[str, Any]  # Quality validation results
     revision_count: int  # Number of revision iterations
+    pre_refine_score: float  # Quality score of the content the last refinement started from
     writing_phase: str  # Current phase: outline, draft, refine, validate
+    bypass_llm_cache: bool  # Call the model even if the LLM cache has an entry (the new output is still cached)
+
+
+class LLMCache:
+    """Exact-match cache of LLM outputs so unchanged sections skip the model call.
+
+    Entries are keyed by a 64-bit hash of everything that shapes the response
+    (model, temperature, prompts, paper URLs, related section content) and kept
+    in memory and as JSON files under cache_dir. Only near-deterministic calls
+    (temperature <= LLM_CACHE_MAX_TEMPERATURE) are cached. Unreadable entries
+    are treated as misses. Callers skip get() to force a fresh model call; the
+    directory is capped at LLM_CACHE_MAX_ENTRIES files by prune().
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self._memory = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_cacheable(temperature: float) -> bool:
+        return LLM_CACHE_ENABLED and temperature <= LLM_CACHE_MAX_TEMPERATURE
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        # Large inputs are passed in as short signatures (_text_hash, _papers_signature),
+        # so this payload stays small
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return _fast_hash(payload.encode("utf-8"))
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached output for key, or None on a miss."""
+        with self._lock:
+            if key in self._memory:
+                return self._memory[key]
+        path = self.cache_dir / f"{key}.json"
+        try:
+            content = json.loads(path.read_bytes())["content"]
+            # Mark the entry as recently used so prune() keeps it
+            os.utime(path)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        with self._lock:
+            self._memory[key] = content
+        return content
+
+    def set(self, key: str, content: str) -> None:
+        with self._lock:
+            self._memory[key] = content
+        path = self.cache_dir / f"{key}.json"
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write then rename so concurrent sections never read a partial entry
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(json.dumps({"content": content}, ensure_ascii=False).encode("utf-8"))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️  Warning: Could not write LLM cache entry {path}: {e}")
+
+    def prune(self, max_entries: int = LLM_CACHE_MAX_ENTRIES) -> int:
+        """Delete the least recently used entry files beyond max_entries; returns how many."""
+        try:
+            with os.scandir(self.cache_dir) as it:
+                entries = [(entry.stat().st_mtime_ns, entry.path) for entry in it
+                           if entry.name.endswith(".json") and entry.is_file()]
+        except OSError:
+            return 0
+        removed = 0
+        for _mtime, path in heapq.nsmallest(max(0, len(entries) - max_entries), entries):
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+
+@lru_cache(maxsize=8)
+def get_llm_cache(output_dir: str = "section2.5_tex") -> LLMCache:
+    """Get the shared LLM output cache for an output directory, pruned to LLM_CACHE_MAX_ENTRIES."""
+    cache = LLMCache(Path(output_dir) / ".llm_cache")
+    cache.prune()
+    return cache
+
+
+def _new_fast_hasher():
+    """64-bit non-cryptographic hasher for cache keys (collision resistance is not needed)."""
+    if xxhash is not None:
+        return xxhash.xxh3_64()
+    return hashlib.blake2b(digest_size=8)
+
+
+def _fast_hash(data: bytes) -> str:
+    hasher = _new_fast_hasher()
+    hasher.update(data)
+    return hasher.hexdigest()
+
+
+def _text_hash(text: str) -> str:
+    return _fast_hash(text.encode("utf-8"))
+
+
+def _papers_signature(papers: List[Dict[str, Any]]) -> str:
+    """Order-independent signature of a paper list, from the sorted paper URLs."""
+    hasher = _new_fast_hasher()
+    for url in sorted(str(p.get("url", "")) for p in papers):
+        hasher.update(url.encode("utf-8"))
+        hasher.update(b"\n")
+    return hasher.hexdigest()
 
 
 def load_section_guidance(section_id: str, base_path: str = "section2.5") -> str:
@@ -189,7 +558,7 @@ def load_section_guidance(section_id: str, base_path: str = "section2.5") -> str
                             subsection_lines.append(line)
                         elif in_subsection:
                             # Check if we've hit another section
-                            if re.match(r'^\d+\.\d+', line.strip()):
+                            if _SECTION_NUMBER_RE.match(line.strip()):
                                 break
                             subsection_lines.append(line)
                     if subsection_lines:
@@ -221,36 +590,67 @@ def load_preamble(base_path: str = "section2.5") -> str:
         return f.read()
 
 
+async def load_section_guidance_async(section_id: str, base_path: str = "section2.5") -> str:
+    """Async variant of load_section_guidance that reads in a worker thread."""
+    return await asyncio.to_thread(load_section_guidance, section_id, base_path)
+
+
+async def load_preamble_async(base_path: str = "section2.5") -> str:
+    """Async variant of load_preamble that reads in a worker thread."""
+    return await asyncio.to_thread(load_preamble, base_path)
+
+
+# Section titles (guidance files without an entry take their title from the first line)
+_SECTION_TITLES = {
+    "2.5": "Clinical Overview",
+    "2.5.1": "Product Development Rationale",
+    "2.5.2": "Overview of Biopharmaceutics",
+    "2.5.3": "Overview of Clinical Pharmacology",
+    "2.5.4": "Overview of Efficacy",
+    "2.5.5": "Overview of Safety",
+    "2.5.6": "Benefits and Risks Conclusions",
+    "2.5.6.1": "Therapeutic Context",
+    "2.5.6.1.1": "Disease or Condition",
+    "2.5.6.1.2": "Current Therapies",
+    "2.5.6.2": "Benefits",
+    "2.5.6.3": "Risks",
+    "2.5.6.4": "Benefit-Risk Assessment",
+    "2.5.7": "Literature References"
+}
+
+# Sections written by --all and included in main.tex by default, in document order
+_DEFAULT_SECTIONS = (
+    "2.5.1", "2.5.2", "2.5.3", "2.5.4", "2.5.5",
+    "2.5.6", "2.5.6.1", "2.5.6.2", "2.5.6.3", "2.5.6.4", "2.5.7"
+)
+
+
 def get_all_section_info(base_path: str = "section2.5") -> Dict[str, Dict[str, str]]:
     """Get information about all sections in 2.5.
 
+    The result is cached per folder and rebuilt when the folder's mtime changes
+    (a guidance file was added, removed or replaced). Callers share the returned
+    dictionary and must not modify it.
+
     Args:
         base_path: Base path to section2.5 folder
 
     Returns:
         Dictionary mapping section_id to {title, description}
     """
+    try:
+        dir_mtime_ns = os.stat(base_path).st_mtime_ns
+    except OSError:
+        dir_mtime_ns = None
+    return _load_all_section_info(str(base_path), dir_mtime_ns)
+
+
+@lru_cache(maxsize=8)
+def _load_all_section_info(base_path: str, dir_mtime_ns: Optional[int]) -> Dict[str, Dict[str, str]]:
+    """Read title and description for every guidance file (cached by get_all_section_info)."""
     base_path = Path(base_path)
     sections_info = {}
 
-    # Section titles mapping
-    section_titles = {
-        "2.5": "Clinical Overview",
-        "2.5.1": "Product Development Rationale",
-        "2.5.2": "Overview of Biopharmaceutics",
-        "2.5.3": "Overview of Clinical Pharmacology",
-        "2.5.4": "Overview of Efficacy",
-        "2.5.5": "Overview of Safety",
-        "2.5.6": "Benefits and Risks Conclusions",
-        "2.5.6.1": "Therapeutic Context",
-        "2.5.6.1.1": "Disease or Condition",
-        "2.5.6.1.2": "Current Therapies",
-        "2.5.6.2": "Benefits",
-        "2.5.6.3": "Risks",
-        "2.5.6.4": "Benefit-Risk Assessment",
-        "2.5.7": "Literature References"
-    }
-
     # Load all .txt files
     for txt_file in sorted(base_path.glob("*.txt")):
         section_id = txt_file.stem
@@ -261,7 +661,7 @@ def get_all_section_info(base_path: str = "section2.5") -> Dict[str, Dict[str, s
             with open(txt_file, 'r', encoding='utf-8') as f:
                 content = f.read()
                 lines = content.split('\n')
-                title = section_titles.get(section_id, "")
+                title = _SECTION_TITLES.get(section_id, "")
                 if not title and lines:
                     # Try to extract title from first line
                     first_line = lines[0].strip()
@@ -281,28 +681,47 @@ def get_all_section_info(base_path: str = "section2.5") -> Dict[str, Dict[str, s
     return sections_info
 
 
+@lru_cache(maxsize=64)
+def section_label_id(section_id: str) -> str:
+    """Get the label/file name stem for a section ID (e.g., "2.5.6.1" -> "2_5_6_1")."""
+    return section_id.replace('.', '_')
+
+
+# Dependency graph for sections - which sections depend on which
+_SECTION_DEPS = {
+    "2.5": [],  # Preamble - no dependencies
+    "2.5.1": [],  # Product Development Rationale - standalone (write first)
+    "2.5.2": ["2.5.1"],  # Biopharmaceutics depends on Product Development
+    "2.5.3": ["2.5.2"],  # Clinical Pharmacology depends on Biopharmaceutics
+    "2.5.4": ["2.5.3"],  # Efficacy depends on Clinical Pharmacology
+    "2.5.5": ["2.5.3", "2.5.4"],  # Safety depends on Clinical Pharmacology and Efficacy
+    "2.5.6": ["2.5.4", "2.5.5"],  # Benefits/Risks depends on Efficacy and Safety
+    "2.5.6.1": ["2.5.1", "2.5.6"],  # Therapeutic Context depends on Product Development and parent
+    "2.5.6.1.1": ["2.5.6.1"],  # Disease or Condition depends on parent
+    "2.5.6.1.2": ["2.5.6.1"],  # Current Therapies depends on parent
+    "2.5.6.2": ["2.5.4", "2.5.6"],  # Benefits depends on Efficacy and parent
+    "2.5.6.3": ["2.5.5", "2.5.6"],  # Risks depends on Safety and parent
+    "2.5.6.4": ["2.5.4", "2.5.5", "2.5.6.2", "2.5.6.3", "2.5.6"],  # Benefit-Risk depends on all
+    "2.5.7": []  # References - can be written anytime (but usually last)
+}
+
+# Parent of each nested section (e.g., 2.5.6.1 -> 2.5.6), referenced alongside its dependencies
+_PARENT_SECTION = {
+    section_id: section_id.rsplit('.', 1)[0]
+    for section_id in _SECTION_DEPS
+    if section_id.count('.') > 2
+}
+
+
 def get_section_dependencies() -> Dict[str, List[str]]:
     """Get dependency graph for sections - which sections depend on which.
 
+    Returns the shared module-level mapping; callers must not modify it.
+
     Returns:
         Dictionary mapping section_id to list of sections it depends on
     """
-    return {
-        "2.5": [],  # Preamble - no dependencies
-        "2.5.1": [],  # Product Development Rationale - standalone (write first)
-        "2.5.2": ["2.5.1"],  # Biopharmaceutics depends on Product Development
-        "2.5.3": ["2.5.2"],  # Clinical Pharmacology depends on Biopharmaceutics
-        "2.5.4": ["2.5.3"],  # Efficacy depends on Clinical Pharmacology
-        "2.5.5": ["2.5.3", "2.5.4"],  # Safety depends on Clinical Pharmacology and Efficacy
-        "2.5.6": ["2.5.4", "2.5.5"],  # Benefits/Risks depends on Efficacy and Safety
-        "2.5.6.1": ["2.5.1", "2.5.6"],  # Therapeutic Context depends on Product Development and parent
-        "2.5.6.1.1": ["2.5.6.1"],  # Disease or Condition depends on parent
-        "2.5.6.1.2": ["2.5.6.1"],  # Current Therapies depends on parent
-        "2.5.6.2": ["2.5.4", "2.5.6"],  # Benefits depends on Efficacy and parent
-        "2.5.6.3": ["2.5.5", "2.5.6"],  # Risks depends on Safety and parent
-        "2.5.6.4": ["2.5.4", "2.5.5", "2.5.6.2", "2.5.6.3", "2.5.6"],  # Benefit-Risk depends on all
-        "2.5.7": []  # References - can be written anytime (but usually last)
-    }
+    return _SECTION_DEPS
 
 
 def get_related_sections(section_id: str, all_sections: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, str]]:
@@ -315,26 +734,35 @@ def get_related_sections(section_id: str, all_sections: Dict[str, Dict[str, str]
     Returns:
         Dictionary of related sections
     """
-    related = {}
-
     # Get dependencies (sections this section depends on)
-    dependencies = get_section_dependencies()
-    related_ids = dependencies.get(section_id, [])
+    related_ids = _SECTION_DEPS.get(section_id, [])
 
     # Also include parent sections if this is a nested section
-    parts = section_id.split('.')
-    if len(parts) > 3:
-        # e.g., 2.5.6.1 -> also reference 2.5.6
-        parent_id = '.'.join(parts[:-1])
-        if parent_id not in related_ids and parent_id in all_sections:
-            related_ids.append(parent_id)
+    # e.g., 2.5.6.1 -> also reference 2.5.6
+    parent_id = _PARENT_SECTION.get(section_id)
+    if parent_id is None and section_id.count('.') > 2:
+        parent_id = section_id.rsplit('.', 1)[0]
+    if parent_id and parent_id not in related_ids and parent_id in all_sections:
+        related_ids = related_ids + [parent_id]
 
     # Get information for related sections
-    for related_id in related_ids:
-        if related_id in all_sections:
-            related[related_id] = all_sections[related_id]
+    return {related_id: all_sections[related_id] for related_id in related_ids if related_id in all_sections}
+
+
+def _dependency_graph(sections: List[str]) -> Tuple[Dict[str, int], Dict[str, List[str]]]:
+    """Build in-degrees and reverse adjacency lists (dependency -> dependents) for sections.
 
-    return related
+    Only dependencies that are themselves in sections are counted.
+    """
+    dependencies = get_section_dependencies()
+    in_degree = {section: 0 for section in sections}
+    dependents = {section: [] for section in sections}
+    for section in in_degree:
+        for dep in set(dependencies.get(section, [])):
+            if dep in in_degree:
+                in_degree[section] += 1
+                dependents[dep].append(section)
+    return in_degree, dependents
 
 
 def topological_sort_sections(sections: List[str]) -> List[str]:
@@ -348,39 +776,28 @@ def topological_sort_sections(sections: List[str]) -> List[str]:
     Returns:
         Sorted list of sections in dependency order
     """
-    dependencies = get_section_dependencies()
-
-    # Build dependency graph
-    graph = {section: set(dependencies.get(section, [])) for section in sections}
-
     # Topological sort using Kahn's algorithm
-    # Calculate in-degree for each section
-    in_degree = {section: 0 for section in sections}
-    for section in sections:
-        for dep in graph[section]:
-            if dep in in_degree:
-                in_degree[section] += 1
+    in_degree, dependents = _dependency_graph(sections)
 
-    # Find sections with no dependencies
-    queue = [section for section in sections if in_degree[section] == 0]
+    # Min-heap of ready sections for consistent ordering (alphabetical for sections at same level)
+    queue = [section for section, degree in in_degree.items() if degree == 0]
+    heapq.heapify(queue)
     result = []
 
     while queue:
-        # Sort queue to ensure consistent ordering (alphabetical for sections at same level)
-        queue.sort()
-        section = queue.pop(0)
+        section = heapq.heappop(queue)
         result.append(section)
 
         # Reduce in-degree of sections that depend on this one
-        for other_section in sections:
-            if section in graph[other_section]:
-                in_degree[other_section] -= 1
-                if in_degree[other_section] == 0:
-                    queue.append(other_section)
+        for dependent in dependents[section]:
+            in_degree[dependent] -= 1
+            if in_degree[dependent] == 0:
+                heapq.heappush(queue, dependent)
 
     # Check for circular dependencies
-    if len(result) != len(sections):
-        remaining = [s for s in sections if s not in result]
+    if len(result) != len(in_degree):
+        placed = set(result)
+        remaining = [s for s in sections if s not in placed]
         print(f"⚠️  Warning: Possible circular dependencies or missing dependencies for: {remaining}")
         # Add remaining sections at the end
         result.extend(remaining)
@@ -388,17 +805,87 @@ def topological_sort_sections(sections: List[str]) -> List[str]:
     return result
 
 
-def load_papers_json(json_path: str) -> Dict[str, Any]:
+def dag_levels(sections: List[str]) -> List[List[str]]:
+    """Group sections into dependency levels.
+
+    Every section in a level depends only on sections from earlier levels, so
+    the sections within one level can be written concurrently.
+
+    Args:
+        sections: List of section IDs to group
+
+    Returns:
+        List of levels, each a sorted list of section IDs
+    """
+    in_degree, dependents = _dependency_graph(sections)
+
+    levels = []
+    level = sorted(section for section, degree in in_degree.items() if degree == 0)
+    while level:
+        levels.append(level)
+        next_level = []
+        for section in level:
+            for dependent in dependents[section]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    next_level.append(dependent)
+        level = sorted(next_level)
+
+    # Check for circular dependencies
+    remaining = [s for s, degree in in_degree.items() if degree > 0]
+    if remaining:
+        print(f"⚠️  Warning: Possible circular dependencies or missing dependencies for: {remaining}")
+        # Add remaining sections as a final level
+        levels.append(remaining)
+
+    return levels
+
+
+def load_papers_json(json_path: str) -> Mapping[str, Any]:
     """Load papers data from JSON file.
 
+    The parsed data is cached per path and reloaded only when the file's size or
+    mtime changes. Callers (and every section state) share one read-only mapping;
+    the nested paper lists and dicts must not be modified either.
+
     Args:
         json_path: Path to the combined papers JSON file
 
     Returns:
-        Papers data dictionary
+        Read-only papers data mapping
     """
-    with open(json_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    stat = os.stat(json_path)
+    return _load_papers_json_cached(os.path.abspath(json_path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=4)
+def _load_papers_json_cached(json_path: str, mtime_ns: int, size: int) -> Mapping[str, Any]:
+    """Parse a papers JSON file (cached by load_papers_json), using orjson when available."""
+    with open(json_path, 'rb') as f:
+        data = f.read()
+    return MappingProxyType(orjson.loads(data) if orjson is not None else json.loads(data))
+
+
+# Map section 2.5.x to corresponding 5.3.x sections
+# Base mappings for main sections
+_BASE_SECTION_MAPPING = {
+    "2.5.1": ["5.3.1", "5.3.1.1", "5.3.1.2", "5.3.3", "5.3.3.1", "5.3.3.2"],
+    "2.5.2": ["5.3.1", "5.3.1.1", "5.3.1.2", "5.3.1.3", "5.3.1.4"],
+    "2.5.3": ["5.3.2", "5.3.2.1", "5.3.2.2", "5.3.2.3", "5.3.3", "5.3.3.1",
+              "5.3.3.2", "5.3.3.3", "5.3.3.4", "5.3.3.5", "5.3.4", "5.3.4.1", "5.3.4.2"],
+    "2.5.4": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4"],
+    "2.5.5": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4", "5.3.6"],
+    "2.5.6": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4", "5.3.6"],
+    "2.5.7": []  # References section - all papers are relevant
+}
+
+# Nested sections (e.g., 2.5.6.1, 2.5.6.2) inherit from parent and add specific mappings
+_NESTED_SECTION_MAPPING = {
+    "2.5.6.1": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4"],  # Therapeutic Context
+    "2.5.6.2": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3"],  # Benefits
+    "2.5.6.3": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.6"],  # Risks
+    "2.5.6.4": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4", "5.3.6"],  # Benefit-Risk Assessment
+}
 
 
 def find_relevant_papers(section_id: str, papers_data: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -412,158 +899,59 @@ def find_relevant_papers(section_id: str, papers_data: Dict[str, Any]) -> List[D
         List of relevant papers
     """
     relevant_papers = []
+    seen_urls = set()
     sections = papers_data.get("sections", {})
 
-    # Map section 2.5.x to corresponding 5.3.x sections
-    # Base mappings for main sections
-    base_section_mapping = {
-        "2.5.1": ["5.3.1", "5.3.1.1", "5.3.1.2", "5.3.3", "5.3.3.1", "5.3.3.2"],
-        "2.5.2": ["5.3.1", "5.3.1.1", "5.3.1.2", "5.3.1.3", "5.3.1.4"],
-        "2.5.3": ["5.3.2", "5.3.2.1", "5.3.2.2", "5.3.2.3", "5.3.3", "5.3.3.1",
-                  "5.3.3.2", "5.3.3.3", "5.3.3.4", "5.3.3.5", "5.3.4", "5.3.4.1", "5.3.4.2"],
-        "2.5.4": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4"],
-        "2.5.5": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4", "5.3.6"],
-        "2.5.6": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4", "5.3.6"],
-        "2.5.7": []  # References section - all papers are relevant
-    }
-
-    # Handle nested sections (e.g., 2.5.6.1, 2.5.6.2)
-    # For nested sections, inherit from parent and add specific mappings
-    nested_section_mapping = {
-        "2.5.6.1": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4"],  # Therapeutic Context
-        "2.5.6.2": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3"],  # Benefits
-        "2.5.6.3": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.6"],  # Risks
-        "2.5.6.4": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4", "5.3.6"],  # Benefit-Risk Assessment
-    }
+    def add_paper(paper: Dict[str, Any]):
+        # Avoid duplicates by URL
+        url = paper.get("url")
+        if url not in seen_urls:
+            seen_urls.add(url)
+            relevant_papers.append(paper)
 
     # Determine mapped sections
-    if section_id in nested_section_mapping:
-        mapped_sections = nested_section_mapping[section_id]
-    elif section_id in base_section_mapping:
-        mapped_sections = base_section_mapping[section_id]
+    if section_id in _NESTED_SECTION_MAPPING:
+        mapped_sections = _NESTED_SECTION_MAPPING[section_id]
+    elif section_id in _BASE_SECTION_MAPPING:
+        mapped_sections = _BASE_SECTION_MAPPING[section_id]
     else:
         # For unknown sections, try to infer from parent
         # e.g., 2.5.6.1.1 -> use 2.5.6.1 mapping
         parts = section_id.split('.')
         if len(parts) > 3:
             parent_id = '.'.join(parts[:-1])
-            mapped_sections = nested_section_mapping.get(parent_id, base_section_mapping.get(parent_id, []))
+            mapped_sections = _NESTED_SECTION_MAPPING.get(parent_id, _BASE_SECTION_MAPPING.get(parent_id, []))
         else:
             mapped_sections = []
 
     # Collect papers from mapped sections
     for mapped_section in mapped_sections:
         if mapped_section in sections:
-            section_papers = sections[mapped_section].get("papers", [])
-            for paper in section_papers:
-                # Avoid duplicates by URL
-                if not any(p.get("url") == paper.get("url") for p in relevant_papers):
-                    relevant_papers.append(paper)
+            for paper in sections[mapped_section].get("papers", []):
+                add_paper(paper)
 
     # Also check for papers marked as "also_relevant_to" in parent sections
     # This helps with cross-referencing
-    for section_key, section_data in sections.items():
-        section_papers = section_data.get("papers", [])
-        for paper in section_papers:
-            also_relevant = paper.get("also_relevant_to", [])
-            # Check if any mapped section is in also_relevant_to
-            if any(mapped in also_relevant for mapped in mapped_sections):
-                if not any(p.get("url") == paper.get("url") for p in relevant_papers):
-                    relevant_papers.append(paper)
+    mapped_set = set(mapped_sections)
+    if mapped_set:
+        for section_data in sections.values():
+            for paper in section_data.get("papers", []):
+                # Check if any mapped section is in also_relevant_to
+                if not mapped_set.isdisjoint(paper.get("also_relevant_to", [])):
+                    add_paper(paper)
 
     # For 2.5.7, include all papers
     if section_id == "2.5.7":
-        for section_key, section_data in sections.items():
-            section_papers = section_data.get("papers", [])
-            for paper in section_papers:
-                if not any(p.get("url") == paper.get("url") for p in relevant_papers):
-                    relevant_papers.append(paper)
+        for section_data in sections.values():
+            for paper in section_data.get("papers", []):
+                add_paper(paper)
 
     return relevant_papers
 
 
-def create_section_writer_agent(section_id: str, section_guidance: str,
-                                relevant_papers: List[Dict[str, Any]],
-                                related_sections: Dict[str, Dict[str, str]] = None,
-                                related_sections_tex: Dict[str, str] = None,
-                                output_dir: str = "section2.5_tex",
-                                model: str = "openai:gpt-4o",
-                                temperature: float = 0.3,
-                                writing_phase: str = "full"):
-    """Create an agent for writing a specific section.
-
-    Each section has its own dedicated agent that can reference:
-    - Guidance from .txt files
-    - Relevant papers from Module 5.3
-    - Already-written LaTeX content from other 2.5 sections
-
-    Args:
-        section_id: Section ID (e.g., "2.5.1")
-        section_guidance: Guidance text from .txt file
-        relevant_papers: List of relevant papers
-        related_sections: Dictionary of related 2.5 sections metadata
-        related_sections_tex: Dictionary of already-written LaTeX content from related sections
-        output_dir: Output directory where .tex files are saved
-        model: LLM model to use
-        temperature: Temperature for LLM
-        writing_phase: Phase of writing - "outline", "draft", "refine", "review", or "full"
-    """
-    # Use lower temperature for refinement, higher for initial drafting
-    if writing_phase == "outline":
-        temperature = 0.4  # More creative for structure planning
-    elif writing_phase == "draft":
-        temperature = 0.3  # Balanced for content generation
-    elif writing_phase == "refine":
-        temperature = 0.2  # More focused for refinement
-    elif writing_phase == "review":
-        temperature = 0.1  # Very focused for critique
-
-    llm = init_chat_model(model, temperature=temperature)
-
-    # Use enhanced paper formatting with semantic grouping
-    papers_context, citation_keys = format_papers_for_context(
-        relevant_papers, max_papers=15, include_key_findings=True
-    )
-
-    # Format related sections for context
-    sections_context = ""
-    if related_sections:
-        sections_context = "\n\nRELATED SECTIONS IN 2.5 FOR CROSS-REFERENCING:\n"
-        sections_context += "=" * 60 + "\n"
-        sections_context += "Cross-reference these sections using \\secref{2.5.X} command.\n"
-        sections_context += "Always add \\label{sec:X_Y_Z} after your section commands.\n\n"
-
-        for related_id, info in related_sections.items():
-            title = info.get("title", related_id)
-            description = info.get("description", "")[:150] + "..." if len(info.get("description", "")) > 150 else info.get("description", "")
-            label_id = related_id.replace('.', '_')
-            sections_context += f"\n[{related_id}] {title}\n"
-            sections_context += f"    Cross-ref: \\secref{{{related_id}}}\n"
-
-            # Include actual LaTeX content if available (truncated for context length)
-            if related_sections_tex and related_id in related_sections_tex:
-                tex_content = related_sections_tex[related_id]
-                if tex_content:
-                    max_tex_preview = 2000
-                    if len(tex_content) > max_tex_preview:
-                        preview = summarize_latex_content(tex_content, max_tex_preview)
-                        sections_context += f"    Content preview ({len(tex_content)} chars total):\n"
-                        # Indent the preview
-                        for line in preview.split('\n')[:10]:
-                            sections_context += f"      {line}\n"
-                    else:
-                        sections_context += f"    Content:\n"
-                        for line in tex_content.split('\n')[:10]:
-                            sections_context += f"      {line}\n"
-            else:
-                sections_context += f"    Status: Not yet written (use forward reference)\n"
-
-        sections_context += "=" * 60 + "\n"
-
-    # Build phase-specific prompts
-    phase_instructions = ""
-    if writing_phase == "outline":
-        phase_instructions = """
+# Phase-specific task instructions for the section writer prompt
+_PHASE_INSTRUCTIONS = {
+    "outline": """
 CURRENT TASK: CREATE SECTION OUTLINE
 
 Before writing the full content, create a detailed outline for Section {section_id}.
@@ -589,9 +977,8 @@ SECTION: 2.5.1 Product Development Rationale
   • Citations: [2] Brown2019
   ...
 ---
-"""
-    elif writing_phase == "draft":
-        phase_instructions = """
+""",
+    "draft": """
 CURRENT TASK: WRITE INITIAL DRAFT
 
 Based on the guidance and outline (if provided), write the initial draft of the LaTeX content.
@@ -603,9 +990,8 @@ Focus on:
 4. Clear, scientific language
 
 Don't worry about perfect polishing - this is the first draft that will be refined.
-"""
-    elif writing_phase == "refine":
-        phase_instructions = """
+""",
+    "refine": """
 CURRENT TASK: REFINE AND IMPROVE DRAFT
 
 Review and improve the existing draft. Focus on:
@@ -618,94 +1004,73 @@ Review and improve the existing draft. Focus on:
 7. Ensuring consistent terminology throughout
 
 Return the complete, refined LaTeX content.
-"""
-    elif writing_phase == "review":
-        phase_instructions = """
+""",
+    "review": """
 CURRENT TASK: CRITICAL REVIEW AND SELF-ASSESSMENT
 
-Critically review the content and provide:
-1. A quality score (0-100)
-2. List of issues found
-3. Specific suggestions for improvement
-4. Missing elements that should be added
-5. LaTeX syntax issues
-
-Format your response as:
----
-QUALITY SCORE: [0-100]
-
-ISSUES FOUND:
-- Issue 1
-- Issue 2
-...
-
-SUGGESTIONS:
-- Suggestion 1
-- Suggestion 2
-...
-
-MISSING ELEMENTS:
-- Element 1
-...
-
-LATEX ISSUES:
-- Issue 1
-...
----
+Critically review the content and return a single JSON object (no markdown, no
+text before or after it) with exactly these fields:
+
+{{
+  "is_valid": true,
+  "score": 0,
+  "issues": ["..."],
+  "suggestions": ["..."],
+  "latex_errors": ["..."],
+  "citation_count": 0,
+  "section_count": 0,
+  "word_count": 0,
+  "improved_latex": "..."
+}}
 
-Then provide the improved LaTeX content incorporating these fixes.
-"""
-    else:  # full
-        phase_instructions = """
+- score: quality score from 0 to 100
+- issues: problems found, including missing elements that should be added
+- suggestions: specific suggestions for improvement
+- latex_errors: LaTeX syntax issues
+- improved_latex: the improved LaTeX content incorporating these fixes
+""",
+    "full": """
 CURRENT TASK: WRITE COMPLETE SECTION
 
 Write a comprehensive, polished LaTeX section that is ready for regulatory submission.
-"""
-
-    # Build the complete system prompt with enhanced guidelines
-    system_prompt = f"""You are an expert regulatory medical writer specializing in ICH Module 5 Section 2.5: Clinical Overview.
-
-You are writing Section {section_id} as part of a multi-agent system where each agent is responsible for a specific section.
-
-{REGULATORY_WRITING_GUIDELINES}
-
-SECTION GUIDANCE FROM REGULATORY REQUIREMENTS:
-{'='*60}
-{section_guidance}
-{'='*60}
-
-{papers_context}
+""",
+}
 
-{sections_context}
+# The section writer system prompt is split into a constant prefix (role, writing
+# guidelines, LaTeX and referencing rules, example) built once at import, and a
+# per-section suffix filled with format_map. Keeping every section-specific value
+# at the end leaves the prefix byte-identical across calls, so provider-side
+# prompt prefix caching can reuse it.
+_SECTION_PROMPT_PREFIX = """You are an expert regulatory medical writer specializing in ICH Module 5 Section 2.5: Clinical Overview.
 
-{phase_instructions.format(section_id=section_id)}
+You are one agent in a multi-agent system where each agent is responsible for a specific section.
 
+""" + REGULATORY_WRITING_GUIDELINES + """
 LATEX FORMATTING REQUIREMENTS:
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-• Section commands: Use the EXACT section number in the title: \\section{{{section_id} Title}}
-  Example: \\section{{2.5.1 Product Development Rationale}}
-• Labels: \\label{{sec:{section_id.replace('.', '_')}}} immediately after section commands
-• Cross-references to OTHER 2.5 sections: \\secref{{2.5.X}} (e.g., \\secref{{2.5.3}})
-• Bold: \\textbf{{text}}, Italic: \\textit{{text}}
-• Lists: \\begin{{itemize}}...\\end{{itemize}} or \\begin{{enumerate}}...\\end{{enumerate}}
+• Section commands: Use the EXACT section number in the title, e.g. \\section{2.5.1 Product Development Rationale}
+• Labels: \\label{sec:2_5_1} (section number with underscores) immediately after section commands
+• Cross-references to OTHER 2.5 sections: \\secref{2.5.X} (e.g., \\secref{2.5.3})
+• Bold: \\textbf{text}, Italic: \\textit{text}
+• Lists: \\begin{itemize}...\\end{itemize} or \\begin{enumerate}...\\end{enumerate}
 • Math: $x = y$ for inline, \\[x = y\\] for display
 • Special characters: Escape %, $, &, #, _ as \\%, \\$, \\&, \\#, \\_
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 REFERENCING MODULE 5 CLINICAL STUDY DATA:
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-IMPORTANT: Do NOT use \\cite{{PMID...}} for citations!
+IMPORTANT: Do NOT use \\cite{PMID...} for citations!
 
 Instead, reference Module 5 sections directly using these formats:
-• For clinical study reports: \\modref{{5.3.5.1}} or (see Section 5.3.5.1)
-• For tabular listings: \\tableref{{X}} where X is the study/row number
-• For specific studies: \\studyref{{Study-001}} or (see Section 5.2, Study XYZ-001)
+• For clinical study reports: \\modref{5.3.5.1} or (see Section 5.3.5.1)
+• For tabular listings: \\tableref{X} where X is the study/row number
+• For specific studies: \\studyref{Study-001} or (see Section 5.2, Study XYZ-001)
 
 Examples:
-• "The pharmacokinetic parameters are detailed in \\modref{{5.3.1.1}}."
-• "Clinical efficacy was demonstrated in pivotal trials \\modref{{5.3.5.1}}."
-• "Adverse event data are summarized in \\modref{{5.3.5.3}}."
-• "As shown in the tabular listing \\tableref{{3}}, the study demonstrated..."
+• "The pharmacokinetic parameters are detailed in \\modref{5.3.1.1}."
+• "Clinical efficacy was demonstrated in pivotal trials \\modref{5.3.5.1}."
+• "Adverse event data are summarized in \\modref{5.3.5.3}."
+• "As shown in the tabular listing \\tableref{3}, the study demonstrated..."
 
 Section 5.2 contains the Tabular Listing of All Clinical Studies.
 Section 5.3 contains the Clinical Study Reports organized as:
@@ -719,38 +1084,187 @@ Section 5.3 contains the Clinical Study Reports organized as:
 
 EXAMPLE OF HIGH-QUALITY LATEX OUTPUT:
 
-\\section{{2.5.1 Product Development Rationale}}
-\\label{{sec:2_5_1}}
+\\section{2.5.1 Product Development Rationale}
+\\label{sec:2_5_1}
 
-\\subsection{{2.5.1.1 Pharmacological Class and Mechanism of Action}}
-\\label{{subsec:2_5_1_mechanism}}
+\\subsection{2.5.1.1 Pharmacological Class and Mechanism of Action}
+\\label{subsec:2_5_1_mechanism}
 
-The investigational product [Drug Name] is a [pharmacological class] that exerts its therapeutic effect through [mechanism of action]. Detailed pharmacology studies are presented in \\modref{{5.3.1.1}}.
+The investigational product [Drug Name] is a [pharmacological class] that exerts its therapeutic effect through [mechanism of action]. Detailed pharmacology studies are presented in \\modref{5.3.1.1}.
 
-\\subsection{{2.5.1.2 Therapeutic Rationale}}
-\\label{{subsec:2_5_1_rationale}}
+\\subsection{2.5.1.2 Therapeutic Rationale}
+\\label{subsec:2_5_1_rationale}
 
-The development program included multiple clinical studies as summarized in the tabular listing \\modref{{5.2}}. Key efficacy findings from pivotal trials are detailed in \\modref{{5.3.5.1}}.
-
-OUTPUT REQUIREMENTS:
-1. Return ONLY LaTeX code (no markdown code blocks, no explanations)
-2. Start with \\section{{{section_id} Title}} - include the section number in the title!
-3. Include \\label{{sec:{section_id.replace('.', '_')}}} after the section command
-4. Do NOT include document preamble (\\documentclass, \\begin{{document}}, etc.)
-5. Ensure all braces are balanced and environments are properly closed
-6. Use \\modref{{}}, \\tableref{{}}, or \\studyref{{}} for references to Module 5 data
-7. Use \\secref{{2.5.X}} for cross-references to other 2.5 sections (e.g., \\secref{{2.5.3}})
+The development program included multiple clinical studies as summarized in the tabular listing \\modref{5.2}. Key efficacy findings from pivotal trials are detailed in \\modref{5.3.5.1}.
 
 QUALITY STANDARDS:
 ✓ Comprehensive coverage of all guidance topics
 ✓ At least 3-5 references to Module 5 sections (5.2 or 5.3.x)
-✓ Cross-references to related 2.5 sections using \\secref{{2.5.X}}
+✓ Cross-references to related 2.5 sections using \\secref{2.5.X}
 ✓ Professional regulatory language
 ✓ Clear, logical structure with section numbers in titles
 ✓ Accurate scientific content
 ✓ No promotional language
 ✓ Proper abbreviation definitions"""
 
+_SECTION_PROMPT_SUFFIX = """
+
+You are writing Section {section_id}.
+
+SECTION GUIDANCE FROM REGULATORY REQUIREMENTS:
+{rule}
+{section_guidance}
+{rule}
+
+{papers_context}
+
+{sections_context}
+
+{phase_instructions}
+
+OUTPUT REQUIREMENTS:
+1. Return ONLY LaTeX code (no markdown code blocks, no explanations)
+2. Start with \\section{{{section_id} Title}} - include the section number in the title!
+3. Include \\label{{sec:{label_id}}} after the section command
+4. Do NOT include document preamble (\\documentclass, \\begin{{document}}, etc.)
+5. Ensure all braces are balanced and environments are properly closed
+6. Use \\modref{{}}, \\tableref{{}}, or \\studyref{{}} for references to Module 5 data
+7. Use \\secref{{2.5.X}} for cross-references to other 2.5 sections (e.g., \\secref{{2.5.3}})"""
+
+
+@lru_cache(maxsize=16)
+def get_llm(model: str = "openai:gpt-4o", temperature: float = 0.3):
+    """Get a shared chat model client for (model, temperature).
+
+    All agents with the same settings reuse one client (and its HTTP
+    connection pool) instead of constructing a new one per section and phase.
+    """
+    return init_chat_model(model, temperature=temperature)
+
+
+def phase_temperature(writing_phase: str, temperature: float = 0.3) -> float:
+    """Get the LLM temperature for a writing phase.
+
+    Uses lower temperature for refinement, higher for initial drafting; the
+    "full" phase keeps the given temperature.
+    """
+    if writing_phase == "outline":
+        return 0.4  # More creative for structure planning
+    elif writing_phase == "draft":
+        return 0.3  # Balanced for content generation
+    elif writing_phase == "refine":
+        return 0.2  # More focused for refinement
+    elif writing_phase == "review":
+        return 0.1  # Very focused for critique
+    return temperature
+
+
+def build_section_writer_prompt(section_id: str, section_guidance: str,
+                                relevant_papers: List[Dict[str, Any]],
+                                related_sections: Dict[str, Dict[str, str]] = None,
+                                related_sections_tex: Dict[str, str] = None,
+                                writing_phase: str = "full") -> str:
+    """Build the system prompt for a section writing agent.
+
+    Args:
+        section_id: Section ID (e.g., "2.5.1")
+        section_guidance: Guidance text from .txt file
+        relevant_papers: List of relevant papers
+        related_sections: Dictionary of related 2.5 sections metadata
+        related_sections_tex: Dictionary of already-written LaTeX content from related sections
+        writing_phase: Phase of writing - "outline", "draft", "refine", "review", or "full"
+
+    Returns:
+        System prompt string
+    """
+    # Use enhanced paper formatting with semantic grouping
+    papers_context, citation_keys = format_papers_for_context(
+        relevant_papers, include_key_findings=True
+    )
+
+    # Format related sections for context
+    sections_context = ""
+    if related_sections:
+        sections_context = "\n\nRELATED SECTIONS IN 2.5 FOR CROSS-REFERENCING:\n"
+        sections_context += "=" * 60 + "\n"
+        sections_context += "Cross-reference these sections using \\secref{2.5.X} command.\n"
+        sections_context += "Always add \\label{sec:X_Y_Z} after your section commands.\n\n"
+
+        for related_id, info in related_sections.items():
+            title = info.get("title", related_id)
+            sections_context += f"\n[{related_id}] {title}\n"
+            sections_context += f"    Cross-ref: \\secref{{{related_id}}}\n"
+
+            # Include actual LaTeX content if available (truncated for context length)
+            if related_sections_tex and related_id in related_sections_tex:
+                tex_content = related_sections_tex[related_id]
+                if tex_content:
+                    preview = preview_latex_content(tex_content)
+                    if preview != tex_content:
+                        sections_context += f"    Content preview ({len(tex_content)} chars total):\n"
+                    else:
+                        sections_context += f"    Content:\n"
+                    # Indent the preview
+                    for line in preview.split('\n'):
+                        sections_context += f"      {line}\n"
+            else:
+                sections_context += f"    Status: Not yet written (use forward reference)\n"
+
+        sections_context += "=" * 60 + "\n"
+
+    # Build the complete system prompt: constant prefix, then section-specific content
+    phase_instructions = _PHASE_INSTRUCTIONS.get(writing_phase, _PHASE_INSTRUCTIONS["full"])
+    system_prompt = _SECTION_PROMPT_PREFIX + _SECTION_PROMPT_SUFFIX.format_map({
+        "section_id": section_id,
+        "label_id": section_label_id(section_id),
+        "rule": "=" * 60,
+        "section_guidance": section_guidance,
+        "papers_context": papers_context,
+        "sections_context": sections_context,
+        "phase_instructions": phase_instructions.format(section_id=section_id),
+    })
+
+    return system_prompt
+
+
+def create_section_writer_agent(section_id: str, section_guidance: str,
+                                relevant_papers: List[Dict[str, Any]],
+                                related_sections: Dict[str, Dict[str, str]] = None,
+                                related_sections_tex: Dict[str, str] = None,
+                                output_dir: str = "section2.5_tex",
+                                model: str = "openai:gpt-4o",
+                                temperature: float = 0.3,
+                                writing_phase: str = "full",
+                                system_prompt: Optional[str] = None):
+    """Create an agent for writing a specific section.
+
+    Each section has its own dedicated agent that can reference:
+    - Guidance from .txt files
+    - Relevant papers from Module 5.3
+    - Already-written LaTeX content from other 2.5 sections
+
+    Args:
+        section_id: Section ID (e.g., "2.5.1")
+        section_guidance: Guidance text from .txt file
+        relevant_papers: List of relevant papers
+        related_sections: Dictionary of related 2.5 sections metadata
+        related_sections_tex: Dictionary of already-written LaTeX content from related sections
+        output_dir: Output directory where .tex files are saved
+        model: LLM model to use
+        temperature: Temperature for LLM
+        writing_phase: Phase of writing - "outline", "draft", "refine", "review", or "full"
+        system_prompt: Prebuilt system prompt (default: build_section_writer_prompt())
+    """
+    llm = get_llm(model, round(phase_temperature(writing_phase, temperature), 2))
+
+    if system_prompt is None:
+        system_prompt = build_section_writer_prompt(
+            section_id, section_guidance, relevant_papers,
+            related_sections=related_sections,
+            related_sections_tex=related_sections_tex,
+            writing_phase=writing_phase
+        )
+
     agent = create_agent(
         model=llm,
         tools=[],
@@ -760,8 +1274,30 @@ QUALITY STANDARDS:
     return agent
 
 
-def planning_node(state: SectionWritingState) -> SectionWritingState:
-    """Planning node: Load guidance, identify relevant papers, and load written sections."""
+async def load_written_sections_async(section_ids: List[str], output_dir: str = "section2.5_tex",
+                                      max_chars: int = 3000) -> Dict[str, str]:
+    """Load several already-written sections concurrently, each read in a worker thread.
+
+    Args:
+        section_ids: Section IDs to load
+        output_dir: Output directory where .tex files are saved
+        max_chars: Maximum characters to load per section
+
+    Returns:
+        Dictionary mapping section_id to LaTeX content ("" if not written yet)
+    """
+    contents = await asyncio.gather(*(
+        asyncio.to_thread(load_written_section, section_id, output_dir, max_chars)
+        for section_id in section_ids
+    ))
+    return dict(zip(section_ids, contents))
+
+
+async def planning_node(state: SectionWritingState) -> SectionWritingState:
+    """Planning node: Load guidance, identify relevant papers, and load written sections.
+
+    File reads run in worker threads so concurrent sections don't block the event loop.
+    """
     start_time = datetime.datetime.now()
 
     section_id = state["section_id"]
@@ -775,13 +1311,13 @@ def planning_node(state: SectionWritingState) -> SectionWritingState:
 
     # Load section guidance
     try:
-        section_guidance = load_section_guidance(section_id)
+        section_guidance = await load_section_guidance_async(section_id)
         print(f"✅ Agent {section_id}: Loaded guidance from {section_id}.txt")
     except FileNotFoundError as e:
         print(f"❌ Error: {e}")
         return {
             "section_guidance": "",
-            "messages": state["messages"] + [{
+            "messages": [{
                 "role": "assistant",
                 "content": f"Error loading guidance: {str(e)}"
             }]
@@ -792,7 +1328,7 @@ def planning_node(state: SectionWritingState) -> SectionWritingState:
     print(f"✅ Agent {section_id}: Found {len(relevant_papers)} relevant papers for cross-referencing")
 
     # Get related sections within 2.5 (dependencies)
-    all_sections = get_all_section_info()
+    all_sections = await asyncio.to_thread(get_all_section_info)
     related_sections = get_related_sections(section_id, all_sections)
 
     # Get dependencies for this section
@@ -810,17 +1346,20 @@ def planning_node(state: SectionWritingState) -> SectionWritingState:
 
     if related_sections:
         print(f"\n📂 Agent {section_id}: Checking for already-written sections in {output_dir}/")
-        for related_id in related_sections.keys():
-            # Adjust max_chars based on number of sections to load
-            num_sections = len(related_sections)
-            adjusted_max = max_chars_per_section if num_sections <= 2 else max_chars_per_section // 2
+        # Adjust max_chars based on number of sections to load
+        num_sections = len(related_sections)
+        adjusted_max = max_chars_per_section if num_sections <= 2 else max_chars_per_section // 2
+        written_sections = await load_written_sections_async(
+            list(related_sections.keys()), output_dir, max_chars=adjusted_max
+        )
 
-            written_content = load_written_section(related_id, output_dir, max_chars=adjusted_max)
+        for related_id in related_sections.keys():
+            written_content = written_sections[related_id]
             if written_content:
                 original_length = len(written_content)
                 # Further truncate if we have many sections
                 if len(related_sections_tex) > 0 and total_context_estimate + len(written_content) > 15000:
-                    written_content = summarize_latex_content(written_content, max_chars=1500)
+                    written_content = preview_latex_content(written_content, max_tokens=1500 // 4)
                     print(f"   ✓ Found written content for {related_id} ({len(written_content)}/{original_length} chars, truncated for context)")
                 else:
                     print(f"   ✓ Found written content for {related_id} ({len(written_content)} chars)")
@@ -853,7 +1392,7 @@ def planning_node(state: SectionWritingState) -> SectionWritingState:
         "other_sections": {sid: info.get("title", sid) for sid, info in related_sections.items()},
         "related_sections_tex": related_sections_tex,
         "output_dir": output_dir,
-        "messages": state["messages"] + [{
+        "messages": [{
             "role": "assistant",
             "content": f"Planning complete. Loaded guidance, found {len(relevant_papers)} relevant papers, {len(related_sections)} related sections ({len(related_sections_tex)} with written content)."
         }]
@@ -877,6 +1416,7 @@ def writing_node(state: SectionWritingState, model: str = "openai:gpt-4o",
     related_sections = state.get("other_sections", {})
     related_sections_tex = state.get("related_sections_tex", {})
     output_dir = state.get("output_dir", "section2.5_tex")
+    bypass_llm_cache = state.get("bypass_llm_cache", False)
 
     # Get full related sections info
     all_sections = get_all_section_info()
@@ -889,16 +1429,12 @@ def writing_node(state: SectionWritingState, model: str = "openai:gpt-4o",
     print(f"   - Model: {model}")
     print(f"   - Related sections with content: {len(related_sections_tex)}/{len(related_sections_full)}")
 
-    # Create writing agent (each section has its own agent)
-    agent = create_section_writer_agent(
+    system_prompt = build_section_writer_prompt(
         section_id,
         section_guidance,
         relevant_papers,
         related_sections=related_sections_full,
-        related_sections_tex=related_sections_tex,
-        output_dir=output_dir,
-        model=model,
-        temperature=temperature
+        related_sections_tex=related_sections_tex
     )
 
     # Create prompt for writing
@@ -914,78 +1450,47 @@ Return ONLY the LaTeX code starting with the appropriate sectioning command."""
 
     inputs = {"messages": [{"role": "user", "content": prompt}]}
 
-    # Retry logic with exponential backoff for rate limits
-    max_retries = 5
-    base_delay = 2.0  # Start with 2 seconds
-    result = None
-
-    for attempt in range(max_retries):
-        try:
-            if attempt > 0:
-                print(f"🤖 Agent {section_id}: Retrying... (Attempt {attempt + 1}/{max_retries})\n")
-            else:
-                print(f"🤖 Agent {section_id}: Generating LaTeX content...\n")
-
-            result = agent.invoke(inputs)
-            break  # Success, exit retry loop
-
-        except Exception as e:
-            # Check if it's a rate limit error
-            is_rate_limit = False
-            wait_time = None
-
-            # Check exception and its chain for rate limit errors
-            current_exception = e
-            while current_exception:
-                # Check for OpenAI RateLimitError
-                if RateLimitError and isinstance(current_exception, RateLimitError):
-                    is_rate_limit = True
-                    break
-                # Check exception type name
-                exception_type = type(current_exception).__name__
-                if "RateLimit" in exception_type or "rate_limit" in exception_type.lower():
-                    is_rate_limit = True
-                    break
-                # Check error message
-                error_str = str(current_exception).lower()
-                if "rate limit" in error_str or "429" in error_str or "rate_limit" in error_str:
-                    is_rate_limit = True
-                    # Try to extract wait time from error message
-                    wait_match = re.search(r'(\d+\.?\d*)\s*seconds?', str(current_exception), re.IGNORECASE)
-                    if wait_match:
-                        wait_time = float(wait_match.group(1)) + 1  # Add 1 second buffer
-                    break
-                # Check for context length errors
-                if "context_length" in error_str or "token" in error_str and ("limit" in error_str or "exceeded" in error_str):
-                    print(f"❌ Agent {section_id}: Context length exceeded. Reducing context size...")
-                    # This is handled by truncation functions, but we can retry with reduced context
-                    if attempt < max_retries - 1:
-                        # Reduce context on next attempt
-                        print(f"   Reducing context size for retry...")
-                        # The truncation functions should handle this, but we can break and let it retry
-                    break
-                # Check __cause__ and __context__ for nested exceptions
-                current_exception = getattr(current_exception, '__cause__', None) or getattr(current_exception, '__context__', None)
-                if not current_exception:
-                    break
-
-            if is_rate_limit and attempt < max_retries - 1:
-                # Calculate exponential backoff delay
-                if wait_time:
-                    delay = wait_time
-                else:
-                    delay = base_delay * (2 ** attempt)  # Exponential backoff: 2s, 4s, 8s, 16s, 32s
+    # Reserve the estimated prompt plus output tokens from the shared LLM budget
+    estimated_tokens = estimate_tokens(system_prompt + prompt) + EXPECTED_OUTPUT_TOKENS
+
+    # Reuse the output of an earlier run with identical inputs
+    cache = get_llm_cache(output_dir) if LLMCache.is_cacheable(temperature) else None
+    cache_key = None
+    cached_content = None
+    if cache:
+        cache_key = LLMCache.make_key(
+            model=model,
+            temperature=temperature,
+            section_id=section_id,
+            phase="full",
+            system=_text_hash(system_prompt),
+            prompt=prompt,
+            papers=_papers_signature(relevant_papers),
+            related_tex_hashes={k: _text_hash(v) for k, v in related_sections_tex.items()},
+        )
+        if not bypass_llm_cache:
+            cached_content = cache.get(cache_key)
 
-                print(f"⏳ Agent {section_id}: Rate limit hit. Waiting {delay:.1f}s before retry {attempt + 2}/{max_retries}...")
-                time.sleep(delay)
-                continue
-            else:
-                # Not a rate limit error, or max retries reached
-                raise
+    if cached_content is not None:
+        print(f"♻️  Agent {section_id}: Inputs unchanged, reusing cached LaTeX content\n")
+        result = {"messages": [AIMessage(content=cached_content)]}
+    else:
+        # Create writing agent (each section has its own agent)
+        agent = create_section_writer_agent(
+            section_id,
+            section_guidance,
+            relevant_papers,
+            related_sections=related_sections_full,
+            related_sections_tex=related_sections_tex,
+            output_dir=output_dir,
+            model=model,
+            temperature=temperature,
+            system_prompt=system_prompt
+        )
 
-    # Check if we got a result
-    if result is None:
-        raise Exception(f"Failed to get result after {max_retries} attempts")
+        print(f"🤖 Agent {section_id}: Generating LaTeX content...\n")
+        result = invoke_with_rate_limit(agent, inputs, label=f"Agent {section_id}",
+                                        estimated_tokens=estimated_tokens)
 
     # Extract LaTeX from agent response
     try:
@@ -995,7 +1500,7 @@ Return ONLY the LaTeX code starting with the appropriate sectioning command."""
                 if hasattr(message, 'content') and message.content:
                     content = str(message.content)
                     # Look for LaTeX code blocks
-                    latex_match = re.search(r'```(?:latex)?\s*(.*?)\s*```', content, re.DOTALL)
+                    latex_match = _CODEBLOCK_RE.search(content)
                     if latex_match:
                         latex_content = latex_match.group(1).strip()
                         break
@@ -1010,8 +1515,8 @@ Return ONLY the LaTeX code starting with the appropriate sectioning command."""
                 if hasattr(message, 'content') and message.content:
                     content = str(message.content)
                     # Remove markdown formatting if present
-                    content = re.sub(r'^```(?:latex)?\s*', '', content, flags=re.MULTILINE)
-                    content = re.sub(r'\s*```$', '', content, flags=re.MULTILINE)
+                    content = _MD_FENCE_OPEN_RE.sub('', content)
+                    content = _MD_FENCE_CLOSE_RE.sub('', content)
                     if '\\section' in content or '\\subsection' in content:
                         latex_content = content.strip()
                         break
@@ -1029,6 +1534,9 @@ Return ONLY the LaTeX code starting with the appropriate sectioning command."""
                         latex_content = content.strip()
                         break
 
+        if cache and cached_content is None and latex_content:
+            cache.set(cache_key, latex_content)
+
         write_end = datetime.datetime.now()
         duration = (write_end - write_start).total_seconds()
 
@@ -1044,7 +1552,7 @@ Return ONLY the LaTeX code starting with the appropriate sectioning command."""
 
         return {
             "output_tex": latex_content,
-            "messages": state["messages"] + [{
+            "messages": [{
                 "role": "assistant",
                 "content": f"LaTeX content generated successfully. Length: {len(latex_content)} characters."
             }]
@@ -1056,13 +1564,53 @@ Return ONLY the LaTeX code starting with the appropriate sectioning command."""
 
         return {
             "output_tex": "",
-            "messages": state["messages"] + [{
+            "messages": [{
                 "role": "assistant",
                 "content": f"Error during writing: {str(e)}"
             }]
         }
 
 
+_ENVIRONMENT_RE = re.compile(r'\\(begin|end)\{(\w+)\}')
+
+
+def check_latex_balance(latex_content: str) -> Tuple[List[str], List[str]]:
+    """Check brace and \\begin/\\end environment balance.
+
+    Braces are counted with str.count (a C-level scan each). Environments are
+    matched in one pass with a stack, which also catches \\end{...} closing the
+    wrong environment, not just unequal counts.
+
+    Returns:
+        Tuple of (brace errors, environment errors)
+    """
+    brace_errors = []
+    open_braces = latex_content.count('{')
+    close_braces = latex_content.count('}')
+    if open_braces != close_braces:
+        brace_errors.append(f"Unbalanced braces: {open_braces} open, {close_braces} close")
+
+    environment_errors = []
+    stack = []
+    begin_count = end_count = 0
+    for match in _ENVIRONMENT_RE.finditer(latex_content):
+        kind, environment = match.groups()
+        if kind == "begin":
+            begin_count += 1
+            stack.append(environment)
+        else:
+            end_count += 1
+            if stack and stack[-1] == environment:
+                stack.pop()
+            elif len(environment_errors) < 3:
+                expected = stack[-1] if stack else "nothing"
+                environment_errors.append(f"\\end{{{environment}}} does not match open environment ({expected})")
+    if begin_count != end_count:
+        environment_errors.insert(0, f"Unbalanced environments: {begin_count} \\begin, {end_count} \\end")
+
+    return brace_errors, environment_errors
+
+
 def validate_latex_quality(latex_content: str, section_id: str,
                            expected_citations: int = 3) -> QualityReport:
     """Validate the quality of generated LaTeX content.
@@ -1143,18 +1691,12 @@ def validate_latex_quality(latex_content: str, section_id: str,
         suggestions.append("Add \\label{sec:...} after each section command")
 
     # LaTeX syntax validation
-    # Check for unbalanced braces
-    open_braces = latex_content.count('{')
-    close_braces = latex_content.count('}')
-    if open_braces != close_braces:
-        latex_errors.append(f"Unbalanced braces: {open_braces} open, {close_braces} close")
+    brace_errors, environment_errors = check_latex_balance(latex_content)
+    if brace_errors:
+        latex_errors.extend(brace_errors)
         score -= 20
-
-    # Check for unbalanced environments
-    begin_count = len(re.findall(r'\\begin\{(\w+)\}', latex_content))
-    end_count = len(re.findall(r'\\end\{(\w+)\}', latex_content))
-    if begin_count != end_count:
-        latex_errors.append(f"Unbalanced environments: {begin_count} \\begin, {end_count} \\end")
+    if environment_errors:
+        latex_errors.extend(environment_errors)
         score -= 15
 
     # Check for common LaTeX issues
@@ -1216,17 +1758,88 @@ def validate_latex_quality(latex_content: str, section_id: str,
     )
 
 
+# Module 5.3 sections used to group studies in the writer context
+_MODULE5_SECTION_NAMES = {
+    "5.3.1": "Biopharmaceutic Studies",
+    "5.3.2": "PK Using Human Biomaterials",
+    "5.3.3": "Human PK Studies",
+    "5.3.4": "Human PD Studies",
+    "5.3.5": "Efficacy and Safety Studies",
+    "5.3.6": "Post-marketing Experience",
+}
+
+
+def _module5_section_for_paper(paper: Dict[str, Any]) -> str:
+    """Determine which Module 5.3 section a paper belongs to."""
+    # Use the source section from the paper data if available
+    source_section = paper.get("source_section", "")
+    if source_section:
+        for sec_key in _MODULE5_SECTION_NAMES:
+            if source_section.startswith(sec_key):
+                return sec_key
+        return "5.3.5"  # Default to 5.3.5 if no match
+
+    # Infer from content
+    text = paper.get("title", "").lower() + paper.get("abstract", "").lower()
+    if any(term in text for term in ["bioavailability", "bioequivalence", "dissolution"]):
+        return "5.3.1"
+    elif any(term in text for term in ["pharmacokinetic", "absorption", "distribution", "metabolism", "excretion"]):
+        return "5.3.3"
+    elif any(term in text for term in ["pharmacodynamic", "receptor", "mechanism"]):
+        return "5.3.4"
+    elif any(term in text for term in ["efficacy", "clinical trial", "phase", "randomized", "safety", "adverse"]):
+        return "5.3.5"
+    elif any(term in text for term in ["post-market", "surveillance", "real-world"]):
+        return "5.3.6"
+    return "5.3.5"  # Default
+
+
+def _format_paper_entry(paper: Dict[str, Any], sec_key: str, include_key_findings: bool) -> str:
+    """Format one paper for the context listing (without its [N] index prefix)."""
+    title = paper.get("title", "N/A")
+    authors = paper.get("authors", [])
+    journal = paper.get("journal", "")
+    year = paper.get("year", "")
+    abstract = paper.get("abstract", "")
+    source_section = paper.get("source_section", sec_key)
+
+    entry = f"{title}\n"
+    if authors:
+        author_str = ', '.join(authors[:3])
+        if len(authors) > 3:
+            author_str += ' et al.'
+        entry += f"    Authors: {author_str}\n"
+    if journal and year:
+        entry += f"    Published: {journal} ({year})\n"
+    entry += f"    Module 5 Location: Section {source_section}\n"
+    entry += f"    Reference: \\modref{{{source_section}}}\n"
+
+    # Include abstract summary
+    if abstract and include_key_findings:
+        first_sentence = abstract.split('.')[0] + '.'
+        if len(first_sentence) > 200:
+            first_sentence = abstract[:200] + "..."
+        entry += f"    Key Finding: {first_sentence}\n"
+
+    return entry + "\n"
+
+
 def format_papers_for_context(relevant_papers: List[Dict[str, Any]],
-                               max_papers: int = 15,
-                               include_key_findings: bool = True) -> Tuple[str, List[str]]:
+                               max_papers: Optional[int] = None,
+                               include_key_findings: bool = True,
+                               token_budget: Optional[int] = None) -> Tuple[str, List[str]]:
     """Format papers/studies for agent context with Module 5 section references.
 
-    Groups papers by Module 5.3 section and provides proper reference format.
+    Papers are packed greedily in relevance order until the token budget for the
+    listing is spent, so short entries fill the prompt and long ones can't overrun
+    it. Included papers are grouped by Module 5.3 section with the proper
+    reference format.
 
     Args:
-        relevant_papers: List of paper dictionaries
-        max_papers: Maximum number of papers to include
+        relevant_papers: List of paper dictionaries, most relevant first
+        max_papers: Optional cap on the number of papers to include
         include_key_findings: Whether to extract and include key findings
+        token_budget: Token budget for the paper entries (default: PAPERS_CONTEXT_TOKEN_BUDGET)
 
     Returns:
         Tuple of (formatted context string, list of Module 5 section references)
@@ -1234,109 +1847,65 @@ def format_papers_for_context(relevant_papers: List[Dict[str, Any]],
     if not relevant_papers:
         return "", []
 
+    if token_budget is None:
+        token_budget = PAPERS_CONTEXT_TOKEN_BUDGET
+
+    # Pack papers until the budget (or max_papers) is reached
+    section_groups = {sec_key: [] for sec_key in _MODULE5_SECTION_NAMES}
+    tokens_used = 0
+    included = 0
+    for paper in relevant_papers:
+        if max_papers is not None and included >= max_papers:
+            break
+        sec_key = _module5_section_for_paper(paper)
+        entry = _format_paper_entry(paper, sec_key, include_key_findings)
+        entry_tokens = estimate_tokens(entry) + 2  # [N] prefix
+        # Always include at least one paper
+        if included and tokens_used + entry_tokens > token_budget:
+            break
+        section_groups[sec_key].append(entry)
+        tokens_used += entry_tokens
+        included += 1
+
     section_refs = []
-    papers_context = f"\n\nCLINICAL STUDY DATA FROM MODULE 5 ({min(len(relevant_papers), max_papers)} of {len(relevant_papers)} studies):\n"
-    papers_context += "=" * 60 + "\n"
-    papers_context += """
+    parts = [
+        f"\n\nCLINICAL STUDY DATA FROM MODULE 5 ({included} of {len(relevant_papers)} studies):\n",
+        "=" * 60 + "\n",
+        """
 IMPORTANT: Reference these using \\modref{5.3.X.X} format, NOT \\cite{}!
 For the tabular listing of all studies, use \\modref{5.2}.
-"""
-    papers_context += "=" * 60 + "\n"
-
-    # Group papers by Module 5.3 section
-    section_groups = {
-        "5.3.1": {"name": "Biopharmaceutic Studies", "papers": []},
-        "5.3.2": {"name": "PK Using Human Biomaterials", "papers": []},
-        "5.3.3": {"name": "Human PK Studies", "papers": []},
-        "5.3.4": {"name": "Human PD Studies", "papers": []},
-        "5.3.5": {"name": "Efficacy and Safety Studies", "papers": []},
-        "5.3.6": {"name": "Post-marketing Experience", "papers": []},
-    }
-
-    for paper in relevant_papers[:max_papers]:
-        title = paper.get("title", "").lower()
-        abstract = paper.get("abstract", "").lower()
-        # Get the source section if available
-        source_section = paper.get("source_section", "")
-
-        # Determine which 5.3 section this belongs to
-        if source_section:
-            # Use the source section from the paper data
-            for sec_key in section_groups.keys():
-                if source_section.startswith(sec_key):
-                    section_groups[sec_key]["papers"].append(paper)
-                    break
-            else:
-                # Default to 5.3.5 if no match
-                section_groups["5.3.5"]["papers"].append(paper)
-        else:
-            # Infer from content
-            if any(term in title + abstract for term in ["bioavailability", "bioequivalence", "dissolution"]):
-                section_groups["5.3.1"]["papers"].append(paper)
-            elif any(term in title + abstract for term in ["pharmacokinetic", "absorption", "distribution", "metabolism", "excretion"]):
-                section_groups["5.3.3"]["papers"].append(paper)
-            elif any(term in title + abstract for term in ["pharmacodynamic", "receptor", "mechanism"]):
-                section_groups["5.3.4"]["papers"].append(paper)
-            elif any(term in title + abstract for term in ["efficacy", "clinical trial", "phase", "randomized", "safety", "adverse"]):
-                section_groups["5.3.5"]["papers"].append(paper)
-            elif any(term in title + abstract for term in ["post-market", "surveillance", "real-world"]):
-                section_groups["5.3.6"]["papers"].append(paper)
-            else:
-                section_groups["5.3.5"]["papers"].append(paper)  # Default
+""",
+        "=" * 60 + "\n",
+    ]
 
     idx = 1
-    for sec_key, sec_data in section_groups.items():
-        if not sec_data["papers"]:
+    for sec_key, entries in section_groups.items():
+        if not entries:
             continue
 
-        papers_context += f"\n--- Section {sec_key}: {sec_data['name']} ---\n"
-        papers_context += f"Reference as: \\modref{{{sec_key}}} or \\modref{{{sec_key}.X}} for subsections\n\n"
+        parts.append(f"\n--- Section {sec_key}: {_MODULE5_SECTION_NAMES[sec_key]} ---\n")
+        parts.append(f"Reference as: \\modref{{{sec_key}}} or \\modref{{{sec_key}.X}} for subsections\n\n")
         section_refs.append(sec_key)
 
-        for paper in sec_data["papers"]:
-            title = paper.get("title", "N/A")
-            authors = paper.get("authors", [])
-            journal = paper.get("journal", "")
-            year = paper.get("year", "")
-            abstract = paper.get("abstract", "")
-            source_section = paper.get("source_section", sec_key)
-
-            papers_context += f"[{idx}] {title}\n"
-            if authors:
-                author_str = ', '.join(authors[:3])
-                if len(authors) > 3:
-                    author_str += ' et al.'
-                papers_context += f"    Authors: {author_str}\n"
-            if journal and year:
-                papers_context += f"    Published: {journal} ({year})\n"
-            papers_context += f"    Module 5 Location: Section {source_section}\n"
-            papers_context += f"    Reference: \\modref{{{source_section}}}\n"
-
-            # Include abstract summary
-            if abstract and include_key_findings:
-                first_sentence = abstract.split('.')[0] + '.'
-                if len(first_sentence) > 200:
-                    first_sentence = abstract[:200] + "..."
-                papers_context += f"    Key Finding: {first_sentence}\n"
-
-            papers_context += "\n"
+        for entry in entries:
+            parts.append(f"[{idx}] {entry}")
             idx += 1
 
-    if len(relevant_papers) > max_papers:
-        papers_context += f"\n[... {len(relevant_papers) - max_papers} additional studies available in Module 5 ...]\n"
+    if len(relevant_papers) > included:
+        parts.append(f"\n[... {len(relevant_papers) - included} additional studies available in Module 5 ...]\n")
 
-    papers_context += "=" * 60 + "\n"
-    papers_context += """
+    parts.append("=" * 60 + "\n")
+    parts.append("""
 REMINDER: Use these reference formats:
   - \\modref{5.3.1} - for biopharmaceutic studies
   - \\modref{5.3.5.1} - for specific efficacy study reports
   - \\modref{5.2} - for the tabular listing of all clinical studies
   - \\tableref{X} - for specific study in Table 5.1
   - \\studyref{Study-ID} - for specific study by ID
-"""
-    papers_context += "=" * 60 + "\n"
+""")
+    parts.append("=" * 60 + "\n")
 
-    return papers_context, section_refs
+    return "".join(parts), section_refs
 
 
 def truncate_text(text: str, max_chars: int = 3000, preserve_structure: bool = True) -> str:
@@ -1370,58 +1939,49 @@ def truncate_text(text: str, max_chars: int = 3000, preserve_structure: bool = T
     return truncated + "\n\n[... content truncated for context length ...]"
 
 
-def summarize_latex_content(latex_content: str, max_chars: int = 2000) -> str:
-    """Summarize LaTeX content by extracting key sections.
+def preview_latex_content(latex_content: str, max_tokens: int = SECTION_PREVIEW_TOKENS) -> str:
+    """Trim LaTeX content to a head + tail preview within a token budget.
+
+    Keeps the opening lines (\\section/\\label anchors) and the closing lines
+    (conclusions, forward references) and elides the middle.
 
     Args:
         latex_content: Full LaTeX content
-        max_chars: Maximum characters for summary
+        max_tokens: Maximum tokens for the preview
 
     Returns:
-        Summarized LaTeX content
+        LaTeX content, or its head and tail around an elision marker
     """
-    if len(latex_content) <= max_chars:
-        return latex_content
-
-    # Extract section headers and first few lines of each section
-    lines = latex_content.split('\n')
-    summary_lines = []
-    current_section = None
-    chars_used = 0
-
-    for line in lines:
-        stripped = line.strip()
-
-        # Keep section headers
-        if stripped.startswith('\\section{') or stripped.startswith('\\subsection{') or stripped.startswith('\\subsubsection{'):
-            if chars_used + len(line) > max_chars * 0.9:
-                break
-            summary_lines.append(line)
-            chars_used += len(line) + 1
-            current_section = stripped
-            continue
-
-        # Keep first few non-empty lines of each section
-        if stripped and not stripped.startswith('%'):
-            if chars_used + len(line) > max_chars * 0.9:
-                break
-            summary_lines.append(line)
-            chars_used += len(line) + 1
-            # Limit lines per section
-            if len([l for l in summary_lines if l.strip() and not l.strip().startswith('\\')]) > 10:
-                # Skip remaining content of this section
-                continue
-
-    summary = '\n'.join(summary_lines)
-    if len(latex_content) > len(summary):
-        summary += "\n\n[... remaining content truncated for context length ...]"
+    encoding = _get_token_encoding()
+    half = max_tokens // 2
+    if encoding is not None:
+        tokens = encoding.encode(latex_content, disallowed_special=())
+        total_tokens = len(tokens)
+        if total_tokens <= max_tokens:
+            return latex_content
+        head = encoding.decode(tokens[:half])
+        tail = encoding.decode(tokens[-half:])
+    else:
+        total_tokens = estimate_tokens(latex_content)
+        if total_tokens <= max_tokens:
+            return latex_content
+        head = latex_content[:half * 4]
+        tail = latex_content[-half * 4:]
 
-    return summary
+    # Cut at line boundaries so no partial commands end up in the preview
+    if "\n" in head:
+        head = head[:head.rfind("\n")]
+    if "\n" in tail:
+        tail = tail[tail.find("\n") + 1:]
+    return f"{head}\n% [... {total_tokens - max_tokens} tokens elided ...]\n{tail}"
 
 
 def load_written_section(section_id: str, output_dir: str = "section2.5_tex", max_chars: int = 3000) -> str:
     """Load already-written LaTeX content for a section.
 
+    Results are cached per file modification time and size, so a section that
+    several writers reference is read and trimmed once until it is rewritten.
+
     Args:
         section_id: Section ID (e.g., "2.5.1")
         output_dir: Output directory where .tex files are saved
@@ -1430,90 +1990,153 @@ def load_written_section(section_id: str, output_dir: str = "section2.5_tex", ma
     Returns:
         LaTeX content if file exists, empty string otherwise
     """
+    filepath = os.path.join(output_dir, f"{section_label_id(section_id)}.tex")
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return ""
+    return _load_written_section_cached(section_id, filepath, stat.st_mtime_ns, stat.st_size, max_chars)
+
+
+@lru_cache(maxsize=64)
+def _load_written_section_cached(section_id: str, filepath: str, mtime_ns: int, size: int,
+                                 max_chars: int) -> str:
+    """Read, clean and trim a written section (cached by load_written_section)."""
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except Exception as e:
+        print(f"⚠️  Warning: Could not load written section {section_id}: {e}")
+        return ""
+
+    # Remove comments and metadata, return just the LaTeX content
+    latex_content = _META_COMMENT_RE.sub('', content).strip()
+
+    # Trim to a head + tail preview if too long to manage context length
+    # (max_chars is converted at ~4 characters per token)
+    if len(latex_content) > max_chars:
+        latex_content = preview_latex_content(latex_content, max_tokens=max_chars // 4)
+
+    return latex_content
+
+
+# Output directories already created by this process
+_created_dirs: set = set()
+
+
+def ensure_output_dir(output_dir: str) -> Path:
+    """Create the output directory on first use in this process and return its path."""
     output_path = Path(output_dir)
-    filename = f"{section_id.replace('.', '_')}.tex"
-    filepath = output_path / filename
+    if output_dir not in _created_dirs:
+        output_path.mkdir(parents=True, exist_ok=True)
+        _created_dirs.add(output_dir)
+    return output_path
 
-    if filepath.exists():
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-                # Remove comments and metadata, return just the LaTeX content
-                lines = content.split('\n')
-                latex_lines = []
-                for line in lines:
-                    stripped = line.strip()
-                    if stripped.startswith('%') and 'Generated:' in stripped:
-                        continue
-                    if stripped.startswith('%') and 'Preamble' in stripped:
-                        continue
-                    if stripped.startswith('%') and 'Section' in stripped and 'Generated' in stripped:
-                        continue
-                    if not stripped or stripped == '%':
-                        continue
-                    latex_lines.append(line)
-
-                latex_content = '\n'.join(latex_lines).strip()
-
-                # Truncate if too long to manage context length
-                if len(latex_content) > max_chars:
-                    latex_content = summarize_latex_content(latex_content, max_chars)
-
-                return latex_content
-        except Exception as e:
-            print(f"⚠️  Warning: Could not load written section {section_id}: {e}")
-            return ""
-    return ""
 
+def generation_timestamp() -> str:
+    """Current local time in the format used by "% Generated:" header comments."""
+    return time.strftime('%Y-%m-%d %H:%M:%S')
 
-def save_tex_file(section_id: str, latex_content: str, preamble: str = None,
-                  output_dir: str = "section2.5_tex") -> str:
-    """Save LaTeX content to a file.
+
+def render_tex_file(section_id: str, latex_content: str, preamble: str = None,
+                    generated_at: str = None) -> str:
+    """Build the full .tex file content for a section (header comment + LaTeX).
 
     Args:
         section_id: Section ID (e.g., "2.5.1")
         latex_content: LaTeX content to save
         preamble: Optional preamble content (for 2.5.txt)
-        output_dir: Output directory
+        generated_at: Timestamp for the header comment (default: now)
 
     Returns:
-        Path to saved file
+        File content
     """
-    output_path = Path(output_dir)
-    output_path.mkdir(exist_ok=True)
-
-    # Sanitize section_id for filename
-    filename = f"{section_id.replace('.', '_')}.tex"
-    filepath = output_path / filename
-
+    if generated_at is None:
+        generated_at = generation_timestamp()
     # If this is 2.5.txt (preamble), create a special preamble file
     if section_id == "2.5" and preamble:
-        full_content = f"""% Preamble for Section 2.5: Clinical Overview
-% Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+        return f"""% Preamble for Section 2.5: Clinical Overview
+% Generated: {generated_at}
 
 {preamble}
 
 % This preamble should be included before other sections
 """
-    else:
-        # For regular sections, wrap in a minimal document structure if needed
-        # But since we want separate files, we'll just save the section content
-        full_content = f"""% Section {section_id}
-% Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+    # For regular sections, wrap in a minimal document structure if needed
+    # But since we want separate files, we'll just save the section content
+    return f"""% Section {section_id}
+% Generated: {generated_at}
 
 {latex_content}
 """
 
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(full_content)
+
+def save_tex_file(section_id: str, latex_content: str, preamble: str = None,
+                  output_dir: str = "section2.5_tex", generated_at: str = None) -> str:
+    """Save LaTeX content to a file.
+
+    Args:
+        section_id: Section ID (e.g., "2.5.1")
+        latex_content: LaTeX content to save
+        preamble: Optional preamble content (for 2.5.txt)
+        output_dir: Output directory
+        generated_at: Timestamp for the header comment (default: now)
+
+    Returns:
+        Path to saved file
+    """
+    output_path = ensure_output_dir(output_dir)
+
+    # Sanitize section_id for filename
+    filepath = output_path / f"{section_label_id(section_id)}.tex"
+    filepath.write_text(render_tex_file(section_id, latex_content, preamble, generated_at), encoding='utf-8')
 
     print(f"   💾 Saved to: {filepath}")
     return str(filepath)
 
 
+async def flush_outputs(output_dir: str, sections_tex: Dict[str, str],
+                        generated_at: str = None) -> Dict[str, str]:
+    """Save several sections' .tex files in one batch.
+
+    The output directory is created once, then every file is written with a
+    single write_text call, concurrently in worker threads.
+
+    Args:
+        output_dir: Output directory
+        sections_tex: Dictionary mapping section_id to LaTeX content
+        generated_at: Timestamp for the header comments (default: now)
+
+    Returns:
+        Dictionary mapping section_id to saved file path
+    """
+    if not sections_tex:
+        return {}
+
+    output_path = ensure_output_dir(output_dir)
+
+    if generated_at is None:
+        generated_at = generation_timestamp()
+    paths = {
+        section_id: output_path / f"{section_label_id(section_id)}.tex"
+        for section_id in sections_tex
+    }
+    await asyncio.gather(*(
+        asyncio.to_thread(paths[section_id].write_text,
+                          render_tex_file(section_id, latex_content, generated_at=generated_at),
+                          encoding='utf-8')
+        for section_id, latex_content in sections_tex.items()
+    ))
+
+    for filepath in paths.values():
+        print(f"   💾 Saved to: {filepath}")
+    return {section_id: str(filepath) for section_id, filepath in paths.items()}
+
+
 def generate_main_tex(output_dir: str = "section2.5_tex",
                       drug_name: str = "Drug Product",
-                      sections: List[str] = None) -> str:
+                      sections: List[str] = None,
+                      generated_at: str = None) -> str:
     """Generate the main.tex file that compiles all sections.
 
     This creates a complete LaTeX document with:
@@ -1528,53 +2151,52 @@ def generate_main_tex(output_dir: str = "section2.5_tex",
         output_dir: Output directory for the main.tex file
         drug_name: Name of the drug product for the title
         sections: List of section IDs to include (default: all standard sections)
+        generated_at: Timestamp for the header comment (default: now)
 
     Returns:
         Path to the generated main.tex file
     """
-    output_path = Path(output_dir)
-    output_path.mkdir(exist_ok=True)
+    output_path = ensure_output_dir(output_dir)
 
     # Default sections if not provided
     if sections is None:
-        sections = [
-            "2.5.1", "2.5.2", "2.5.3", "2.5.4", "2.5.5",
-            "2.5.6", "2.5.6.1", "2.5.6.2", "2.5.6.3", "2.5.6.4", "2.5.7"
-        ]
+        sections = _DEFAULT_SECTIONS
 
-    # Check which sections actually exist
-    existing_sections = []
+    # Check which sections actually exist, listing the directory once
+    # (file name stem computed once per section)
+    with os.scandir(output_path) as entries:
+        present = {entry.name for entry in entries if entry.name.endswith('.tex') and entry.is_file()}
+    existing = []
     for section_id in sections:
-        filename = f"{section_id.replace('.', '_')}.tex"
-        if (output_path / filename).exists():
-            existing_sections.append(section_id)
+        stem = section_label_id(section_id)
+        if f"{stem}.tex" in present:
+            existing.append((section_id, stem))
+    existing_sections = [section_id for section_id, _ in existing]
 
-    # Generate section includes
-    section_includes = ""
-    section_titles = {
-        "2.5.1": "Product Development Rationale",
-        "2.5.2": "Overview of Biopharmaceutics",
-        "2.5.3": "Overview of Clinical Pharmacology",
-        "2.5.4": "Overview of Efficacy",
-        "2.5.5": "Overview of Safety",
-        "2.5.6": "Benefits and Risks Conclusions",
-        "2.5.6.1": "Therapeutic Context",
-        "2.5.6.2": "Benefits",
-        "2.5.6.3": "Risks",
-        "2.5.6.4": "Benefit-Risk Assessment",
-        "2.5.7": "Literature References"
-    }
+    # Skip rewriting main.tex if it already includes the same sections for the same drug
+    main_tex_path = output_path / "main.tex"
+    state_path = output_path / ".main_tex_state"
+    main_tex_state = _fast_hash(json.dumps([existing_sections, drug_name]).encode('utf-8'))
+    try:
+        if main_tex_path.exists() and state_path.read_text(encoding='utf-8') == main_tex_state:
+            print(f"   📄 main.tex is up to date: {main_tex_path}")
+            print(f"   📚 Included {len(existing_sections)} sections")
+            return str(main_tex_path)
+    except OSError:
+        pass
 
-    for section_id in existing_sections:
-        filename = section_id.replace('.', '_')
-        title = section_titles.get(section_id, section_id)
-        section_includes += f"""
+    # Generate section includes
+    include_parts = []
+    for section_id, stem in existing:
+        title = _SECTION_TITLES.get(section_id, section_id)
+        include_parts.append(f"""
 % =============================================================================
 % SECTION {section_id} - {title}
 % =============================================================================
-\\input{{{filename}}}
+\\input{{{stem}}}
 \\newpage
-"""
+""")
+    section_includes = "".join(include_parts)
 
     # Generate the main.tex content (simplified - no title page, no TOC, no separate bibliography)
     main_tex_content = f'''% =============================================================================
@@ -1582,7 +2204,7 @@ def generate_main_tex(output_dir: str = "section2.5_tex",
 % Main LaTeX Document
 % =============================================================================
 % Drug Product: {drug_name}
-% Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+% Generated: {generated_at or generation_timestamp()}
 % =============================================================================
 
 \\documentclass[11pt,a4paper]{{article}}
@@ -1669,9 +2291,11 @@ def generate_main_tex(output_dir: str = "section2.5_tex",
 '''
 
     # Save the main.tex file
-    main_tex_path = output_path / "main.tex"
-    with open(main_tex_path, 'w', encoding='utf-8') as f:
-        f.write(main_tex_content)
+    main_tex_path.write_text(main_tex_content, encoding='utf-8')
+    try:
+        state_path.write_text(main_tex_state, encoding='utf-8')
+    except OSError as e:
+        print(f"⚠️  Warning: Could not write {state_path}: {e}")
 
     print(f"   📄 Generated main.tex: {main_tex_path}")
     print(f"   📚 Included {len(existing_sections)} sections")
@@ -1679,11 +2303,22 @@ def generate_main_tex(output_dir: str = "section2.5_tex",
     return str(main_tex_path)
 
 
+def emit_lines(lines: List[str]) -> None:
+    """Write a block of console lines with one write and flush.
+
+    Keeps a phase's report together when several sections run concurrently.
+    """
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
 def validation_node(state: SectionWritingState) -> SectionWritingState:
     """Validation node: Check quality of generated LaTeX content."""
-    print(f"\n{'='*80}")
-    print(f"🔍 VALIDATION PHASE: Checking quality of Section {state['section_id']}")
-    print(f"{'='*80}\n")
+    lines = [
+        f"\n{'='*80}",
+        f"🔍 VALIDATION PHASE: Checking quality of Section {state['section_id']}",
+        f"{'='*80}\n",
+    ]
 
     section_id = state["section_id"]
     latex_content = state.get("output_tex", "")
@@ -1693,30 +2328,39 @@ def validation_node(state: SectionWritingState) -> SectionWritingState:
     # Validate the content
     report = validate_latex_quality(latex_content, section_id, expected_citations)
 
+    # Keep the pre-refinement content if the last refinement made it worse
+    restored = {}
+    previous_content = state.get("draft_tex", "")
+    if (state.get("revision_count", 0) > 0 and previous_content and previous_content != latex_content
+            and report.score < state.get("pre_refine_score", 0)):
+        lines.append(f"↩️  Refinement lowered the score to {report.score:.1f}; keeping the previous version")
+        report = validate_latex_quality(previous_content, section_id, expected_citations)
+        restored = {"output_tex": previous_content}
+
     # Print quality report
-    print(f"📊 Quality Report for Section {section_id}:")
-    print(f"   Score: {report.score:.1f}/100")
-    print(f"   Valid: {'✅ Yes' if report.is_valid else '❌ No'}")
-    print(f"   Word count: {report.word_count}")
-    print(f"   Citations: {report.citation_count}")
-    print(f"   Sections: {report.section_count}")
+    lines += [
+        f"📊 Quality Report for Section {section_id}:",
+        f"   Score: {report.score:.1f}/100",
+        f"   Valid: {'✅ Yes' if report.is_valid else '❌ No'}",
+        f"   Word count: {report.word_count}",
+        f"   Citations: {report.citation_count}",
+        f"   Sections: {report.section_count}",
+    ]
 
     if report.issues:
-        print(f"\n   ⚠️  Issues ({len(report.issues)}):")
-        for issue in report.issues[:5]:
-            print(f"      - {issue}")
+        lines.append(f"\n   ⚠️  Issues ({len(report.issues)}):")
+        lines.extend(f"      - {issue}" for issue in report.issues[:5])
 
     if report.latex_errors:
-        print(f"\n   ❌ LaTeX Errors ({len(report.latex_errors)}):")
-        for error in report.latex_errors[:5]:
-            print(f"      - {error}")
+        lines.append(f"\n   ❌ LaTeX Errors ({len(report.latex_errors)}):")
+        lines.extend(f"      - {error}" for error in report.latex_errors[:5])
 
     if report.suggestions:
-        print(f"\n   💡 Suggestions ({len(report.suggestions)}):")
-        for suggestion in report.suggestions[:3]:
-            print(f"      - {suggestion}")
+        lines.append(f"\n   💡 Suggestions ({len(report.suggestions)}):")
+        lines.extend(f"      - {suggestion}" for suggestion in report.suggestions[:3])
 
-    print(f"\n{'='*80}\n")
+    lines.append(f"\n{'='*80}\n")
+    emit_lines(lines)
 
     # Convert report to dict for state
     report_dict = {
@@ -1731,19 +2375,49 @@ def validation_node(state: SectionWritingState) -> SectionWritingState:
     }
 
     return {
+        **restored,
         "quality_report": report_dict,
-        "messages": state["messages"] + [{
+        "messages": [{
             "role": "assistant",
             "content": f"Validation complete. Score: {report.score:.1f}/100. Valid: {report.is_valid}."
         }]
     }
 
 
+@lru_cache(maxsize=64)
+def _refinement_skeleton(section_id: str) -> Tuple[str, str, str]:
+    """Build the parts of the refinement prompt that only depend on the section.
+
+    Returns (system prompt, text before the current content, closing instructions),
+    so repeated refinement rounds for a section only format the changing feedback.
+    """
+    system_prompt = (f"You are a LaTeX expert improving regulatory documentation for Section {section_id}. "
+                     "Fix all issues and improve quality.")
+    prompt_head = f"Please refine and improve the following LaTeX content for Section {section_id}.\n\nCURRENT CONTENT:\n```latex\n"
+    prompt_tail = """
+
+Please provide the complete, improved LaTeX content. Focus on:
+1. Fixing all identified issues and errors
+2. Improving clarity and flow
+3. Ensuring proper citations and cross-references
+4. Maintaining regulatory writing standards
+
+Return ONLY the improved LaTeX code, starting with the section command."""
+    return system_prompt, prompt_head, prompt_tail
+
+
+def _feedback_list(items: List[str], default: str) -> str:
+    """Format feedback items as a bulleted list, or a single default bullet when empty."""
+    return "\n".join(f"- {item}" for item in items) if items else f"- {default}"
+
+
 def refinement_node(state: SectionWritingState, model: str = "openai:gpt-4o") -> SectionWritingState:
     """Refinement node: Improve content based on validation feedback."""
-    print(f"\n{'='*80}")
-    print(f"✨ REFINEMENT PHASE: Improving Section {state['section_id']}")
-    print(f"{'='*80}\n")
+    lines = [
+        f"\n{'='*80}",
+        f"✨ REFINEMENT PHASE: Improving Section {state['section_id']}",
+        f"{'='*80}\n",
+    ]
 
     section_id = state["section_id"]
     current_content = state.get("output_tex", "")
@@ -1752,102 +2426,117 @@ def refinement_node(state: SectionWritingState, model: str = "openai:gpt-4o") ->
 
     # Check if refinement is needed
     if quality_report.get("is_valid", False) and quality_report.get("score", 0) >= 80:
-        print(f"✅ Content already meets quality standards (score: {quality_report.get('score', 0):.1f})")
-        print(f"   Skipping refinement phase.\n")
+        lines += [
+            f"✅ Content already meets quality standards (score: {quality_report.get('score', 0):.1f})",
+            f"   Skipping refinement phase.\n",
+        ]
+        emit_lines(lines)
         return {"revision_count": revision_count}
 
     # Check max revisions
-    max_revisions = 2
-    if revision_count >= max_revisions:
-        print(f"⚠️  Maximum revisions ({max_revisions}) reached. Proceeding with current content.")
+    if revision_count >= MAX_REVISIONS:
+        lines.append(f"⚠️  Maximum revisions ({MAX_REVISIONS}) reached. Proceeding with current content.")
+        emit_lines(lines)
         return {"revision_count": revision_count}
 
-    print(f"🔄 Revision {revision_count + 1}/{max_revisions}")
-    print(f"   Current score: {quality_report.get('score', 0):.1f}/100")
+    # Remember what this round starts from so validation can detect a regression
+    refine_start = {"pre_refine_score": quality_report.get("score", 0), "draft_tex": current_content}
+    lines += [
+        f"🔄 Revision {revision_count + 1}/{MAX_REVISIONS}",
+        f"   Current score: {quality_report.get('score', 0):.1f}/100",
+    ]
+    emit_lines(lines)
 
     # Build refinement prompt with specific feedback
     issues = quality_report.get("issues", [])
     suggestions = quality_report.get("suggestions", [])
     latex_errors = quality_report.get("latex_errors", [])
 
-    feedback_prompt = f"""Please refine and improve the following LaTeX content for Section {section_id}.
-
-CURRENT CONTENT:
-```latex
-{current_content}
-```
-
-ISSUES TO FIX:
-{chr(10).join(f'- {issue}' for issue in issues) if issues else '- No major issues'}
-
-LATEX ERRORS TO CORRECT:
-{chr(10).join(f'- {error}' for error in latex_errors) if latex_errors else '- No LaTeX errors'}
-
-IMPROVEMENTS TO MAKE:
-{chr(10).join(f'- {suggestion}' for suggestion in suggestions) if suggestions else '- Polish and improve clarity'}
-
-Please provide the complete, improved LaTeX content. Focus on:
-1. Fixing all identified issues and errors
-2. Improving clarity and flow
-3. Ensuring proper citations and cross-references
-4. Maintaining regulatory writing standards
-
-Return ONLY the improved LaTeX code, starting with the section command."""
-
-    # Create refinement agent
-    llm = init_chat_model(model, temperature=0.2)  # Lower temperature for refinement
+    system_prompt, prompt_head, prompt_tail = _refinement_skeleton(section_id)
+    feedback_prompt = "".join([
+        prompt_head,
+        current_content,
+        "\n```\n\nISSUES TO FIX:\n",
+        _feedback_list(issues, "No major issues"),
+        "\n\nLATEX ERRORS TO CORRECT:\n",
+        _feedback_list(latex_errors, "No LaTeX errors"),
+        "\n\nIMPROVEMENTS TO MAKE:\n",
+        _feedback_list(suggestions, "Polish and improve clarity"),
+        prompt_tail,
+    ])
+
+    refine_temperature = 0.2  # Lower temperature for refinement
 
     try:
         # Use direct LLM call for refinement
         messages = [
-            {"role": "system", "content": f"You are a LaTeX expert improving regulatory documentation for Section {section_id}. Fix all issues and improve quality."},
+            {"role": "system", "content": system_prompt},
             {"role": "user", "content": feedback_prompt}
         ]
 
-        response = llm.invoke(messages)
-        refined_content = response.content if hasattr(response, 'content') else str(response)
+        cache = get_llm_cache(state.get("output_dir", "section2.5_tex")) if LLMCache.is_cacheable(refine_temperature) else None
+        cache_key = LLMCache.make_key(model=model, temperature=refine_temperature, section_id=section_id,
+                                      phase="refine", messages=messages) if cache else None
+        refined_content = cache.get(cache_key) if cache and not state.get("bypass_llm_cache", False) else None
+
+        if refined_content is not None:
+            print(f"   ♻️  Reusing cached refinement for unchanged content")
+        else:
+            # Create refinement agent and stream its reply, giving up early on non-LaTeX output
+            llm = get_llm(model, refine_temperature)
+            refined_content = stream_latex_with_rate_limit(
+                llm, messages, label=f"Refine {section_id}",
+                estimated_tokens=estimate_tokens(feedback_prompt) + EXPECTED_OUTPUT_TOKENS
+            )
+            if refined_content is None:
+                print(f"   ⚠️  Refinement output doesn't look like LaTeX. Cancelled it and kept the original.")
+                return {**refine_start, "revision_count": revision_count + 1}
+            if cache:
+                cache.set(cache_key, refined_content)
 
         # Clean up the response
         # Remove markdown code blocks if present
-        refined_content = re.sub(r'^```(?:latex)?\s*', '', refined_content, flags=re.MULTILINE)
-        refined_content = re.sub(r'\s*```$', '', refined_content, flags=re.MULTILINE)
+        refined_content = _MD_FENCE_OPEN_RE.sub('', refined_content)
+        refined_content = _MD_FENCE_CLOSE_RE.sub('', refined_content)
         refined_content = refined_content.strip()
 
         # Validate the refined content is actually LaTeX
         if '\\section' in refined_content or '\\subsection' in refined_content:
             print(f"   ✅ Refinement complete. New length: {len(refined_content)} chars")
             return {
+                **refine_start,
                 "output_tex": refined_content,
                 "revision_count": revision_count + 1,
-                "messages": state["messages"] + [{
+                "messages": [{
                     "role": "assistant",
                     "content": f"Refinement {revision_count + 1} complete. Content improved."
                 }]
             }
         else:
             print(f"   ⚠️  Refined content doesn't appear to be valid LaTeX. Keeping original.")
-            return {"revision_count": revision_count + 1}
+            return {**refine_start, "revision_count": revision_count + 1}
 
     except Exception as e:
         print(f"   ❌ Refinement error: {e}")
-        return {"revision_count": revision_count + 1}
+        return {**refine_start, "revision_count": revision_count + 1}
 
 
 def should_refine(state: SectionWritingState) -> str:
     """Conditional edge: Determine if refinement is needed."""
-    quality_report = state.get("quality_report", {})
     revision_count = state.get("revision_count", 0)
+    if revision_count >= MAX_REVISIONS:
+        return "end"  # Max revisions reached
 
-    # Check if content needs refinement
+    quality_report = state.get("quality_report") or {}
     score = quality_report.get("score", 0)
-    is_valid = quality_report.get("is_valid", False)
-    has_errors = len(quality_report.get("latex_errors", [])) > 0
 
-    # Conditions to refine
-    if revision_count >= 2:
-        return "end"  # Max revisions reached
+    # Stop once a refinement round failed to raise the score (including failed or
+    # rejected refinements); another round on the same feedback rarely helps
+    if revision_count > 0 and score <= state.get("pre_refine_score", -1):
+        return "end"
 
-    if not is_valid or score < 70 or has_errors:
+    # Refine invalid or low-scoring content, or content with LaTeX errors
+    if not quality_report.get("is_valid") or score < 70 or quality_report.get("latex_errors"):
         return "refine"
 
     return "end"
@@ -1908,14 +2597,237 @@ def create_section_writing_graph(model: str = "openai:gpt-4o", temperature: floa
     return graph.compile()
 
 
+def _read_tex_body(output_dir: str, section_id: str) -> str:
+    """Read a saved section .tex file without its "% Generated:" timestamp line ("" if missing)."""
+    filepath = Path(output_dir) / f"{section_label_id(section_id)}.tex"
+    try:
+        content = filepath.read_text(encoding='utf-8')
+    except OSError:
+        return ""
+    return "\n".join(line for line in content.split("\n") if not line.startswith("% Generated:"))
+
+
+def section_input_signature(section_id: str, papers_data: Dict[str, Any], output_dir: str,
+                            settings: Dict[str, Any]) -> Optional[str]:
+    """Hash everything a section's output depends on, for incremental regeneration.
+
+    Covers the guidance text, the relevant paper URLs, the saved content of the
+    related sections and the writer settings. Because related sections are hashed
+    by content, regenerating a dependency with different output makes all of its
+    dependents dirty transitively, level by level.
+
+    Returns:
+        Hex digest of the inputs, or None if the inputs could not be read
+    """
+    try:
+        guidance = load_section_guidance(section_id)
+    except FileNotFoundError:
+        return None
+    relevant_papers = find_relevant_papers(section_id, papers_data)
+    related_sections = get_related_sections(section_id, get_all_section_info())
+    return LLMCache.make_key(
+        section_id=section_id,
+        guidance=_text_hash(guidance),
+        papers=_papers_signature(relevant_papers),
+        related_tex_hashes={rid: _text_hash(_read_tex_body(output_dir, rid)) for rid in related_sections},
+        settings=settings,
+    )
+
+
+def _build_record_path(output_dir: str, section_id: str) -> Path:
+    return Path(output_dir) / ".build" / f"{section_label_id(section_id)}.json"
+
+
+def load_build_record(output_dir: str, section_id: str) -> Optional[Dict[str, Any]]:
+    """Get the build record saved with a section's .tex file, or None if either is missing."""
+    if not (Path(output_dir) / f"{section_label_id(section_id)}.tex").exists():
+        return None
+    try:
+        return json.loads(_build_record_path(output_dir, section_id).read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def save_build_records(output_dir: str, records: Dict[str, Dict[str, Any]]) -> None:
+    """Save build records (input signature, length, quality score) for freshly written sections."""
+    for section_id, record in records.items():
+        path = _build_record_path(output_dir, section_id)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(record), encoding='utf-8')
+        except OSError as e:
+            print(f"⚠️  Warning: Could not write build record {path}: {e}")
+
+
+async def write_section_async(graph, section_id: str, papers_data: Dict[str, Any],
+                              output_dir: str = "section2.5_tex",
+                              bypass_llm_cache: bool = False) -> Dict[str, Any]:
+    """Run the section writing graph for one section.
+
+    The generated LaTeX is returned under "output_tex"; the caller saves it.
+
+    Args:
+        graph: Compiled section writing graph
+        section_id: Section ID to write
+        papers_data: Loaded papers data
+        output_dir: Output directory for .tex files
+        bypass_llm_cache: Call the model instead of reusing cached LLM outputs
+
+    Returns:
+        Result dictionary for the section
+    """
+    try:
+        # Initial state
+        initial_state = {
+            "messages": [{"role": "user", "content": f"Write LaTeX section {section_id}"}],
+            "section_id": section_id,
+            "section_guidance": "",
+            "papers_data": papers_data,
+            "output_tex": "",
+            "cross_references": [],
+            "other_sections": {},
+            "related_sections_tex": {},
+            "output_dir": output_dir,
+            "outline": "",
+            "draft_tex": "",
+            "quality_report": {},
+            "revision_count": 0,
+            "writing_phase": "full",
+            "bypass_llm_cache": bypass_llm_cache
+        }
+
+        # Run the graph
+        result = await graph.ainvoke(initial_state)
+
+        if result.get("output_tex"):
+            print(f"✅ Section {section_id} completed successfully")
+            return {
+                "status": "success",
+                "output_tex": result["output_tex"],
+                "length": len(result["output_tex"]),
+                "quality_score": result.get("quality_report", {}).get("score", 0)
+            }
+
+        print(f"❌ Section {section_id} failed: No content generated")
+        return {"status": "failed", "error": "No content generated"}
+
+    except Exception as e:
+        print(f"❌ Section {section_id} failed: {e}")
+        return {"status": "failed", "error": str(e)}
+
+
+async def write_sections_by_level(graph, levels: List[List[str]], papers_data: Dict[str, Any],
+                                  output_dir: str = "section2.5_tex",
+                                  max_concurrent: int = MAX_CONCURRENT_SECTIONS,
+                                  build_settings: Optional[Dict[str, Any]] = None,
+                                  generated_at: str = None,
+                                  bypass_llm_cache: bool = False) -> Dict[str, Any]:
+    """Write sections level by level, running the sections of each level concurrently.
+
+    Each level's .tex files are saved together once the level finishes, and a
+    level only starts after that, so each section's planning phase can load the
+    already-written .tex files of its dependencies.
+
+    With build_settings, sections whose input signature matches the build record
+    of their existing .tex file are skipped instead of regenerated.
+
+    Args:
+        graph: Compiled section writing graph
+        levels: Dependency levels from dag_levels()
+        papers_data: Loaded papers data
+        output_dir: Output directory for .tex files
+        max_concurrent: Maximum number of sections written at the same time
+        build_settings: Writer settings included in input signatures (None: always regenerate)
+        generated_at: Timestamp for the .tex header comments (default: when each level is saved)
+        bypass_llm_cache: Call the model instead of reusing cached LLM outputs
+
+    Returns:
+        Dictionary with results for each section
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrent))
+    total = sum(len(level) for level in levels)
+    results = {}
+    done = 0
+
+    async def write_one(section_id: str) -> Dict[str, Any]:
+        signature = None
+        if build_settings is not None:
+            signature = await asyncio.to_thread(
+                section_input_signature, section_id, papers_data, output_dir, build_settings
+            )
+            record = await asyncio.to_thread(load_build_record, output_dir, section_id)
+            if signature and record and record.get("signature") == signature:
+                print(f"⏭️  Section {section_id}: inputs unchanged since the last run, keeping existing .tex")
+                return {
+                    "status": "success",
+                    "file": str(Path(output_dir) / f"{section_label_id(section_id)}.tex"),
+                    "length": record.get("length", 0),
+                    "quality_score": record.get("quality_score", 0),
+                    "unchanged": True
+                }
+
+        async with semaphore:
+            result = await write_section_async(graph, section_id, papers_data, output_dir,
+                                               bypass_llm_cache=bypass_llm_cache)
+        if signature:
+            result["signature"] = signature
+        return result
+
+    for level_idx, level in enumerate(levels, 1):
+        emit_lines([
+            f"\n{'='*80}",
+            f"📄 PROCESSING LEVEL {level_idx}/{len(levels)}: {', '.join(level)} "
+            f"(sections {done + 1}-{done + len(level)} of {total})",
+            f"{'='*80}\n",
+        ])
+
+        level_results = await asyncio.gather(*(write_one(section_id) for section_id in level))
+
+        # Save the whole level in one batch before the next level plans
+        level_tex = {
+            section_id: result.pop("output_tex")
+            for section_id, result in zip(level, level_results)
+            if "output_tex" in result
+        }
+        try:
+            saved = await flush_outputs(output_dir, level_tex, generated_at=generated_at)
+        except OSError as e:
+            print(f"❌ Could not save sections {', '.join(level_tex)}: {e}")
+            saved = {}
+        build_records = {}
+        for section_id, result in zip(level, level_results):
+            signature = result.pop("signature", None)
+            if section_id in saved:
+                result["file"] = saved[section_id]
+                if signature:
+                    build_records[section_id] = {
+                        "signature": signature,
+                        "length": result["length"],
+                        "quality_score": result["quality_score"]
+                    }
+            elif section_id in level_tex:
+                result = {"status": "failed", "error": "Could not save .tex file"}
+            results[section_id] = result
+        await asyncio.to_thread(save_build_records, output_dir, build_records)
+        done += len(level)
+
+    return results
+
+
 def write_all_sections(papers_json: str, sections: List[str] = None,
                        model: str = "openai:gpt-4o", output_dir: str = "section2.5_tex",
-                       enable_refinement: bool = True) -> Dict[str, Any]:
+                       enable_refinement: bool = True,
+                       max_concurrent: int = MAX_CONCURRENT_SECTIONS,
+                       force: bool = False,
+                       refresh_llm_cache: bool = False) -> Dict[str, Any]:
     """Write multiple sections in dependency order.
 
-    This function processes sections in topological order based on their
-    dependencies, ensuring that dependent sections have access to already-written
-    content from their dependencies.
+    Sections are grouped into dependency levels; the sections of a level are
+    independent of each other and are written concurrently, while dependent
+    sections still wait for (and can reference) the content of their dependencies.
+    Sections whose inputs are unchanged since their .tex file was written are
+    kept as-is unless force is set; force also skips LLM cache lookups, so every
+    section is regenerated by the model.
 
     Args:
         papers_json: Path to combined papers JSON file
@@ -1923,31 +2835,36 @@ def write_all_sections(papers_json: str, sections: List[str] = None,
         model: LLM model to use
         output_dir: Output directory for .tex files
         enable_refinement: Whether to enable the refinement loop
+        max_concurrent: Maximum number of sections written at the same time
+        force: Regenerate every section with fresh model calls, even if its inputs are unchanged
+        refresh_llm_cache: Make fresh model calls for the sections that are regenerated
 
     Returns:
         Dictionary with results for each section
     """
     # Default sections to write
     if sections is None:
-        sections = [
-            "2.5.1", "2.5.2", "2.5.3", "2.5.4", "2.5.5",
-            "2.5.6", "2.5.6.1", "2.5.6.2", "2.5.6.3", "2.5.6.4", "2.5.7"
-        ]
+        sections = list(_DEFAULT_SECTIONS)
 
     # Load papers data
     papers_data = load_papers_json(papers_json)
 
-    # Sort sections by dependencies
+    # Sort sections by dependencies (document order for main.tex) and group
+    # them into levels of independent sections for concurrent writing
     sorted_sections = topological_sort_sections(sections)
-
-    print("\n" + "="*80)
-    print("🚀 BATCH SECTION WRITING")
-    print("="*80)
-    print(f"📄 Sections to write: {len(sorted_sections)}")
-    print(f"📋 Order: {' → '.join(sorted_sections)}")
-    print(f"🤖 Model: {model}")
-    print(f"📁 Output: {output_dir}/")
-    print("="*80 + "\n")
+    levels = dag_levels(sections)
+
+    emit_lines([
+        "\n" + "="*80,
+        "🚀 BATCH SECTION WRITING",
+        "="*80,
+        f"📄 Sections to write: {len(sorted_sections)}",
+        f"📋 Order: {' → '.join(' | '.join(level) for level in levels)}",
+        f"🤖 Model: {model}",
+        f"⚡ Max concurrent sections: {max_concurrent}",
+        f"📁 Output: {output_dir}/",
+        "="*80 + "\n",
+    ])
 
     # Create the graph
     graph = create_section_writing_graph(
@@ -1955,94 +2872,57 @@ def write_all_sections(papers_json: str, sections: List[str] = None,
         enable_refinement=enable_refinement
     )
 
-    results = {}
-    successful = 0
-    failed = 0
-
-    for idx, section_id in enumerate(sorted_sections, 1):
-        print(f"\n{'='*80}")
-        print(f"📄 PROCESSING SECTION {idx}/{len(sorted_sections)}: {section_id}")
-        print(f"{'='*80}\n")
-
-        try:
-            # Initial state
-            initial_state = {
-                "messages": [{"role": "user", "content": f"Write LaTeX section {section_id}"}],
-                "section_id": section_id,
-                "section_guidance": "",
-                "papers_data": papers_data,
-                "output_tex": "",
-                "cross_references": [],
-                "other_sections": {},
-                "related_sections_tex": {},
-                "output_dir": output_dir,
-                "outline": "",
-                "draft_tex": "",
-                "quality_report": {},
-                "revision_count": 0,
-                "writing_phase": "full"
-            }
-
-            # Run the graph
-            result = graph.invoke(initial_state)
-
-            # Save the file
-            if result.get("output_tex"):
-                output_file = save_tex_file(
-                    section_id,
-                    result["output_tex"],
-                    output_dir=output_dir
-                )
-
-                results[section_id] = {
-                    "status": "success",
-                    "file": output_file,
-                    "length": len(result["output_tex"]),
-                    "quality_score": result.get("quality_report", {}).get("score", 0)
-                }
-                successful += 1
-                print(f"✅ Section {section_id} completed successfully")
-            else:
-                results[section_id] = {"status": "failed", "error": "No content generated"}
-                failed += 1
-                print(f"❌ Section {section_id} failed: No content generated")
+    # Writer settings that change the output; part of each section's input signature
+    build_settings = None if force else {
+        "model": model,
+        "temperature": 0.3,
+        "enable_refinement": enable_refinement
+    }
 
-        except Exception as e:
-            results[section_id] = {"status": "failed", "error": str(e)}
-            failed += 1
-            print(f"❌ Section {section_id} failed: {e}")
+    # One timestamp for every file written by this run
+    generated_at = generation_timestamp()
 
-        # Small delay between sections to avoid rate limits
-        if idx < len(sorted_sections):
-            time.sleep(2)
+    results = asyncio.run(write_sections_by_level(
+        graph, levels, papers_data, output_dir=output_dir, max_concurrent=max_concurrent,
+        build_settings=build_settings, generated_at=generated_at,
+        bypass_llm_cache=force or refresh_llm_cache
+    ))
+    results = {section_id: results[section_id] for section_id in sorted_sections if section_id in results}
+    successful = sum(1 for r in results.values() if r["status"] == "success")
+    failed = len(results) - successful
 
     # Print summary
-    print("\n" + "="*80)
-    print("📊 BATCH PROCESSING COMPLETE")
-    print("="*80)
-    print(f"✅ Successful: {successful}/{len(sorted_sections)}")
-    print(f"❌ Failed: {failed}/{len(sorted_sections)}")
+    lines = [
+        "\n" + "="*80,
+        "📊 BATCH PROCESSING COMPLETE",
+        "="*80,
+        f"✅ Successful: {successful}/{len(sorted_sections)}",
+        f"❌ Failed: {failed}/{len(sorted_sections)}",
+    ]
 
     for section_id, result in results.items():
         status = "✅" if result["status"] == "success" else "❌"
         if result["status"] == "success":
-            print(f"   {status} {section_id}: {result['length']:,} chars, score: {result.get('quality_score', 0):.1f}")
+            unchanged = " (unchanged)" if result.get("unchanged") else ""
+            lines.append(f"   {status} {section_id}: {result['length']:,} chars, score: {result.get('quality_score', 0):.1f}{unchanged}")
         else:
-            print(f"   {status} {section_id}: {result.get('error', 'Unknown error')}")
+            lines.append(f"   {status} {section_id}: {result.get('error', 'Unknown error')}")
 
     # Generate main.tex to compile all sections
-    print("\n" + "="*80)
-    print("📄 GENERATING MAIN.TEX")
-    print("="*80)
+    lines += ["\n" + "="*80, "📄 GENERATING MAIN.TEX", "="*80]
+    emit_lines(lines)
     drug_name = papers_data.get("drug_name", "Drug Product")
     main_tex_path = generate_main_tex(
         output_dir=output_dir,
         drug_name=drug_name,
-        sections=sorted_sections
+        sections=sorted_sections,
+        generated_at=generated_at
     )
-    print(f"\n✅ Main document ready: {main_tex_path}")
-    print(f"   To compile: cd {output_dir} && pdflatex main.tex && pdflatex main.tex")
-    print("="*80 + "\n")
+    emit_lines([
+        f"\n✅ Main document ready: {main_tex_path}",
+        f"   To compile: cd {output_dir} && pdflatex main.tex && pdflatex main.tex",
+        "="*80 + "\n",
+    ])
 
     return results
 
@@ -2071,6 +2951,16 @@ Examples:
 
   # Write specific sections in batch
   python multi_agent_section_writer.py --batch 2.5.1,2.5.2,2.5.3 papers.json
+
+  # Rewrite one section without reusing cached LLM outputs
+  python multi_agent_section_writer.py 2.5.3 papers.json --refresh-llm-cache
+
+LLM cache:
+  Low-temperature LLM outputs are cached under <output-dir>/.llm_cache and reused
+  when a section's inputs are unchanged. --refresh-llm-cache (or --force in
+  --all/--batch mode) makes fresh calls and replaces the cached outputs; deleting
+  the directory clears the cache. LLM_CACHE=0 disables it and
+  LLM_CACHE_MAX_ENTRIES (default: 500) caps the number of cached outputs.
         """
     )
     parser.add_argument("section_id", nargs="?", help="Section ID to write (e.g., 2.5.1, 2.5.2)")
@@ -2093,6 +2983,12 @@ Examples:
                         help="Generate main.tex file only (without writing sections)")
     parser.add_argument("--no-main", action="store_true",
                         help="Skip generating main.tex after writing sections")
+    parser.add_argument("--force", "-f", action="store_true",
+                        help="Regenerate all sections in --all/--batch mode with fresh LLM calls, even if their inputs are unchanged")
+    parser.add_argument("--refresh-llm-cache", action="store_true",
+                        help="Make fresh LLM calls instead of reusing outputs cached in <output-dir>/.llm_cache")
+    parser.add_argument("--max-concurrent", type=int, default=MAX_CONCURRENT_SECTIONS,
+                        help=f"Maximum sections written concurrently in --all/--batch mode (default: {MAX_CONCURRENT_SECTIONS})")
 
     args = parser.parse_args()
 
@@ -2133,7 +3029,10 @@ Examples:
             sections=sections,
             model=args.model,
             output_dir=args.output_dir,
-            enable_refinement=not args.no_refinement
+            enable_refinement=not args.no_refinement,
+            max_concurrent=args.max_concurrent,
+            force=args.force,
+            refresh_llm_cache=args.refresh_llm_cache
         )
 
         # Exit with error code if any failed
@@ -2156,7 +3055,7 @@ Examples:
         sys.exit(1)
 
     # Validate section_id format
-    if not re.match(r'^2\.5(\.\d+)*$', section_id):
+    if not _SECTION_ID_RE.match(section_id):
         print(f"Error: Invalid section ID format: {section_id}")
         print("Expected format: 2.5, 2.5.1, 2.5.2, etc.")
         sys.exit(1)
@@ -2191,28 +3090,31 @@ Examples:
         "draft_tex": "",
         "quality_report": {},
         "revision_count": 0,
-        "writing_phase": "full"
+        "writing_phase": "full",
+        "bypass_llm_cache": args.refresh_llm_cache
     }
 
     # Print startup banner
-    print("\n" + "="*80)
-    print("🚀 MULTI-AGENT SECTION WRITING SYSTEM v2.0")
-    print("="*80)
-    print(f"📄 Section: {section_id}")
-    print(f"💊 Drug: {papers_data.get('drug_name', 'Unknown')}")
-    print(f"🤖 Model: {model}")
-    print(f"🌡️  Temperature: {temperature}")
-    print(f"📁 Output: {output_dir}/")
-    print(f"🔄 Refinement: {'Enabled' if enable_refinement else 'Disabled'}")
-    print("="*80)
-    print("\n📋 Pipeline: Planning → Writing → Validation" +
-          (" → Refinement Loop" if enable_refinement else ""))
-    print("="*80 + "\n")
+    emit_lines([
+        "\n" + "="*80,
+        "🚀 MULTI-AGENT SECTION WRITING SYSTEM v2.0",
+        "="*80,
+        f"📄 Section: {section_id}",
+        f"💊 Drug: {papers_data.get('drug_name', 'Unknown')}",
+        f"🤖 Model: {model}",
+        f"🌡️  Temperature: {temperature}",
+        f"📁 Output: {output_dir}/",
+        f"🔄 Refinement: {'Enabled' if enable_refinement else 'Disabled'}",
+        "="*80,
+        "\n📋 Pipeline: Planning → Writing → Validation" +
+        (" → Refinement Loop" if enable_refinement else ""),
+        "="*80 + "\n",
+    ])
 
     start_time = datetime.datetime.now()
 
-    # Run the graph
-    result = graph.invoke(initial_state)
+    # Run the graph (the planning node is async)
+    result = asyncio.run(graph.ainvoke(initial_state))
 
     end_time = datetime.datetime.now()
     duration = (end_time - start_time).total_seconds()
@@ -2227,43 +3129,50 @@ Examples:
             except Exception as e:
                 print(f"⚠️  Warning: Could not load preamble: {e}")
 
+        generated_at = generation_timestamp()
         output_file = save_tex_file(
             section_id,
             result["output_tex"],
             preamble=preamble,
-            output_dir=output_dir
+            output_dir=output_dir,
+            generated_at=generated_at
         )
 
         # Get quality report if available
         quality_report = result.get("quality_report", {})
         revision_count = result.get("revision_count", 0)
 
-        print("\n" + "="*80)
-        print("✅ FINAL RESULTS")
-        print("="*80)
-        print(f"\n📄 Output file: {output_file}")
-        print(f"📊 Section: {section_id}")
-        print(f"📝 Content length: {len(result['output_tex']):,} characters")
-        print(f"📚 Papers referenced: {len(result.get('cross_references', []))}")
+        lines = [
+            "\n" + "="*80,
+            "✅ FINAL RESULTS",
+            "="*80,
+            f"\n📄 Output file: {output_file}",
+            f"📊 Section: {section_id}",
+            f"📝 Content length: {len(result['output_tex']):,} characters",
+            f"📚 Papers referenced: {len(result.get('cross_references', []))}",
+        ]
 
         if quality_report:
-            print(f"\n🎯 Quality Metrics:")
-            print(f"   Score: {quality_report.get('score', 0):.1f}/100")
-            print(f"   Valid: {'✅' if quality_report.get('is_valid', False) else '❌'}")
-            print(f"   Word count: {quality_report.get('word_count', 0):,}")
-            print(f"   Citations: {quality_report.get('citation_count', 0)}")
-            print(f"   Sections: {quality_report.get('section_count', 0)}")
-            print(f"   Revisions: {revision_count}")
-
-        print(f"\n⏱️  Total time: {duration:.1f}s")
-        print("="*80 + "\n")
+            lines += [
+                f"\n🎯 Quality Metrics:",
+                f"   Score: {quality_report.get('score', 0):.1f}/100",
+                f"   Valid: {'✅' if quality_report.get('is_valid', False) else '❌'}",
+                f"   Word count: {quality_report.get('word_count', 0):,}",
+                f"   Citations: {quality_report.get('citation_count', 0)}",
+                f"   Sections: {quality_report.get('section_count', 0)}",
+                f"   Revisions: {revision_count}",
+            ]
+
+        lines += [f"\n⏱️  Total time: {duration:.1f}s", "="*80 + "\n"]
+        emit_lines(lines)
 
         # Generate main.tex unless --no-main is specified
         if not args.no_main:
             print("📄 Updating main.tex...")
             main_tex_path = generate_main_tex(
                 output_dir=output_dir,
-                drug_name=papers_data.get("drug_name", "Drug Product")
+                drug_name=papers_data.get("drug_name", "Drug Product"),
+                generated_at=generated_at
             )
             print(f"\n📋 To compile the full document:")
             print(f"   cd {output_dir}")
@@ -2271,12 +3180,14 @@ Examples:
             print(f"   pdflatex main.tex  # Run twice for cross-references")
             print("="*80 + "\n")
     else:
-        print("\n" + "="*80)
-        print("❌ ERROR")
-        print("="*80)
-        print("No LaTeX content was generated. Please check the error messages above.")
-        print(f"⏱️  Time elapsed: {duration:.1f}s")
-        print("="*80 + "\n")
+        emit_lines([
+            "\n" + "="*80,
+            "❌ ERROR",
+            "="*80,
+            "No LaTeX content was generated. Please check the error messages above.",
+            f"⏱️  Time elapsed: {duration:.1f}s",
+            "="*80 + "\n",
+        ])
         sys.exit(1)
 
 
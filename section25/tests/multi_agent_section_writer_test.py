@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for multi_agent_section_writer streaming helpers.
+"""
+
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+# Add parent directory to path so we can import the section writer
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from multi_agent_section_writer import content_text, stream_latex_with_rate_limit
+
+
+class FakeStreamingLLM:
+    """Chat model stand-in whose stream() yields chunks with the given contents."""
+
+    def __init__(self, contents):
+        self.contents = contents
+
+    def stream(self, inputs):
+        for content in self.contents:
+            yield SimpleNamespace(content=content)
+
+
+class TestContentText(unittest.TestCase):
+    def test_string_content(self):
+        self.assertEqual(content_text("\\section{A}"), "\\section{A}")
+
+    def test_block_list_content(self):
+        content = [
+            {"type": "text", "text": "\\section{A}"},
+            {"type": "tool_use", "id": "call_1", "input": {}},
+            " body",
+        ]
+        self.assertEqual(content_text(content), "\\section{A} body")
+
+    def test_empty_content(self):
+        self.assertEqual(content_text([]), "")
+        self.assertEqual(content_text(None), "")
+
+
+class TestStreamLatexWithRateLimit(unittest.TestCase):
+    def test_list_content_chunks(self):
+        llm = FakeStreamingLLM([
+            [{"type": "text", "text": "\\sec", "index": 0}],
+            [{"type": "text", "text": "tion{Overview}\n", "index": 0}],
+            [],
+            [{"type": "text", "text": "Body text.", "index": 0}],
+        ])
+        result = stream_latex_with_rate_limit(llm, [], label="test", estimated_tokens=1)
+        self.assertEqual(result, "\\section{Overview}\nBody text.")
+
+    def test_string_content_chunks(self):
+        llm = FakeStreamingLLM(["\\subsection{A}", " text"])
+        result = stream_latex_with_rate_limit(llm, [], label="test", estimated_tokens=1)
+        self.assertEqual(result, "\\subsection{A} text")
+
+    def test_cancels_non_latex_reply(self):
+        llm = FakeStreamingLLM([[{"type": "text", "text": "plain prose " * 10}]] * 10)
+        result = stream_latex_with_rate_limit(llm, [], label="test", estimated_tokens=1, probe_tokens=50)
+        self.assertIsNone(result)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,14 +9,15 @@ Features:
 - Self-review and critique loop for continuous improvement
 - Enhanced regulatory writing standards with ICH guidelines
 - Rate limit handling with exponential backoff retries
-- Context length management (truncates/summarizes long content)
-- Sequential processing by dependencies
+- Context length management (token-budgeted truncation/summaries of long content)
+- Parallel processing of independent sections, level by level in dependency order
 - Cross-referencing between sections and papers
 - Semantic chunking for better paper context management
 """
 
 import os
 import json
+import hashlib
 import re
 import datetime
 import asyncio
@@ -24,6 +25,7 @@ import time
 from typing import List, Dict, Any, TypedDict, Annotated, Optional, Tuple
 from pathlib import Path
 from dataclasses import dataclass
+from functools import lru_cache
 from langchain.agents import create_agent
 from langchain_core.tools import tool
 from langchain.chat_models import init_chat_model
@@ -37,6 +39,38 @@ try:
 except ImportError:
     RateLimitError = None
 
+# Exception types retried with backoff in writing_node
+_RATE_LIMIT_TYPES = (RateLimitError,) if RateLimitError else ()
+# Rate limit errors of other providers, matched on the exception type name or message
+_RATE_LIMIT_RE = re.compile(r'rate.?limit|429', re.IGNORECASE)
+_WAIT_SECONDS_RE = re.compile(r'(\d+\.?\d*)\s*seconds?', re.IGNORECASE)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an exception from a model call is a rate limit error, for any provider."""
+    return (isinstance(error, _RATE_LIMIT_TYPES)
+            or bool(_RATE_LIMIT_RE.search(type(error).__name__))
+            or bool(_RATE_LIMIT_RE.search(str(error))))
+
+# The OpenAI client is only needed for --batch-api runs
+try:
+    from openai import OpenAI
+except ImportError:
+    OpenAI = None
+
+# Try to import orjson for faster JSON encoding and parsing
+try:
+    import orjson
+except ImportError:
+    # Fall back to the stdlib json module if orjson is not available
+    orjson = None
+
+# tiktoken is optional; token counts fall back to ~4 characters per token
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
 
 # Quality metrics thresholds
 QUALITY_THRESHOLDS = {
@@ -47,6 +81,55 @@ QUALITY_THRESHOLDS = {
     "required_elements": ["\\section", "\\label"],  # Required LaTeX elements
 }
 
+# Context window of the writer model, and tokens kept free for its output and the fixed prompt text
+MODEL_CONTEXT_TOKENS = int(os.getenv("MODEL_CONTEXT_TOKENS", "128000"))
+RESERVED_OUTPUT_TOKENS = 8000
+# Upper bound on already-written content loaded per related section
+MAX_RELATED_SECTION_TOKENS = 750
+# Responses longer than this are truncated when no LaTeX could be extracted
+MAX_RESPONSE_TOKENS = 12500
+
+# Section headers kept by summarize_latex_content, and content lines kept per section
+_SECTION_HEADER_PREFIXES = ('\\section{', '\\subsection{', '\\subsubsection{')
+MAX_SUMMARY_LINES_PER_SECTION = 10
+
+# Maximum number of independent sections written at the same time
+MAX_CONCURRENT_SECTIONS = int(os.getenv("MAX_CONCURRENT_SECTIONS", "4"))
+
+# Seconds between status checks of an OpenAI batch job
+BATCH_POLL_INTERVAL = float(os.getenv("BATCH_POLL_INTERVAL", "30"))
+
+# Patterns used to extract LaTeX from agent responses
+_CODEBLOCK_RE = re.compile(r'```(?:latex)?\s*(.*?)\s*```', re.DOTALL)
+_STRIP_OPEN_RE = re.compile(r'^```(?:latex)?\s*', re.MULTILINE)
+_STRIP_CLOSE_RE = re.compile(r'\s*```$', re.MULTILINE)
+
+# Blank lines, bare "%" lines and generated metadata comments, dropped by load_written_section
+_META_COMMENT_RE = re.compile(
+    r'^[^\S\n]*(?:%(?=[^\n]*(?:Generated:|Preamble|Section[^\n]*Generated|Generated[^\n]*Section))[^\n]*'
+    r'|%[^\S\n]*)?$\n?',
+    re.MULTILINE
+)
+
+# Patterns used by validate_latex_quality; _COMMAND_RE counts citations, section
+# commands and environment begins/ends in one scan (see m.lastgroup)
+_COMMAND_RE = re.compile(
+    r'\\(?:(?P<cite>cite)\{[^}]+\}'
+    r'|(?P<section>(?:sub){0,2}section)\{[^}]+\}'
+    r'|(?P<begin>begin)\{\w+\}'
+    r'|(?P<end>end)\{\w+\})'
+)
+# Lowercase promotional terms, matched against the lowercased content
+_PROMOTIONAL_WORDS = ("breakthrough", "revolutionary", "best", "guaranteed", "miracle")
+_REQUIRED_ELEMENTS = tuple(QUALITY_THRESHOLDS["required_elements"])
+_UNESCAPED_RE = re.compile(r'(?<!\\)([%&$#_])')
+_PERCENT_RE = re.compile(r'(?<!\$)\d+%(?!\$)')
+_LONG_WORD_RE = re.compile(r'\b\w{30,}\b')
+_ABBR_RE = re.compile(r'\b[A-Z]{2,6}\b')
+_ABBR_DEF_RE = re.compile(r'\(([A-Z]{2,6})\)')
+# Common abbreviations that need no definition
+_ALLOWED_ABBREVIATIONS = frozenset({"ICH", "FDA", "EMA", "PMID", "N/A"})
+
 # Regulatory writing standards
 REGULATORY_WRITING_GUIDELINES = """
 REGULATORY WRITING STANDARDS (ICH M4E Compliance):
@@ -100,6 +183,18 @@ A tabular listing of all biopharmaceutic studies is provided, together with narr
 """
 
 
+# User prompt sent to each section writer
+WRITER_USER_PROMPT = """Write the LaTeX content for Section {section_id} based on the guidance provided.
+
+Ensure that:
+1. All key points from the guidance are addressed
+2. Relevant papers are cross-referenced appropriately
+3. The LaTeX is properly formatted and structured
+4. The content is comprehensive and suitable for regulatory submission
+
+Return ONLY the LaTeX code starting with the appropriate sectioning command."""
+
+
 @dataclass
 class QualityReport:
     """Quality assessment report for generated LaTeX content."""
@@ -123,7 +218,7 @@ class SectionWritingState(TypedDict):
     output_tex: str  # Generated LaTeX content
     cross_references: List[Dict[str, str]]  # List of cross-referenced papers
     other_sections: Dict[str, str]  # Other 2.7 sections for cross-referencing {section_id: title}
-    related_sections_tex: Dict[str, str]  # Already-written LaTeX content from related sections
+    related_section_budgets: Dict[str, int]  # Token budget of each already-written related section (content loaded on demand)
     output_dir: str  # Output directory where .tex files are saved
     # New fields for enhanced pipeline
     outline: str  # Section outline before full writing
@@ -133,8 +228,46 @@ class SectionWritingState(TypedDict):
     writing_phase: str  # Current phase: outline, draft, refine, validate
 
 
+@lru_cache(maxsize=1)
+def _get_token_encoding():
+    """Get the tiktoken encoding used for token counts (None if unavailable)."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def json_dumps_bytes(obj: Any) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def json_loads(data) -> Any:
+    """Parse JSON from str or bytes, using orjson when available.
+
+    Raises:
+        ValueError: If data is not valid JSON (both json and orjson decode errors subclass it)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in text (tiktoken if available, else ~4 chars/token)."""
+    encoding = _get_token_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+
+@lru_cache(maxsize=None)
 def load_section_guidance(section_id: str, base_path: str = "section2.7") -> str:
-    """Load guidance text for a specific section.
+    """Load guidance text for a specific section (cached; the guidance files are static).
 
     Args:
         section_id: Section ID (e.g., "2.7.1", "2.7.2", "2.7.4.1")
@@ -202,9 +335,12 @@ def load_preamble(base_path: str = "section2.7") -> str:
         return f.read()
 
 
+@lru_cache(maxsize=None)
 def get_all_section_info(base_path: str = "section2.7") -> Dict[str, Dict[str, str]]:
     """Get information about all sections in 2.7.
 
+    The result is cached; callers share the returned dictionary and must not modify it.
+
     Args:
         base_path: Base path to section2.7 folder
 
@@ -277,9 +413,12 @@ def get_all_section_info(base_path: str = "section2.7") -> Dict[str, Dict[str, s
     return sections_info
 
 
+@lru_cache(maxsize=1)
 def get_section_dependencies() -> Dict[str, List[str]]:
     """Get dependency graph for sections - which sections depend on which.
 
+    The result is cached; callers share the returned dictionary and must not modify it.
+
     Returns:
         Dictionary mapping section_id to list of sections it depends on
     """
@@ -336,7 +475,7 @@ def get_related_sections(section_id: str, all_sections: Dict[str, Dict[str, str]
 
     # Get dependencies (sections this section depends on)
     dependencies = get_section_dependencies()
-    related_ids = dependencies.get(section_id, [])
+    related_ids = list(dependencies.get(section_id, []))
 
     # Also include parent sections if this is a nested section
     parts = section_id.split('.')
@@ -405,6 +544,51 @@ def topological_sort_sections(sections: List[str]) -> List[str]:
     return result
 
 
+def dag_levels(sections: List[str]) -> List[List[str]]:
+    """Group sections into dependency levels.
+
+    Every section in a level depends only on sections from earlier levels, so
+    the sections within one level can be written concurrently.
+
+    Args:
+        sections: List of section IDs to group
+
+    Returns:
+        List of levels, each a sorted list of section IDs
+    """
+    dependencies = get_section_dependencies()
+
+    # In-degrees and dependents, counting only dependencies that are being written
+    in_degree = {section: 0 for section in sections}
+    dependents = {section: [] for section in sections}
+    for section in in_degree:
+        for dep in set(dependencies.get(section, [])):
+            if dep in in_degree:
+                in_degree[section] += 1
+                dependents[dep].append(section)
+
+    levels = []
+    level = sorted(section for section, degree in in_degree.items() if degree == 0)
+    while level:
+        levels.append(level)
+        next_level = []
+        for section in level:
+            for dependent in dependents[section]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    next_level.append(dependent)
+        level = sorted(next_level)
+
+    # Check for circular dependencies
+    remaining = [s for s, degree in in_degree.items() if degree > 0]
+    if remaining:
+        print(f"⚠️  Warning: Possible circular dependencies or missing dependencies for: {remaining}")
+        # Add remaining sections as a final level
+        levels.append(remaining)
+
+    return levels
+
+
 def load_papers_json(json_path: str) -> Dict[str, Any]:
     """Load papers data from JSON file.
 
@@ -414,8 +598,119 @@ def load_papers_json(json_path: str) -> Dict[str, Any]:
     Returns:
         Papers data dictionary
     """
-    with open(json_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    with open(json_path, 'rb') as f:
+        return json_loads(f.read())
+
+
+# Keywords for inferring a paper's Module 5.3 section, in priority order
+_SECTION_KEYWORDS = {
+    "5.3.1": ["bioavailability", "bioequivalence", "dissolution"],
+    "5.3.3": ["pharmacokinetic", "absorption", "distribution", "metabolism", "excretion"],
+    "5.3.4": ["pharmacodynamic", "receptor", "mechanism"],
+    "5.3.5": ["efficacy", "clinical trial", "phase", "randomized", "safety", "adverse"],
+    "5.3.6": ["post-market", "surveillance", "real-world"],
+}
+_KEYWORD_SECTIONS = {term: sec_key for sec_key, terms in _SECTION_KEYWORDS.items() for term in terms}
+# Zero-width lookahead so keywords that overlap in the text are all found
+_SECTION_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(term) for term in _KEYWORD_SECTIONS) + "))"
+)
+
+# Map section 2.7.x to corresponding 5.3.x sections
+# Base mappings for main sections
+_BASE_SECTION_MAPPING = {
+    "2.7.1": ["5.3.1", "5.3.1.1", "5.3.1.2", "5.3.1.3", "5.3.1.4"],  # Biopharmaceutics
+    "2.7.2": ["5.3.2", "5.3.2.1", "5.3.2.2", "5.3.2.3", "5.3.3", "5.3.3.1",
+              "5.3.3.2", "5.3.3.3", "5.3.3.4", "5.3.3.5", "5.3.4", "5.3.4.1", "5.3.4.2"],  # Clinical Pharmacology
+    "2.7.3": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4"],  # Clinical Efficacy
+    "2.7.4": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4", "5.3.6"],  # Clinical Safety
+    "2.7.5": [],  # References section - all papers are relevant
+    "2.7.6": []  # Synopses - all papers are relevant
+}
+
+# Handle nested sections - map to specific 5.3.x sections
+_NESTED_SECTION_MAPPING = {
+    # 2.7.1.x - Biopharmaceutics subsections
+    "2.7.1.1": ["5.3.1", "5.3.1.1", "5.3.1.2"],
+    "2.7.1.2": ["5.3.1", "5.3.1.1", "5.3.1.2", "5.3.1.3", "5.3.1.4"],
+    "2.7.1.3": ["5.3.1", "5.3.1.1", "5.3.1.2", "5.3.1.3", "5.3.1.4"],
+    "2.7.1.4": ["5.3.1", "5.3.1.1", "5.3.1.2", "5.3.1.3", "5.3.1.4"],
+    # 2.7.2.x - Clinical Pharmacology subsections
+    "2.7.2.1": ["5.3.2", "5.3.2.1", "5.3.2.2", "5.3.2.3", "5.3.3", "5.3.3.1", "5.3.4", "5.3.4.1"],
+    "2.7.2.2": ["5.3.2", "5.3.2.1", "5.3.2.2", "5.3.2.3", "5.3.3", "5.3.3.1", "5.3.3.2", "5.3.3.3", "5.3.3.4", "5.3.3.5", "5.3.4", "5.3.4.1", "5.3.4.2"],
+    "2.7.2.3": ["5.3.2", "5.3.2.1", "5.3.2.2", "5.3.2.3", "5.3.3", "5.3.3.1", "5.3.3.2", "5.3.3.3", "5.3.3.4", "5.3.3.5", "5.3.4", "5.3.4.1", "5.3.4.2"],
+    "2.7.2.4": ["5.3.2", "5.3.3", "5.3.4"],  # Special studies (immunogenicity, etc.)
+    "2.7.2.5": ["5.3.2", "5.3.3", "5.3.4"],
+    # 2.7.3.x - Clinical Efficacy subsections
+    "2.7.3.1": ["5.3.5", "5.3.5.1"],
+    "2.7.3.2": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4"],
+    "2.7.3.3": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4"],
+    "2.7.3.4": ["5.3.3", "5.3.3.5", "5.3.5", "5.3.5.1", "5.3.5.2"],  # Dosing - includes PK/PD
+    "2.7.3.5": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4"],
+    "2.7.3.6": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4"],
+    # 2.7.4.x - Clinical Safety subsections
+    "2.7.4.1": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4", "5.3.6"],
+    "2.7.4.2": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4", "5.3.6"],
+    "2.7.4.3": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4"],
+    "2.7.4.4": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4"],
+    "2.7.4.5": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4", "5.3.6"],
+    "2.7.4.6": ["5.3.6"],
+    "2.7.4.7": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4", "5.3.6"],
+}
+
+
+@dataclass
+class PaperStore:
+    """Papers of a papers data dict, stored as parallel lists indexed by position.
+
+    Papers are kept in file order; by_section and also_relevant map a 5.3
+    section to the positions of the papers listed under it and of the papers
+    marked "also_relevant_to" it.
+    """
+    papers: List[Dict[str, Any]]
+    urls: List[Optional[str]]
+    by_section: Dict[str, List[int]]
+    also_relevant: Dict[str, List[int]]
+
+    @classmethod
+    def from_papers_data(cls, papers_data: Dict[str, Any]) -> "PaperStore":
+        papers = []
+        urls = []
+        by_section = {}
+        also_relevant = {}
+        for section_key, section_data in papers_data.get("sections", {}).items():
+            positions = by_section.setdefault(section_key, [])
+            for paper in section_data.get("papers", []):
+                position = len(papers)
+                positions.append(position)
+                for mapped_section in set(paper.get("also_relevant_to", [])):
+                    also_relevant.setdefault(mapped_section, []).append(position)
+                papers.append(paper)
+                urls.append(paper.get("url"))
+        return cls(papers=papers, urls=urls, by_section=by_section, also_relevant=also_relevant)
+
+
+# Paper stores built so far, by id() of the papers data; the dict itself is kept to detect id reuse
+_paper_stores: Dict[int, Tuple[Dict[str, Any], PaperStore]] = {}
+MAX_PAPER_STORES = 4
+
+
+def get_paper_store(papers_data: Dict[str, Any]) -> PaperStore:
+    """Get the paper store for a papers data dict, building it on first use.
+
+    The papers data must not be modified after the store is built. The table is
+    cleared once it holds MAX_PAPER_STORES entries, so papers data from earlier
+    runs is not kept alive.
+    """
+    cached = _paper_stores.get(id(papers_data))
+    if cached is not None and cached[0] is papers_data:
+        return cached[1]
+
+    store = PaperStore.from_papers_data(papers_data)
+    if len(_paper_stores) >= MAX_PAPER_STORES:
+        _paper_stores.clear()
+    _paper_stores[id(papers_data)] = (papers_data, store)
+    return store
 
 
 def find_relevant_papers(section_id: str, papers_data: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -428,111 +723,59 @@ def find_relevant_papers(section_id: str, papers_data: Dict[str, Any]) -> List[D
     Returns:
         List of relevant papers
     """
-    relevant_papers = []
-    sections = papers_data.get("sections", {})
-
-    # Map section 2.7.x to corresponding 5.3.x sections
-    # Base mappings for main sections
-    base_section_mapping = {
-        "2.7.1": ["5.3.1", "5.3.1.1", "5.3.1.2", "5.3.1.3", "5.3.1.4"],  # Biopharmaceutics
-        "2.7.2": ["5.3.2", "5.3.2.1", "5.3.2.2", "5.3.2.3", "5.3.3", "5.3.3.1",
-                  "5.3.3.2", "5.3.3.3", "5.3.3.4", "5.3.3.5", "5.3.4", "5.3.4.1", "5.3.4.2"],  # Clinical Pharmacology
-        "2.7.3": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4"],  # Clinical Efficacy
-        "2.7.4": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4", "5.3.6"],  # Clinical Safety
-        "2.7.5": [],  # References section - all papers are relevant
-        "2.7.6": []  # Synopses - all papers are relevant
-    }
-
-    # Handle nested sections - map to specific 5.3.x sections
-    nested_section_mapping = {
-        # 2.7.1.x - Biopharmaceutics subsections
-        "2.7.1.1": ["5.3.1", "5.3.1.1", "5.3.1.2"],
-        "2.7.1.2": ["5.3.1", "5.3.1.1", "5.3.1.2", "5.3.1.3", "5.3.1.4"],
-        "2.7.1.3": ["5.3.1", "5.3.1.1", "5.3.1.2", "5.3.1.3", "5.3.1.4"],
-        "2.7.1.4": ["5.3.1", "5.3.1.1", "5.3.1.2", "5.3.1.3", "5.3.1.4"],
-        # 2.7.2.x - Clinical Pharmacology subsections
-        "2.7.2.1": ["5.3.2", "5.3.2.1", "5.3.2.2", "5.3.2.3", "5.3.3", "5.3.3.1", "5.3.4", "5.3.4.1"],
-        "2.7.2.2": ["5.3.2", "5.3.2.1", "5.3.2.2", "5.3.2.3", "5.3.3", "5.3.3.1", "5.3.3.2", "5.3.3.3", "5.3.3.4", "5.3.3.5", "5.3.4", "5.3.4.1", "5.3.4.2"],
-        "2.7.2.3": ["5.3.2", "5.3.2.1", "5.3.2.2", "5.3.2.3", "5.3.3", "5.3.3.1", "5.3.3.2", "5.3.3.3", "5.3.3.4", "5.3.3.5", "5.3.4", "5.3.4.1", "5.3.4.2"],
-        "2.7.2.4": ["5.3.2", "5.3.3", "5.3.4"],  # Special studies (immunogenicity, etc.)
-        "2.7.2.5": ["5.3.2", "5.3.3", "5.3.4"],
-        # 2.7.3.x - Clinical Efficacy subsections
-        "2.7.3.1": ["5.3.5", "5.3.5.1"],
-        "2.7.3.2": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4"],
-        "2.7.3.3": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4"],
-        "2.7.3.4": ["5.3.3", "5.3.3.5", "5.3.5", "5.3.5.1", "5.3.5.2"],  # Dosing - includes PK/PD
-        "2.7.3.5": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4"],
-        "2.7.3.6": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4"],
-        # 2.7.4.x - Clinical Safety subsections
-        "2.7.4.1": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4", "5.3.6"],
-        "2.7.4.2": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4", "5.3.6"],
-        "2.7.4.3": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4"],
-        "2.7.4.4": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4"],
-        "2.7.4.5": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4", "5.3.6"],
-        "2.7.4.6": ["5.3.6"],
-        "2.7.4.7": ["5.3.5", "5.3.5.1", "5.3.5.2", "5.3.5.3", "5.3.5.4", "5.3.6"],
-    }
+    store = get_paper_store(papers_data)
 
     # Determine mapped sections
-    if section_id in nested_section_mapping:
-        mapped_sections = nested_section_mapping[section_id]
-    elif section_id in base_section_mapping:
-        mapped_sections = base_section_mapping[section_id]
+    if section_id in _NESTED_SECTION_MAPPING:
+        mapped_sections = _NESTED_SECTION_MAPPING[section_id]
+    elif section_id in _BASE_SECTION_MAPPING:
+        mapped_sections = _BASE_SECTION_MAPPING[section_id]
     else:
         # For unknown sections, try to infer from parent
         # e.g., 2.7.4.1.1 -> use 2.7.4.1 mapping
         parts = section_id.split('.')
         if len(parts) > 3:
             parent_id = '.'.join(parts[:-1])
-            mapped_sections = nested_section_mapping.get(parent_id, base_section_mapping.get(parent_id, []))
+            mapped_sections = _NESTED_SECTION_MAPPING.get(parent_id, _BASE_SECTION_MAPPING.get(parent_id, []))
         else:
             mapped_sections = []
 
+    urls = store.urls
+    selected = []
+    seen_urls = set()
+
+    def add_positions(positions) -> None:
+        # Avoid duplicates by URL
+        for position in positions:
+            url = urls[position]
+            if url not in seen_urls:
+                seen_urls.add(url)
+                selected.append(position)
+
     # Collect papers from mapped sections
     for mapped_section in mapped_sections:
-        if mapped_section in sections:
-            section_papers = sections[mapped_section].get("papers", [])
-            for paper in section_papers:
-                # Avoid duplicates by URL
-                if not any(p.get("url") == paper.get("url") for p in relevant_papers):
-                    relevant_papers.append(paper)
+        add_positions(store.by_section.get(mapped_section, []))
 
     # Also check for papers marked as "also_relevant_to" in parent sections
-    # This helps with cross-referencing
-    for section_key, section_data in sections.items():
-        section_papers = section_data.get("papers", [])
-        for paper in section_papers:
-            also_relevant = paper.get("also_relevant_to", [])
-            # Check if any mapped section is in also_relevant_to
-            if any(mapped in also_relevant for mapped in mapped_sections):
-                if not any(p.get("url") == paper.get("url") for p in relevant_papers):
-                    relevant_papers.append(paper)
+    # This helps with cross-referencing (kept in file order)
+    positions = set()
+    for mapped_section in mapped_sections:
+        positions.update(store.also_relevant.get(mapped_section, []))
+    add_positions(sorted(positions))
 
     # For 2.7.5 (References) and 2.7.6 (Synopses), include all papers
     if section_id in ["2.7.5", "2.7.6"]:
-        for section_key, section_data in sections.items():
-            section_papers = section_data.get("papers", [])
-            for paper in section_papers:
-                if not any(p.get("url") == paper.get("url") for p in relevant_papers):
-                    relevant_papers.append(paper)
+        add_positions(range(len(urls)))
 
-    return relevant_papers
+    return [store.papers[position] for position in selected]
 
 
-def create_section_writer_agent(section_id: str, section_guidance: str,
+def build_section_writer_prompt(section_id: str, section_guidance: str,
                                 relevant_papers: List[Dict[str, Any]],
                                 related_sections: Dict[str, Dict[str, str]] = None,
                                 related_sections_tex: Dict[str, str] = None,
-                                output_dir: str = "section2.7_tex",
-                                model: str = "openai:gpt-4o",
-                                temperature: float = 0.3,
-                                writing_phase: str = "full"):
-    """Create an agent for writing a specific section.
-
-    Each section has its own dedicated agent that can reference:
-    - Guidance from .txt files
-    - Relevant papers from Module 5.3
-    - Already-written LaTeX content from other 2.7 sections
+                                writing_phase: str = "full") -> str:
+    """Build the system prompt for a section writer.
 
     Args:
         section_id: Section ID (e.g., "2.7.1")
@@ -540,25 +783,13 @@ def create_section_writer_agent(section_id: str, section_guidance: str,
         relevant_papers: List of relevant papers
         related_sections: Dictionary of related 2.7 sections metadata
         related_sections_tex: Dictionary of already-written LaTeX content from related sections
-        output_dir: Output directory where .tex files are saved
-        model: LLM model to use
-        temperature: Temperature for LLM
         writing_phase: Phase of writing - "outline", "draft", "refine", "review", or "full"
-    """
-    # Use lower temperature for refinement, higher for initial drafting
-    if writing_phase == "outline":
-        temperature = 0.4  # More creative for structure planning
-    elif writing_phase == "draft":
-        temperature = 0.3  # Balanced for content generation
-    elif writing_phase == "refine":
-        temperature = 0.2  # More focused for refinement
-    elif writing_phase == "review":
-        temperature = 0.1  # Very focused for critique
-
-    llm = init_chat_model(model, temperature=temperature)
 
+    Returns:
+        System prompt text
+    """
     # Use enhanced paper formatting with semantic grouping
-    papers_context, citation_keys = format_papers_for_context(
+    papers_context, citation_keys = get_papers_context(
         relevant_papers, max_papers=15, include_key_findings=True
     )
 
@@ -570,7 +801,11 @@ def create_section_writer_agent(section_id: str, section_guidance: str,
         sections_context += "Cross-reference these sections using \\secref{2.7.X} command.\n"
         sections_context += "Always add \\label{sec:X_Y_Z} after your section commands.\n\n"
 
+        dependencies = get_section_dependencies().get(section_id, [])
         for related_id, info in related_sections.items():
+            # Unwritten sections are only listed if this section depends on them
+            if not (related_sections_tex and related_sections_tex.get(related_id)) and related_id not in dependencies:
+                continue
             title = info.get("title", related_id)
             description = info.get("description", "")[:150] + "..." if len(info.get("description", "")) > 150 else info.get("description", "")
             label_id = related_id.replace('.', '_')
@@ -581,9 +816,9 @@ def create_section_writer_agent(section_id: str, section_guidance: str,
             if related_sections_tex and related_id in related_sections_tex:
                 tex_content = related_sections_tex[related_id]
                 if tex_content:
-                    max_tex_preview = 2000
-                    if len(tex_content) > max_tex_preview:
-                        preview = summarize_latex_content(tex_content, max_tex_preview)
+                    max_tex_preview = 500  # tokens
+                    if estimate_tokens(tex_content) > max_tex_preview:
+                        preview = summarize_latex_content(tex_content, max_tokens=max_tex_preview)
                         sections_context += f"    Content preview ({len(tex_content)} chars total):\n"
                         # Indent the preview
                         for line in preview.split('\n')[:10]:
@@ -833,6 +1068,55 @@ QUALITY STANDARDS:
 ✓ No promotional language
 ✓ Proper abbreviation definitions"""
 
+    return system_prompt
+
+
+def create_section_writer_agent(section_id: str, section_guidance: str,
+                                relevant_papers: List[Dict[str, Any]],
+                                related_sections: Dict[str, Dict[str, str]] = None,
+                                related_sections_tex: Dict[str, str] = None,
+                                output_dir: str = "section2.7_tex",
+                                model: str = "openai:gpt-4o",
+                                temperature: float = 0.3,
+                                writing_phase: str = "full"):
+    """Create an agent for writing a specific section.
+
+    Each section has its own dedicated agent that can reference:
+    - Guidance from .txt files
+    - Relevant papers from Module 5.3
+    - Already-written LaTeX content from other 2.7 sections
+
+    Args:
+        section_id: Section ID (e.g., "2.7.1")
+        section_guidance: Guidance text from .txt file
+        relevant_papers: List of relevant papers
+        related_sections: Dictionary of related 2.7 sections metadata
+        related_sections_tex: Dictionary of already-written LaTeX content from related sections
+        output_dir: Output directory where .tex files are saved
+        model: LLM model to use
+        temperature: Temperature for LLM
+        writing_phase: Phase of writing - "outline", "draft", "refine", "review", or "full"
+    """
+    # Use lower temperature for refinement, higher for initial drafting
+    if writing_phase == "outline":
+        temperature = 0.4  # More creative for structure planning
+    elif writing_phase == "draft":
+        temperature = 0.3  # Balanced for content generation
+    elif writing_phase == "refine":
+        temperature = 0.2  # More focused for refinement
+    elif writing_phase == "review":
+        temperature = 0.1  # Very focused for critique
+
+    llm = init_chat_model(model, temperature=temperature)
+    system_prompt = build_section_writer_prompt(
+        section_id,
+        section_guidance,
+        relevant_papers,
+        related_sections=related_sections,
+        related_sections_tex=related_sections_tex,
+        writing_phase=writing_phase
+    )
+
     agent = create_agent(
         model=llm,
         tools=[],
@@ -885,44 +1169,51 @@ def planning_node(state: SectionWritingState) -> SectionWritingState:
     if section_deps:
         print(f"   Dependencies: {', '.join(section_deps)}")
 
-    # Load already-written LaTeX content from related sections (with context length management)
-    related_sections_tex = {}
-    max_chars_per_section = 3000  # Limit per section to manage total context length
-    total_context_estimate = len(section_guidance) + len(str(relevant_papers))
+    # Find already-written related sections and their token budgets (with context length management)
+    related_section_budgets = {}
+    papers_context, _ = get_papers_context(relevant_papers)
+    total_context_tokens = estimate_tokens(section_guidance) + estimate_tokens(papers_context)
 
     if related_sections:
+        available_tokens = max(0, MODEL_CONTEXT_TOKENS - RESERVED_OUTPUT_TOKENS - total_context_tokens)
+
         print(f"\n📂 Agent {section_id}: Checking for already-written sections in {output_dir}/")
+        dir_index = scan_output_dir(output_dir)
+        written_tokens = {}
         for related_id in related_sections.keys():
-            # Adjust max_chars based on number of sections to load
-            num_sections = len(related_sections)
-            adjusted_max = max_chars_per_section if num_sections <= 2 else max_chars_per_section // 2
-
-            written_content = load_written_section(related_id, output_dir, max_chars=adjusted_max)
+            written_content = load_written_section(related_id, output_dir, max_tokens=MAX_RELATED_SECTION_TOKENS,
+                                                   dir_index=dir_index)
             if written_content:
-                original_length = len(written_content)
-                # Further truncate if we have many sections
-                if len(related_sections_tex) > 0 and total_context_estimate + len(written_content) > 15000:
-                    written_content = summarize_latex_content(written_content, max_chars=1500)
-                    print(f"   ✓ Found written content for {related_id} ({len(written_content)}/{original_length} chars, truncated for context)")
+                written_tokens[related_id] = estimate_tokens(written_content)
+
+        # Fit the written content into what is left of the context window by
+        # capping only the largest sections
+        token_caps = budget_token_caps(written_tokens, available_tokens)
+        for related_id in related_sections.keys():
+            if related_id in token_caps:
+                if token_caps[related_id] < written_tokens[related_id]:
+                    related_section_budgets[related_id] = token_caps[related_id]
+                    content_tokens = estimate_tokens(load_written_section(
+                        related_id, output_dir, max_tokens=token_caps[related_id], dir_index=dir_index
+                    ))
                 else:
-                    print(f"   ✓ Found written content for {related_id} ({len(written_content)} chars)")
-                related_sections_tex[related_id] = written_content
-                total_context_estimate += len(written_content)
+                    related_section_budgets[related_id] = MAX_RELATED_SECTION_TOKENS
+                    content_tokens = written_tokens[related_id]
+                print(f"   ✓ Found written content for {related_id} ({content_tokens:,} tokens)")
+                total_context_tokens += content_tokens
             else:
                 status = "⚠️  MISSING DEPENDENCY" if related_id in section_deps else "○"
                 print(f"   {status} Section {related_id} not yet written (will use metadata only)")
                 if related_id in section_deps:
                     print(f"      ⚠️  Warning: {section_id} depends on {related_id} but it's not written yet!")
 
-        print(f"\n   📊 Context size estimate: ~{total_context_estimate:,} characters")
-        if total_context_estimate > 20000:
-            print(f"   ⚠️  Warning: Large context size may cause issues. Content has been truncated.")
+        print(f"\n   📊 Context size estimate: ~{total_context_tokens:,} tokens")
 
     if related_sections:
         print(f"\n   Related sections:")
         for related_id in related_sections.keys():
             title = related_sections[related_id].get('title', 'N/A')
-            has_content = "✓" if related_id in related_sections_tex else "○"
+            has_content = "✓" if related_id in related_section_budgets else "○"
             print(f"   {has_content} {related_id}: {title}")
 
     print(f"\n{'='*80}")
@@ -933,11 +1224,11 @@ def planning_node(state: SectionWritingState) -> SectionWritingState:
         "section_guidance": section_guidance,
         "cross_references": relevant_papers,
         "other_sections": {sid: info.get("title", sid) for sid, info in related_sections.items()},
-        "related_sections_tex": related_sections_tex,
+        "related_section_budgets": related_section_budgets,
         "output_dir": output_dir,
         "messages": state["messages"] + [{
             "role": "assistant",
-            "content": f"Planning complete. Loaded guidance, found {len(relevant_papers)} relevant papers, {len(related_sections)} related sections ({len(related_sections_tex)} with written content)."
+            "content": f"Planning complete. Loaded guidance, found {len(relevant_papers)} relevant papers, {len(related_sections)} related sections ({len(related_section_budgets)} with written content)."
         }]
     }
 
@@ -945,20 +1236,20 @@ def planning_node(state: SectionWritingState) -> SectionWritingState:
 def writing_node(state: SectionWritingState, model: str = "openai:gpt-4o",
                  temperature: float = 0.3) -> SectionWritingState:
     """Writing node: Generate LaTeX content for the section."""
-    write_start = datetime.datetime.now()
+    write_start_ns = time.perf_counter_ns()
 
     print(f"\n{'='*80}")
     print(f"✍️  WRITING PHASE: Generating LaTeX for Section {state['section_id']}")
     print(f"{'='*80}")
-    print(f"⏰ Started at: {write_start.strftime('%Y-%m-%d %H:%M:%S')}\n")
+    print(f"⏰ Started at: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
 
     section_id = state["section_id"]
     section_guidance = state["section_guidance"]
     relevant_papers = state["cross_references"]
     papers_data = state["papers_data"]
     related_sections = state.get("other_sections", {})
-    related_sections_tex = state.get("related_sections_tex", {})
     output_dir = state.get("output_dir", "section2.7_tex")
+    related_sections_tex = load_related_sections_tex(state.get("related_section_budgets", {}), output_dir)
 
     # Get full related sections info
     all_sections = get_all_section_info()
@@ -984,22 +1275,14 @@ def writing_node(state: SectionWritingState, model: str = "openai:gpt-4o",
     )
 
     # Create prompt for writing
-    prompt = f"""Write the LaTeX content for Section {section_id} based on the guidance provided.
-
-Ensure that:
-1. All key points from the guidance are addressed
-2. Relevant papers are cross-referenced appropriately
-3. The LaTeX is properly formatted and structured
-4. The content is comprehensive and suitable for regulatory submission
-
-Return ONLY the LaTeX code starting with the appropriate sectioning command."""
+    prompt = WRITER_USER_PROMPT.format(section_id=section_id)
 
     inputs = {"messages": [{"role": "user", "content": prompt}]}
 
     # Retry logic with exponential backoff for rate limits
     max_retries = 5
     base_delay = 2.0  # Start with 2 seconds
-    result = None
+    response = None
 
     for attempt in range(max_retries):
         try:
@@ -1008,111 +1291,53 @@ Return ONLY the LaTeX code starting with the appropriate sectioning command."""
             else:
                 print(f"🤖 Agent {section_id}: Generating LaTeX content...\n")
 
-            result = agent.invoke(inputs)
+            # Stream the response, extracting the LaTeX block as tokens arrive
+            extractor = LatexStreamExtractor()
+            for chunk, _metadata in agent.stream(inputs, stream_mode="messages"):
+                text = content_text(chunk.content) if isinstance(chunk, AIMessage) else ""
+                if text:
+                    if extractor.feed(text):
+                        break  # Code block closed, no need to wait for the rest
+            response = extractor
             break  # Success, exit retry loop
 
         except Exception as e:
-            # Check if it's a rate limit error
-            is_rate_limit = False
-            wait_time = None
-
-            # Check exception and its chain for rate limit errors
-            current_exception = e
-            while current_exception:
-                # Check for OpenAI RateLimitError
-                if RateLimitError and isinstance(current_exception, RateLimitError):
-                    is_rate_limit = True
-                    break
-                # Check exception type name
-                exception_type = type(current_exception).__name__
-                if "RateLimit" in exception_type or "rate_limit" in exception_type.lower():
-                    is_rate_limit = True
-                    break
-                # Check error message
-                error_str = str(current_exception).lower()
-                if "rate limit" in error_str or "429" in error_str or "rate_limit" in error_str:
-                    is_rate_limit = True
-                    # Try to extract wait time from error message
-                    wait_match = re.search(r'(\d+\.?\d*)\s*seconds?', str(current_exception), re.IGNORECASE)
-                    if wait_match:
-                        wait_time = float(wait_match.group(1)) + 1  # Add 1 second buffer
-                    break
-                # Check for context length errors
-                if "context_length" in error_str or "token" in error_str and ("limit" in error_str or "exceeded" in error_str):
-                    print(f"❌ Agent {section_id}: Context length exceeded. Reducing context size...")
-                    # This is handled by truncation functions, but we can retry with reduced context
-                    if attempt < max_retries - 1:
-                        # Reduce context on next attempt
-                        print(f"   Reducing context size for retry...")
-                        # The truncation functions should handle this, but we can break and let it retry
-                    break
-                # Check __cause__ and __context__ for nested exceptions
-                current_exception = getattr(current_exception, '__cause__', None) or getattr(current_exception, '__context__', None)
-                if not current_exception:
-                    break
-
-            if is_rate_limit and attempt < max_retries - 1:
-                # Calculate exponential backoff delay
-                if wait_time:
-                    delay = wait_time
+            # Library rate limit errors surface as the outermost exception, for any provider
+            if is_rate_limit_error(e) and attempt < max_retries - 1:
+                # Use the server-suggested wait time if given, else exponential backoff: 2s, 4s, 8s, 16s
+                wait_match = _WAIT_SECONDS_RE.search(str(e))
+                if wait_match:
+                    delay = float(wait_match.group(1)) + 1  # Add 1 second buffer
                 else:
-                    delay = base_delay * (2 ** attempt)  # Exponential backoff: 2s, 4s, 8s, 16s, 32s
+                    delay = base_delay * (2 ** attempt)
 
                 print(f"⏳ Agent {section_id}: Rate limit hit. Waiting {delay:.1f}s before retry {attempt + 2}/{max_retries}...")
                 time.sleep(delay)
                 continue
-            else:
-                # Not a rate limit error, or max retries reached
-                raise
+            # Not a rate limit error, or max retries reached
+            raise
 
     # Check if we got a result
-    if result is None:
+    if response is None:
         raise Exception(f"Failed to get result after {max_retries} attempts")
 
     # Extract LaTeX from agent response
     try:
-        latex_content = ""
-        if result and "messages" in result:
-            for message in reversed(result["messages"]):
-                if hasattr(message, 'content') and message.content:
-                    content = str(message.content)
-                    # Look for LaTeX code blocks
-                    latex_match = re.search(r'```(?:latex)?\s*(.*?)\s*```', content, re.DOTALL)
-                    if latex_match:
-                        latex_content = latex_match.group(1).strip()
-                        break
-                    # If no code block, check if content looks like LaTeX
-                    if '\\section' in content or '\\subsection' in content:
-                        latex_content = content.strip()
-                        break
-
-        if not latex_content:
-            # Try to extract LaTeX from the last assistant message
-            for message in reversed(result["messages"]):
-                if hasattr(message, 'content') and message.content:
-                    content = str(message.content)
-                    # Remove markdown formatting if present
-                    content = re.sub(r'^```(?:latex)?\s*', '', content, flags=re.MULTILINE)
-                    content = re.sub(r'\s*```$', '', content, flags=re.MULTILINE)
-                    if '\\section' in content or '\\subsection' in content:
-                        latex_content = content.strip()
-                        break
+        latex_content = response.latex
+        if not latex_content and response.text:
+            # No fenced code block; fall back to bare LaTeX in the response
+            latex_content = extract_latex_from_contents([response.text])
 
         if not latex_content:
             print("⚠️  Warning: Could not extract LaTeX from agent response. Using raw content.")
-            if result and "messages" in result:
-                for message in reversed(result["messages"]):
-                    if hasattr(message, 'content') and message.content:
-                        content = str(message.content)
-                        # Check if content is too long (context length issue)
-                        if len(content) > 50000:
-                            print(f"⚠️  Warning: Response is very long ({len(content)} chars). Truncating...")
-                            content = truncate_text(content, max_chars=50000)
-                        latex_content = content.strip()
-                        break
-
-        write_end = datetime.datetime.now()
-        duration = (write_end - write_start).total_seconds()
+            content = response.text
+            # Check if content is too long (context length issue)
+            if estimate_tokens(content) > MAX_RESPONSE_TOKENS:
+                print(f"⚠️  Warning: Response is very long ({len(content)} chars). Truncating...")
+                content = truncate_text(content, max_tokens=MAX_RESPONSE_TOKENS)
+            latex_content = content.strip()
+
+        duration = (time.perf_counter_ns() - write_start_ns) / 1e9
 
         print(f"\n{'='*80}")
         print(f"✅ WRITING COMPLETE - Agent {section_id}")
@@ -1145,6 +1370,121 @@ Return ONLY the LaTeX code starting with the appropriate sectioning command."""
         }
 
 
+def content_text(content: Any) -> str:
+    """Text of a message or chunk content, given as a string or a list of content blocks."""
+    if isinstance(content, str):
+        return content
+    parts = []
+    for block in content or ():
+        if isinstance(block, str):
+            parts.append(block)
+        elif isinstance(block, dict) and block.get("type") == "text":
+            parts.append(block.get("text", ""))
+    return "".join(parts)
+
+
+class LatexStreamExtractor:
+    """Incrementally extract the first ```latex code block from a streamed response.
+
+    Chunks are fed as they arrive and move the extractor through the states
+    SCAN_FENCE -> IN_LATEX -> DONE. Only a short tail is held back between
+    chunks so that a fence split across two chunks is still detected. The
+    result matches _CODEBLOCK_RE on the full response.
+    """
+
+    SCAN_FENCE = "scan_fence"
+    IN_LATEX = "in_latex"
+    DONE = "done"
+
+    _FENCE = "```"
+    _LANGUAGE = "latex"
+
+    def __init__(self):
+        self.state = self.SCAN_FENCE
+        self._raw_parts: List[str] = []
+        self._latex_parts: List[str] = []
+        self._tail = ""  # Unconsumed text that may hold a partial fence
+
+    def feed(self, chunk: str) -> bool:
+        """Consume a chunk of response text. Returns True once the code block is closed."""
+        self._raw_parts.append(chunk)
+        if self.state == self.DONE:
+            return True
+
+        text = self._tail + chunk
+        if self.state == self.SCAN_FENCE:
+            start = text.find(self._FENCE)
+            if start == -1:
+                self._tail = text[-(len(self._FENCE) - 1):]
+                return False
+            after_fence = text[start + len(self._FENCE):]
+            if len(after_fence) < len(self._LANGUAGE) and self._LANGUAGE.startswith(after_fence):
+                # Can't tell yet whether a language tag follows the fence
+                self._tail = text[start:]
+                return False
+            if after_fence.startswith(self._LANGUAGE):
+                after_fence = after_fence[len(self._LANGUAGE):]
+            self.state = self.IN_LATEX
+            text = after_fence
+
+        end = text.find(self._FENCE)
+        if end == -1:
+            keep = len(self._FENCE) - 1
+            if len(text) > keep:
+                self._latex_parts.append(text[:-keep])
+                text = text[-keep:]
+            self._tail = text
+            return False
+
+        self._latex_parts.append(text[:end])
+        self._tail = ""
+        self.state = self.DONE
+        return True
+
+    @property
+    def latex(self) -> str:
+        """Content of the closed code block, or an empty string if none was seen."""
+        if self.state != self.DONE:
+            return ""
+        return "".join(self._latex_parts).strip()
+
+    @property
+    def text(self) -> str:
+        """Raw response text received so far."""
+        return "".join(self._raw_parts)
+
+
+def extract_latex_from_contents(contents: List[str]) -> str:
+    """Extract LaTeX from response message contents, preferring the latest message.
+
+    Looks for a LaTeX code block or content with sectioning commands first, then
+    for sectioning commands after stripping stray markdown fences.
+
+    Args:
+        contents: Message contents in conversation order
+
+    Returns:
+        Extracted LaTeX, or an empty string if none was found
+    """
+    for content in reversed(contents):
+        # Look for LaTeX code blocks
+        latex_match = _CODEBLOCK_RE.search(content)
+        if latex_match:
+            return latex_match.group(1).strip()
+        # If no code block, check if content looks like LaTeX
+        if '\\section' in content or '\\subsection' in content:
+            return content.strip()
+
+    for content in reversed(contents):
+        # Remove markdown formatting if present
+        content = _STRIP_OPEN_RE.sub('', content)
+        content = _STRIP_CLOSE_RE.sub('', content)
+        if '\\section' in content or '\\subsection' in content:
+            return content.strip()
+
+    return ""
+
+
 def validate_latex_quality(latex_content: str, section_id: str,
                            expected_citations: int = 3) -> QualityReport:
     """Validate the quality of generated LaTeX content.
@@ -1191,32 +1531,32 @@ def validate_latex_quality(latex_content: str, section_id: str,
         issues.append(f"Content too long ({content_length} chars), may cause context issues")
         score -= 10
 
-    # Count citations
-    citation_pattern = r'\\cite\{[^}]+\}'
-    citations = re.findall(citation_pattern, latex_content)
-    citation_count = len(citations)
+    # Count citations, section commands and environments in one pass
+    command_counts = {"cite": 0, "section": 0, "begin": 0, "end": 0}
+    for match in _COMMAND_RE.finditer(latex_content):
+        command_counts[match.lastgroup] += 1
+    citation_count = command_counts["cite"]
+    section_count = command_counts["section"]
+    begin_count = command_counts["begin"]
+    end_count = command_counts["end"]
 
     if citation_count < expected_citations:
         issues.append(f"Low citation count ({citation_count}, expected at least {expected_citations})")
         score -= 15
         suggestions.append("Add more citations to support scientific claims")
 
-    # Count section commands
-    section_pattern = r'\\(section|subsection|subsubsection)\{[^}]+\}'
-    sections = re.findall(section_pattern, latex_content)
-    section_count = len(sections)
-
+    # Check section structure
     if section_count < QUALITY_THRESHOLDS["min_sections"]:
         issues.append(f"Missing section structure (found {section_count} sections)")
         score -= 15
         suggestions.append("Add proper section and subsection structure")
 
     # Check for required elements
-    for element in QUALITY_THRESHOLDS["required_elements"]:
-        if element not in latex_content:
-            issues.append(f"Missing required LaTeX element: {element}")
-            score -= 10
-            suggestions.append(f"Add {element} command to the content")
+    missing_required = [element for element in _REQUIRED_ELEMENTS if element not in latex_content]
+    for element in missing_required:
+        issues.append(f"Missing required LaTeX element: {element}")
+        score -= 10
+        suggestions.append(f"Add {element} command to the content")
 
     # Check for label after section
     if "\\section" in latex_content and "\\label" not in latex_content:
@@ -1233,22 +1573,20 @@ def validate_latex_quality(latex_content: str, section_id: str,
         score -= 20
 
     # Check for unbalanced environments
-    begin_count = len(re.findall(r'\\begin\{(\w+)\}', latex_content))
-    end_count = len(re.findall(r'\\end\{(\w+)\}', latex_content))
     if begin_count != end_count:
         latex_errors.append(f"Unbalanced environments: {begin_count} \\begin, {end_count} \\end")
         score -= 15
 
     # Check for common LaTeX issues
-    if re.search(r'(?<!\\)[%&$#_]', latex_content):
+    if _UNESCAPED_RE.search(latex_content):
         # Check for unescaped special characters (rough check)
-        matches = re.findall(r'(?<!\\)([%&$#_])', latex_content[:1000])
+        matches = _UNESCAPED_RE.findall(latex_content[:1000])
         if matches:
             issues.append(f"Possible unescaped special characters: {set(matches)}")
             score -= 5
 
     # Check for proper use of math mode
-    if re.search(r'(?<!\$)\d+%(?!\$)', latex_content):
+    if _PERCENT_RE.search(latex_content):
         suggestions.append("Consider using math mode for percentages: $X\\%$")
 
     # Check for potential overfull hbox issues - very long unbreakable words/sequences
@@ -1259,7 +1597,7 @@ def validate_latex_quality(latex_content: str, section_id: str,
         if line.strip().startswith('%') or line.strip().startswith('\\'):
             continue
         # Find long unbreakable sequences (words without spaces/hyphens longer than 30 chars)
-        long_words = re.findall(r'\b\w{30,}\b', line)
+        long_words = _LONG_WORD_RE.findall(line)
         if long_words:
             issues.append(f"Line {line_num}: Very long word(s) that may cause overfull hbox: {long_words[:3]}")
             suggestions.append(f"Break long words using hyphens or rephrase: {long_words[0]}")
@@ -1273,8 +1611,8 @@ def validate_latex_quality(latex_content: str, section_id: str,
 
     # Content quality checks
     # Check for regulatory language issues
-    promotional_words = ["breakthrough", "revolutionary", "best", "guaranteed", "miracle"]
-    found_promotional = [w for w in promotional_words if w.lower() in latex_content.lower()]
+    lowered_content = latex_content.lower()
+    found_promotional = [w for w in _PROMOTIONAL_WORDS if w in lowered_content]
     if found_promotional:
         issues.append(f"Promotional language detected: {found_promotional}")
         score -= 10
@@ -1282,15 +1620,11 @@ def validate_latex_quality(latex_content: str, section_id: str,
 
     # Check for abbreviations without definition
     # Simple heuristic: all-caps words that might be abbreviations
-    abbreviations = re.findall(r'\b[A-Z]{2,6}\b', latex_content)
+    abbreviations = _ABBR_RE.findall(latex_content)
     if abbreviations:
-        # Check if they're defined (rough check)
-        undefined = []
-        for abbr in set(abbreviations):
-            if abbr not in ["ICH", "FDA", "EMA", "PMID", "N/A"]:  # Common allowed abbreviations
-                # Look for definition pattern: "Full Name (ABBR)" or "(ABBR)"
-                if f"({abbr})" not in latex_content:
-                    undefined.append(abbr)
+        # Check if they're defined (rough check): definition pattern "Full Name (ABBR)" or "(ABBR)"
+        defined = set(_ABBR_DEF_RE.findall(latex_content)) | _ALLOWED_ABBREVIATIONS
+        undefined = [abbr for abbr in dict.fromkeys(abbreviations) if abbr not in defined]
         if len(undefined) > 3:
             suggestions.append(f"Consider defining abbreviations on first use: {undefined[:5]}")
 
@@ -1312,6 +1646,19 @@ def validate_latex_quality(latex_content: str, section_id: str,
     )
 
 
+def classify_paper_section(text: str) -> str:
+    """Infer the Module 5.3 section of a paper from its lowercased title and abstract.
+
+    All keywords are found in one scan; the first keyword group (in
+    _SECTION_KEYWORDS order) with a hit wins, defaulting to 5.3.5.
+    """
+    matched_sections = {_KEYWORD_SECTIONS[match.group(1)] for match in _SECTION_KEYWORD_RE.finditer(text)}
+    for sec_key in _SECTION_KEYWORDS:
+        if sec_key in matched_sections:
+            return sec_key
+    return "5.3.5"
+
+
 def format_papers_for_context(relevant_papers: List[Dict[str, Any]],
                                max_papers: int = 15,
                                include_key_findings: bool = True) -> Tuple[str, List[str]]:
@@ -1367,18 +1714,7 @@ For the tabular listing of all studies, use \\modref{5.2}.
                 section_groups["5.3.5"]["papers"].append(paper)
         else:
             # Infer from content
-            if any(term in title + abstract for term in ["bioavailability", "bioequivalence", "dissolution"]):
-                section_groups["5.3.1"]["papers"].append(paper)
-            elif any(term in title + abstract for term in ["pharmacokinetic", "absorption", "distribution", "metabolism", "excretion"]):
-                section_groups["5.3.3"]["papers"].append(paper)
-            elif any(term in title + abstract for term in ["pharmacodynamic", "receptor", "mechanism"]):
-                section_groups["5.3.4"]["papers"].append(paper)
-            elif any(term in title + abstract for term in ["efficacy", "clinical trial", "phase", "randomized", "safety", "adverse"]):
-                section_groups["5.3.5"]["papers"].append(paper)
-            elif any(term in title + abstract for term in ["post-market", "surveillance", "real-world"]):
-                section_groups["5.3.6"]["papers"].append(paper)
-            else:
-                section_groups["5.3.5"]["papers"].append(paper)  # Default
+            section_groups[classify_paper_section(title + abstract)]["papers"].append(paper)
 
     idx = 1
     for sec_key, sec_data in section_groups.items():
@@ -1435,78 +1771,133 @@ REMINDER: Use these reference formats:
     return papers_context, section_refs
 
 
-def truncate_text(text: str, max_chars: int = 3000, preserve_structure: bool = True) -> str:
-    """Truncate text while preserving structure.
+# Formatted papers contexts, keyed by the identity of the papers and the formatting options;
+# the paper list is kept with each entry so the ids stay valid
+_papers_contexts: Dict[Tuple, Tuple[List[Dict[str, Any]], Tuple[str, List[str]]]] = {}
+MAX_PAPERS_CONTEXTS = 64
+
+
+def get_papers_context(relevant_papers: List[Dict[str, Any]], max_papers: int = 15,
+                       include_key_findings: bool = True) -> Tuple[str, List[str]]:
+    """Cached format_papers_for_context.
+
+    The same papers are formatted when planning a section and again for every
+    writer prompt built for it, so the result is computed once per set of papers.
+    Paper dicts must not be modified after they are formatted. The table is
+    cleared once it holds MAX_PAPERS_CONTEXTS entries.
+    """
+    key = (tuple(map(id, relevant_papers)), max_papers, include_key_findings)
+    cached = _papers_contexts.get(key)
+    if cached is None:
+        cached = (list(relevant_papers), format_papers_for_context(
+            relevant_papers, max_papers=max_papers, include_key_findings=include_key_findings
+        ))
+        if len(_papers_contexts) >= MAX_PAPERS_CONTEXTS:
+            _papers_contexts.clear()
+        _papers_contexts[key] = cached
+    return cached[1]
+
+
+def budget_token_caps(token_counts: Dict[str, int], total_tokens: int) -> Dict[str, int]:
+    """Cap token counts so they sum to at most total_tokens, shortening only the largest.
+
+    Finds the single threshold such that capping every count above it fits the
+    budget: counts are visited in ascending order, and the first one larger than
+    an even share of the remaining budget sets the cap for it and all larger ones.
+    Small entries are kept whole instead of being cut to an even split.
+
+    Args:
+        token_counts: Token count per key
+        total_tokens: Total token budget
+
+    Returns:
+        Capped token count per key (unchanged when everything fits)
+    """
+    if sum(token_counts.values()) <= total_tokens:
+        return dict(token_counts)
+
+    caps = {}
+    remaining_budget = total_tokens
+    ordered = sorted(token_counts.items(), key=lambda item: item[1])
+    for position, (key, count) in enumerate(ordered):
+        threshold = remaining_budget // (len(ordered) - position)
+        if count > threshold:
+            for larger_key, _ in ordered[position:]:
+                caps[larger_key] = threshold
+            break
+        caps[key] = count
+        remaining_budget -= count
+    return caps
+
+
+def truncate_text(text: str, max_tokens: int = 1500, preserve_structure: bool = True) -> str:
+    """Truncate text to a token budget while preserving structure.
 
     Args:
         text: Text to truncate
-        max_chars: Maximum characters to keep
+        max_tokens: Maximum tokens to keep
         preserve_structure: If True, try to truncate at sentence/paragraph boundaries
 
     Returns:
         Truncated text with ellipsis if truncated
     """
-    if len(text) <= max_chars:
-        return text
+    encoding = _get_token_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        truncated = encoding.decode(tokens[:max_tokens])
+    else:
+        if estimate_tokens(text) <= max_tokens:
+            return text
+        truncated = text[:max_tokens * 4]
 
     if preserve_structure:
         # Try to truncate at a reasonable point (sentence end, paragraph, etc.)
-        truncated = text[:max_chars]
-        # Find last sentence end
-        last_period = truncated.rfind('.')
-        last_newline = truncated.rfind('\n')
-        cut_point = max(last_period, last_newline)
-        if cut_point > max_chars * 0.8:  # Only use if we're not losing too much
+        cut_point = max(truncated.rfind('.'), truncated.rfind('\n'))
+        if cut_point > len(truncated) * 0.8:  # Only use if we're not losing too much
             truncated = truncated[:cut_point + 1]
-        else:
-            truncated = text[:max_chars]
-    else:
-        truncated = text[:max_chars]
 
     return truncated + "\n\n[... content truncated for context length ...]"
 
 
-def summarize_latex_content(latex_content: str, max_chars: int = 2000) -> str:
+def summarize_latex_content(latex_content: str, max_tokens: int = 500) -> str:
     """Summarize LaTeX content by extracting key sections.
 
     Args:
         latex_content: Full LaTeX content
-        max_chars: Maximum characters for summary
+        max_tokens: Maximum tokens for summary
 
     Returns:
         Summarized LaTeX content
     """
-    if len(latex_content) <= max_chars:
+    if estimate_tokens(latex_content) <= max_tokens:
         return latex_content
 
     # Extract section headers and first few lines of each section
-    lines = latex_content.split('\n')
     summary_lines = []
-    current_section = None
-    chars_used = 0
+    section_line_count = 0  # Content lines kept for the current section
+    tokens_used = 0
 
-    for line in lines:
+    for line in latex_content.split('\n'):
         stripped = line.strip()
+        is_header = stripped.startswith(_SECTION_HEADER_PREFIXES)
 
-        # Keep section headers
-        if stripped.startswith('\\section{') or stripped.startswith('\\subsection{') or stripped.startswith('\\subsubsection{'):
-            if chars_used + len(line) > max_chars * 0.9:
-                break
-            summary_lines.append(line)
-            chars_used += len(line) + 1
-            current_section = stripped
+        if is_header:
+            section_line_count = 0
+        elif not stripped or stripped.startswith('%'):
+            continue
+        elif section_line_count >= MAX_SUMMARY_LINES_PER_SECTION:
+            # Skip remaining content of this section
             continue
 
-        # Keep first few non-empty lines of each section
-        if stripped and not stripped.startswith('%'):
-            if chars_used + len(line) > max_chars * 0.9:
-                break
-            summary_lines.append(line)
-            chars_used += len(line) + 1
-            # Limit lines per section
-            if len([l for l in summary_lines if l.strip() and not l.strip().startswith('\\')]) > 10:
-                # Skip remaining content of this section
-                continue
+        line_tokens = estimate_tokens(line)
+        if tokens_used + line_tokens > max_tokens * 0.9:
+            break
+        summary_lines.append(line)
+        tokens_used += line_tokens + 1
+        if not is_header:
+            section_line_count += 1
 
     summary = '\n'.join(summary_lines)
     if len(latex_content) > len(summary):
@@ -1515,51 +1906,134 @@ def summarize_latex_content(latex_content: str, max_chars: int = 2000) -> str:
     return summary
 
 
-def load_written_section(section_id: str, output_dir: str = "section2.7_tex", max_chars: int = 3000) -> str:
+def scan_output_dir(output_dir: str) -> Dict[str, os.DirEntry]:
+    """List the output directory once, mapping file names to directory entries.
+
+    Returns an empty dict if the directory does not exist yet.
+    """
+    try:
+        with os.scandir(output_dir) as entries:
+            return {entry.name: entry for entry in entries}
+    except FileNotFoundError:
+        return {}
+
+
+def load_written_section(section_id: str, output_dir: str = "section2.7_tex",
+                         max_tokens: int = MAX_RELATED_SECTION_TOKENS,
+                         dir_index: Optional[Dict[str, os.DirEntry]] = None) -> str:
     """Load already-written LaTeX content for a section.
 
+    Results are cached in memory per file modification time, and the summary of
+    each file is kept on disk in a "<file>.tex.summary.json" sidecar, so a
+    section read by several agents is only cleaned and summarized once.
+
     Args:
         section_id: Section ID (e.g., "2.7.1")
         output_dir: Output directory where .tex files are saved
-        max_chars: Maximum characters to load (for context length management)
+        max_tokens: Maximum tokens to load (for context length management)
+        dir_index: Listing of output_dir from scan_output_dir, to avoid a stat per
+            missing section when several sections are loaded at once
 
     Returns:
         LaTeX content if file exists, empty string otherwise
     """
-    output_path = Path(output_dir)
     filename = f"{section_id.replace('.', '_')}.tex"
-    filepath = output_path / filename
+    try:
+        if dir_index is not None:
+            entry = dir_index.get(filename)
+            if entry is None:
+                return ""
+            filepath = entry.path
+            mtime_ns = entry.stat().st_mtime_ns
+        else:
+            filepath = os.path.join(output_dir, filename)
+            mtime_ns = os.stat(filepath).st_mtime_ns
+    except OSError:
+        return ""
+    return _load_written_section_cached(section_id, filepath, mtime_ns, max_tokens)
+
+
+# Loaded section texts by digest, so equal summaries share one string object
+_interned_texts: Dict[bytes, str] = {}
+MAX_INTERNED_TEXTS = 256
 
-    if filepath.exists():
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-                # Remove comments and metadata, return just the LaTeX content
-                lines = content.split('\n')
-                latex_lines = []
-                for line in lines:
-                    stripped = line.strip()
-                    if stripped.startswith('%') and 'Generated:' in stripped:
-                        continue
-                    if stripped.startswith('%') and 'Preamble' in stripped:
-                        continue
-                    if stripped.startswith('%') and 'Section' in stripped and 'Generated' in stripped:
-                        continue
-                    if not stripped or stripped == '%':
-                        continue
-                    latex_lines.append(line)
-
-                latex_content = '\n'.join(latex_lines).strip()
-
-                # Truncate if too long to manage context length
-                if len(latex_content) > max_chars:
-                    latex_content = summarize_latex_content(latex_content, max_chars)
-
-                return latex_content
-        except Exception as e:
-            print(f"⚠️  Warning: Could not load written section {section_id}: {e}")
-            return ""
-    return ""
+
+def intern_text(text: str) -> str:
+    """Return the shared copy of text, registering it if it is new.
+
+    A section summarized at several budgets often yields the same text; this
+    keeps one object for all of them. The table is cleared once it holds
+    MAX_INTERNED_TEXTS entries.
+    """
+    digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+    shared = _interned_texts.get(digest)
+    if shared is None:
+        if len(_interned_texts) >= MAX_INTERNED_TEXTS:
+            _interned_texts.clear()
+        shared = _interned_texts[digest] = text
+    return shared
+
+
+def load_related_sections_tex(related_section_budgets: Dict[str, int],
+                              output_dir: str = "section2.7_tex") -> Dict[str, str]:
+    """Load the written content of related sections, each within its token budget.
+
+    Graph state only carries section IDs and budgets; the content itself comes
+    from the shared load_written_section cache, so it is held once however
+    many sections refer to it.
+
+    Args:
+        related_section_budgets: Token budget per related section ID (from planning_node)
+        output_dir: Output directory where .tex files are saved
+
+    Returns:
+        Dictionary of section ID to LaTeX content, for sections that are still written
+    """
+    related_sections_tex = {}
+    for related_id, max_tokens in related_section_budgets.items():
+        written_content = load_written_section(related_id, output_dir, max_tokens=max_tokens)
+        if written_content:
+            related_sections_tex[related_id] = written_content
+    return related_sections_tex
+
+
+@lru_cache(maxsize=64)
+def _load_written_section_cached(section_id: str, filepath: str, mtime_ns: int, max_tokens: int) -> str:
+    """Read, clean and summarize a written section (cached by load_written_section)."""
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except Exception as e:
+        print(f"⚠️  Warning: Could not load written section {section_id}: {e}")
+        return ""
+
+    # Reuse the sidecar summary if it was made from the same content and budget
+    content_sha1 = hashlib.sha1(content.encode('utf-8')).hexdigest()
+    sidecar_path = Path(f"{filepath}.summary.json")
+    try:
+        sidecar = json_loads(sidecar_path.read_bytes())
+        if sidecar.get("sha1") == content_sha1 and sidecar.get("max_tokens") == max_tokens:
+            return intern_text(sidecar["summary"])
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+
+    # Remove comments and metadata, return just the LaTeX content
+    latex_content = _META_COMMENT_RE.sub('', content).strip()
+
+    # Summarize if too long to manage context length
+    latex_content = summarize_latex_content(latex_content, max_tokens=max_tokens)
+
+    try:
+        sidecar_path.write_bytes(json_dumps_bytes({
+            "sha1": content_sha1,
+            "max_tokens": max_tokens,
+            "summary": latex_content,
+            "token_count": estimate_tokens(latex_content)
+        }))
+    except OSError as e:
+        print(f"⚠️  Warning: Could not write summary cache {sidecar_path}: {e}")
+
+    return intern_text(latex_content)
 
 
 def save_tex_file(section_id: str, latex_content: str, preamble: str = None,
@@ -1925,8 +2399,8 @@ Return ONLY the improved LaTeX code, starting with the section command."""
 
         # Clean up the response
         # Remove markdown code blocks if present
-        refined_content = re.sub(r'^```(?:latex)?\s*', '', refined_content, flags=re.MULTILINE)
-        refined_content = re.sub(r'\s*```$', '', refined_content, flags=re.MULTILINE)
+        refined_content = _STRIP_OPEN_RE.sub('', refined_content)
+        refined_content = _STRIP_CLOSE_RE.sub('', refined_content)
         refined_content = refined_content.strip()
 
         # Validate the refined content is actually LaTeX
@@ -2024,14 +2498,267 @@ def create_section_writing_graph(model: str = "openai:gpt-4o", temperature: floa
     return graph.compile()
 
 
+async def write_section_async(graph, section_id: str, papers_data: Dict[str, Any],
+                              output_dir: str = "section2.7_tex") -> Dict[str, Any]:
+    """Run the section writing graph for one section and save its .tex file.
+
+    Args:
+        graph: Compiled section writing graph
+        section_id: Section ID to write
+        papers_data: Loaded papers data
+        output_dir: Output directory for .tex files
+
+    Returns:
+        Result dictionary for the section
+    """
+    try:
+        # Initial state
+        initial_state = {
+            "messages": [{"role": "user", "content": f"Write LaTeX section {section_id}"}],
+            "section_id": section_id,
+            "section_guidance": "",
+            "papers_data": papers_data,
+            "output_tex": "",
+            "cross_references": [],
+            "other_sections": {},
+            "related_section_budgets": {},
+            "output_dir": output_dir,
+            "outline": "",
+            "draft_tex": "",
+            "quality_report": {},
+            "revision_count": 0,
+            "writing_phase": "full"
+        }
+
+        # Run the graph (the sync nodes run in worker threads)
+        result = await graph.ainvoke(initial_state)
+
+        # Save the file
+        if result.get("output_tex"):
+            output_file = await asyncio.to_thread(
+                save_tex_file, section_id, result["output_tex"], output_dir=output_dir
+            )
+            print(f"✅ Section {section_id} completed successfully")
+            return {
+                "status": "success",
+                "file": output_file,
+                "length": len(result["output_tex"]),
+                "quality_score": result.get("quality_report", {}).get("score", 0)
+            }
+
+        print(f"❌ Section {section_id} failed: No content generated")
+        return {"status": "failed", "error": "No content generated"}
+
+    except Exception as e:
+        print(f"❌ Section {section_id} failed: {e}")
+        return {"status": "failed", "error": str(e)}
+
+
+async def write_sections_by_level(graph, levels: List[List[str]], papers_data: Dict[str, Any],
+                                  output_dir: str = "section2.7_tex",
+                                  max_concurrent: int = MAX_CONCURRENT_SECTIONS) -> Dict[str, Any]:
+    """Write sections level by level, running the sections of each level concurrently.
+
+    A level only starts once every section of the previous level is saved, so
+    each section's planning phase can load the .tex files of its dependencies.
+
+    Args:
+        graph: Compiled section writing graph
+        levels: Dependency levels from dag_levels()
+        papers_data: Loaded papers data
+        output_dir: Output directory for .tex files
+        max_concurrent: Maximum number of sections written at the same time
+
+    Returns:
+        Dictionary with results for each section
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrent))
+    total = sum(len(level) for level in levels)
+    results = {}
+    done = 0
+
+    async def write_one(section_id: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await write_section_async(graph, section_id, papers_data, output_dir)
+
+    for level_idx, level in enumerate(levels, 1):
+        print(f"\n{'='*80}")
+        print(f"📄 PROCESSING LEVEL {level_idx}/{len(levels)}: {', '.join(level)} "
+              f"(sections {done + 1}-{done + len(level)} of {total})")
+        print(f"{'='*80}\n")
+
+        level_results = await asyncio.gather(*(write_one(section_id) for section_id in level))
+        results.update(zip(level, level_results))
+        done += len(level)
+
+    return results
+
+
+def run_openai_batch(client, requests: List[Dict[str, Any]],
+                     poll_interval: float = BATCH_POLL_INTERVAL) -> Dict[str, str]:
+    """Submit chat completion requests as one OpenAI batch job and wait for the results.
+
+    Args:
+        client: OpenAI client
+        requests: Batch request lines ({"custom_id", "method", "url", "body"})
+        poll_interval: Seconds between status checks
+
+    Returns:
+        Dictionary mapping custom_id to response text (failed requests are left out)
+    """
+    jsonl = b"".join(json_dumps_bytes(request) + b"\n" for request in requests)
+    batch_file = client.files.create(file=("sections.jsonl", jsonl), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    print(f"📦 Submitted batch {batch.id} with {len(requests)} requests")
+
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch.id)
+        print(f"   ⏳ Batch {batch.id}: {batch.status}")
+
+    if batch.status != "completed" or not batch.output_file_id:
+        raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+
+    outputs = {}
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        record = json_loads(line)
+        response = record.get("response") or {}
+        if response.get("status_code") != 200:
+            print(f"⚠️  Warning: Batch request {record.get('custom_id')} failed: {record.get('error')}")
+            continue
+        outputs[record["custom_id"]] = response["body"]["choices"][0]["message"]["content"] or ""
+    return outputs
+
+
+def write_sections_with_batch_api(levels: List[List[str]], papers_data: Dict[str, Any],
+                                  output_dir: str = "section2.7_tex",
+                                  model: str = "openai:gpt-4o",
+                                  temperature: float = 0.3,
+                                  poll_interval: float = BATCH_POLL_INTERVAL) -> Dict[str, Any]:
+    """Write sections through the OpenAI Batch API, one batch job per dependency level.
+
+    Each level is planned locally, its writer prompts are submitted together,
+    and the responses go through the usual LaTeX extraction and validation
+    before the .tex files are saved for the next level. There is no refinement
+    loop in this mode.
+
+    Args:
+        levels: Dependency levels from dag_levels()
+        papers_data: Loaded papers data
+        output_dir: Output directory for .tex files
+        model: OpenAI model ("openai:" prefix optional)
+        temperature: Temperature for LLM
+        poll_interval: Seconds between batch status checks
+
+    Returns:
+        Dictionary with results for each section
+    """
+    if OpenAI is None:
+        raise ImportError("The openai package is required for --batch-api")
+    provider, _, model_name = model.rpartition(":")
+    if provider not in ("", "openai"):
+        raise ValueError(f"--batch-api only supports OpenAI models, got: {model}")
+
+    client = OpenAI()
+    all_sections = get_all_section_info()
+    results = {}
+
+    for level_idx, level in enumerate(levels, 1):
+        print(f"\n{'='*80}")
+        print(f"📦 BATCH LEVEL {level_idx}/{len(levels)}: {', '.join(level)}")
+        print(f"{'='*80}\n")
+
+        # Plan every section of the level and build its request
+        planned = {}
+        requests = []
+        for section_id in level:
+            state = {
+                "messages": [],
+                "section_id": section_id,
+                "papers_data": papers_data,
+                "output_dir": output_dir
+            }
+            state.update(planning_node(state))
+            if not state.get("section_guidance"):
+                results[section_id] = {"status": "failed", "error": "Could not load section guidance"}
+                continue
+
+            related_sections = {
+                related_id: all_sections[related_id]
+                for related_id in state.get("other_sections", {}) if related_id in all_sections
+            }
+            system_prompt = build_section_writer_prompt(
+                section_id,
+                state["section_guidance"],
+                state["cross_references"],
+                related_sections=related_sections,
+                related_sections_tex=load_related_sections_tex(state.get("related_section_budgets", {}), output_dir)
+            )
+            requests.append({
+                "custom_id": section_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": model_name,
+                    "temperature": temperature,
+                    "messages": [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": WRITER_USER_PROMPT.format(section_id=section_id)}
+                    ]
+                }
+            })
+            planned[section_id] = state
+
+        if not requests:
+            continue
+
+        try:
+            outputs = run_openai_batch(client, requests, poll_interval=poll_interval)
+        except Exception as e:
+            print(f"❌ Batch for level {level_idx} failed: {e}")
+            for section_id in planned:
+                results[section_id] = {"status": "failed", "error": str(e)}
+            continue
+
+        # Extract, validate and save each response
+        for section_id, state in planned.items():
+            content = outputs.get(section_id, "")
+            latex_content = extract_latex_from_contents([content]) if content else ""
+            if not latex_content:
+                print(f"❌ Section {section_id} failed: No content generated")
+                results[section_id] = {"status": "failed", "error": "No content generated"}
+                continue
+
+            expected_citations = min(max(len(state.get("cross_references", [])), 3), 10)
+            report = validate_latex_quality(latex_content, section_id, expected_citations)
+            output_file = save_tex_file(section_id, latex_content, output_dir=output_dir)
+            print(f"✅ Section {section_id} completed successfully (score: {report.score:.1f})")
+            results[section_id] = {
+                "status": "success",
+                "file": output_file,
+                "length": len(latex_content),
+                "quality_score": report.score
+            }
+
+    return results
+
+
 def write_all_sections(papers_json: str, sections: List[str] = None,
                        model: str = "openai:gpt-4o", output_dir: str = "section2.7_tex",
-                       enable_refinement: bool = True) -> Dict[str, Any]:
+                       enable_refinement: bool = True,
+                       max_concurrent: int = MAX_CONCURRENT_SECTIONS,
+                       use_batch_api: bool = False) -> Dict[str, Any]:
     """Write multiple sections in dependency order.
 
-    This function processes sections in topological order based on their
-    dependencies, ensuring that dependent sections have access to already-written
-    content from their dependencies.
+    Sections are grouped into dependency levels; the sections of a level are
+    independent of each other and are written concurrently, while dependent
+    sections still wait for (and can reference) the content of their dependencies.
 
     Args:
         papers_json: Path to combined papers JSON file
@@ -2039,6 +2766,9 @@ def write_all_sections(papers_json: str, sections: List[str] = None,
         model: LLM model to use
         output_dir: Output directory for .tex files
         enable_refinement: Whether to enable the refinement loop
+        max_concurrent: Maximum number of sections written at the same time
+        use_batch_api: Submit each level as an OpenAI batch job (cheaper, not interactive;
+            no refinement loop)
 
     Returns:
         Dictionary with results for each section
@@ -2056,84 +2786,35 @@ def write_all_sections(papers_json: str, sections: List[str] = None,
     # Load papers data
     papers_data = load_papers_json(papers_json)
 
-    # Sort sections by dependencies
+    # Sort sections by dependencies and group them into levels that can run in parallel
     sorted_sections = topological_sort_sections(sections)
+    levels = dag_levels(sections)
 
     print("\n" + "="*80)
     print("🚀 BATCH SECTION WRITING")
     print("="*80)
     print(f"📄 Sections to write: {len(sorted_sections)}")
     print(f"📋 Order: {' → '.join(sorted_sections)}")
+    print(f"🧵 Levels: {len(levels)} (up to {max_concurrent} sections in parallel)")
     print(f"🤖 Model: {model}")
     print(f"📁 Output: {output_dir}/")
     print("="*80 + "\n")
 
-    # Create the graph
-    graph = create_section_writing_graph(
-        model=model,
-        enable_refinement=enable_refinement
-    )
-
-    results = {}
-    successful = 0
-    failed = 0
-
-    for idx, section_id in enumerate(sorted_sections, 1):
-        print(f"\n{'='*80}")
-        print(f"📄 PROCESSING SECTION {idx}/{len(sorted_sections)}: {section_id}")
-        print(f"{'='*80}\n")
-
-        try:
-            # Initial state
-            initial_state = {
-                "messages": [{"role": "user", "content": f"Write LaTeX section {section_id}"}],
-                "section_id": section_id,
-                "section_guidance": "",
-                "papers_data": papers_data,
-                "output_tex": "",
-                "cross_references": [],
-                "other_sections": {},
-                "related_sections_tex": {},
-                "output_dir": output_dir,
-                "outline": "",
-                "draft_tex": "",
-                "quality_report": {},
-                "revision_count": 0,
-                "writing_phase": "full"
-            }
-
-            # Run the graph
-            result = graph.invoke(initial_state)
-
-            # Save the file
-            if result.get("output_tex"):
-                output_file = save_tex_file(
-                    section_id,
-                    result["output_tex"],
-                    output_dir=output_dir
-                )
-
-                results[section_id] = {
-                    "status": "success",
-                    "file": output_file,
-                    "length": len(result["output_tex"]),
-                    "quality_score": result.get("quality_report", {}).get("score", 0)
-                }
-                successful += 1
-                print(f"✅ Section {section_id} completed successfully")
-            else:
-                results[section_id] = {"status": "failed", "error": "No content generated"}
-                failed += 1
-                print(f"❌ Section {section_id} failed: No content generated")
-
-        except Exception as e:
-            results[section_id] = {"status": "failed", "error": str(e)}
-            failed += 1
-            print(f"❌ Section {section_id} failed: {e}")
+    if use_batch_api:
+        results = write_sections_with_batch_api(levels, papers_data, output_dir=output_dir, model=model)
+    else:
+        # Create the graph
+        graph = create_section_writing_graph(
+            model=model,
+            enable_refinement=enable_refinement
+        )
 
-        # Small delay between sections to avoid rate limits
-        if idx < len(sorted_sections):
-            time.sleep(2)
+        results = asyncio.run(write_sections_by_level(
+            graph, levels, papers_data, output_dir=output_dir, max_concurrent=max_concurrent
+        ))
+    results = {section_id: results[section_id] for section_id in sorted_sections}
+    successful = sum(1 for r in results.values() if r["status"] == "success")
+    failed = len(results) - successful
 
     # Print summary
     print("\n" + "="*80)
@@ -2190,6 +2871,9 @@ Examples:
 
   # Write specific sections in batch
   python multi_agent_section_writer_2_7.py --batch 2.7.1,2.7.1.1,2.7.1.2 papers.json
+
+  # Write all sections through the OpenAI Batch API (offline, lower cost)
+  python multi_agent_section_writer_2_7.py --all papers.json --batch-api
         """
     )
     parser.add_argument("section_id", nargs="?", help="Section ID to write (e.g., 2.7.1, 2.7.2)")
@@ -2212,6 +2896,11 @@ Examples:
                         help="Generate main.tex file only (without writing sections)")
     parser.add_argument("--no-main", action="store_true",
                         help="Skip generating main.tex after writing sections")
+    parser.add_argument("--batch-api", action="store_true",
+                        help="In --all/--batch mode, submit each dependency level as an OpenAI batch job "
+                             "(lower cost, results can take up to 24h; no refinement loop)")
+    parser.add_argument("--max-concurrent", type=int, default=MAX_CONCURRENT_SECTIONS,
+                        help=f"Maximum sections written in parallel in --all/--batch mode (default: {MAX_CONCURRENT_SECTIONS})")
 
     args = parser.parse_args()
 
@@ -2252,7 +2941,9 @@ Examples:
             sections=sections,
             model=args.model,
             output_dir=args.output_dir,
-            enable_refinement=not args.no_refinement
+            enable_refinement=not args.no_refinement,
+            max_concurrent=args.max_concurrent,
+            use_batch_api=args.batch_api
         )
 
         # Exit with error code if any failed
@@ -2303,7 +2994,7 @@ Examples:
         "output_tex": "",
         "cross_references": [],
         "other_sections": {},
-        "related_sections_tex": {},
+        "related_section_budgets": {},
         "output_dir": output_dir,
         # New fields for enhanced pipeline
         "outline": "",
@@ -2328,13 +3019,12 @@ Examples:
           (" → Refinement Loop" if enable_refinement else ""))
     print("="*80 + "\n")
 
-    start_time = datetime.datetime.now()
+    start_ns = time.perf_counter_ns()
 
     # Run the graph
     result = graph.invoke(initial_state)
 
-    end_time = datetime.datetime.now()
-    duration = (end_time - start_time).total_seconds()
+    duration = (time.perf_counter_ns() - start_ns) / 1e9
 
     # Save the LaTeX file
     if "output_tex" in result and result["output_tex"]: